@@ -0,0 +1,232 @@
+"""
+Headless benchmark runner for the core game loop
+
+Builds a Game with a configurable number of enemies, collectibles,
+particles and projectiles (optionally on a large TileMap), replays a
+scripted input sequence and reports ticks/sec, frame-time percentiles and
+peak Python memory for each scenario. Runs are seeded so results are
+comparable between commits.
+
+Usage:
+    python benchmark.py                       # run every scenario
+    python benchmark.py --scenario crowd --ticks 1200
+    python benchmark.py --output bench_output.json
+"""
+import os
+
+# Must be set before pygame creates a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import pygame
+
+from core.config import Config
+from core.game import Game
+from graphics.particles import ParticleEmitter
+from graphics.tilemap import TileMap, Tile
+from graphics.ui import UI
+from systems.camera import Camera
+from systems.controller import ScriptedController
+
+SCREEN_SIZE = (800, 600)
+TICK = 1.0 / 60
+
+# Scenario name -> world contents
+SCENARIOS = {
+    "baseline": {"enemies": 2, "collectibles": 2, "particles": 0, "projectiles": 0, "map_size": None},
+    "crowd": {"enemies": 500, "collectibles": 300, "particles": 0, "projectiles": 0, "map_size": None},
+    "particles": {"enemies": 2, "collectibles": 2, "particles": 20000, "projectiles": 0, "map_size": None},
+    "bullets": {"enemies": 50, "collectibles": 2, "particles": 0, "projectiles": 2000, "map_size": None},
+    "large_map": {"enemies": 2, "collectibles": 2, "particles": 0, "projectiles": 0, "map_size": (500, 120)},
+    "stress": {"enemies": 300, "collectibles": 200, "particles": 10000, "projectiles": 1000, "map_size": (300, 80)},
+}
+
+# Held keys replayed through the controller: (ticks, keys)
+INPUT_SCRIPT = [
+    (45, ("right",)),
+    (1, ("right", "jump")),
+    (30, ("right",)),
+    (20, ()),
+    (45, ("left",)),
+    (1, ("jump",)),
+    (25, ()),
+]
+
+# Average particle lifetime per emitter type in ticks, used to size emitter rates
+PARTICLE_LIFETIMES = {"blood": 30, "spark": 15, "dust": 40, "fire": 30, "water": 45}
+
+def build_tilemap(width, height):
+    """Build a large tile map with a floor and random platforms"""
+    tilemap = TileMap()
+    tilemap.width = width
+    tilemap.height = height
+
+    layer = [[0] * width for _ in range(height)]
+    for x in range(width):
+        layer[height - 1][x] = 1
+    for _ in range(width * height // 40):
+        x = random.randrange(width - 8)
+        y = random.randrange(2, height - 2)
+        for dx in range(random.randint(2, 8)):
+            layer[y][x + dx] = 1
+    tilemap.layers.append(layer)
+
+    tile_image = pygame.Surface((tilemap.tile_size, tilemap.tile_size))
+    tile_image.fill((100, 100, 100))
+    tilemap.tiles[1] = Tile(tile_image, "solid")
+
+    tilemap.build_collision_rects()
+    tilemap.bake_chunks()
+    return tilemap
+
+def build_game(scenario, seed, ticks, screen, ecs=False):
+    """Create a seeded Game populated for a scenario"""
+    random.seed(seed)
+
+    config = Config()
+    config.set("simulation", "ecs", ecs)
+    controller = ScriptedController(INPUT_SCRIPT)
+    camera = Camera(*SCREEN_SIZE)
+    ui = UI(*SCREEN_SIZE)
+    game = Game(screen, controller, camera, ui, config)
+
+    # Seed the vectorized particle backend as well
+    if game.particle_system.engine is not None:
+        import numpy as np
+        game.particle_system.engine.rng = np.random.default_rng(seed)
+
+    if scenario["map_size"]:
+        game.level = build_tilemap(*scenario["map_size"])
+
+    world_width = 2000
+    for _ in range(scenario["enemies"]):
+        game.spawn_enemy(random.uniform(0, world_width), random.uniform(0, 500))
+    for _ in range(scenario["collectibles"]):
+        game.spawn_collectible(random.uniform(0, world_width), random.uniform(0, 500),
+                               random.choice(["health", "coin"]))
+    for _ in range(scenario["projectiles"]):
+        game.spawn_projectile(random.uniform(0, world_width), random.uniform(0, 500), random.uniform(0, 360),
+                              speed=random.uniform(2, 8), lifetime=ticks * 2)
+
+    # Emitters sized so the live particle count settles around the target
+    if scenario["particles"]:
+        per_type = scenario["particles"] / len(PARTICLE_LIFETIMES)
+        for particle_type, lifetime in PARTICLE_LIFETIMES.items():
+            for _ in range(5):
+                game.particle_system.add_emitter(ParticleEmitter(
+                    random.uniform(0, SCREEN_SIZE[0]), random.uniform(0, SCREEN_SIZE[1]),
+                    particle_type, rate=per_type / lifetime / 5, variation=5.0
+                ))
+
+    return game
+
+def step(game, screen):
+    """Run one tick; returns (update_seconds, frame_seconds)"""
+    start = time.perf_counter()
+    game.controller.update()
+    game.update(TICK)
+    updated = time.perf_counter()
+
+    screen.fill((0, 0, 0))
+    game.render(screen)
+    pygame.display.flip()
+    return updated - start, time.perf_counter() - start
+
+def percentile(ordered, fraction):
+    """Get a percentile from a sorted list"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_scenario(name, scenario, ticks, seed, warmup=60, measure_memory=True, ecs=False):
+    """
+    Run a scenario and collect its statistics
+
+    Returns:
+        Dictionary of results
+    """
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    game = build_game(scenario, seed, ticks + warmup, screen, ecs)
+
+    for _ in range(warmup):
+        step(game, screen)
+
+    update_times = []
+    frame_times = []
+    for _ in range(ticks):
+        update_time, frame_time = step(game, screen)
+        update_times.append(update_time)
+        frame_times.append(frame_time)
+
+    ordered = sorted(frame_times)
+    result = {
+        "scenario": name + ("+ecs" if ecs else ""),
+        "ticks": ticks,
+        "ticks_per_sec": ticks / sum(update_times),
+        "frames_per_sec": ticks / sum(frame_times),
+        "frame_ms": {
+            "p50": percentile(ordered, 0.50) * 1000,
+            "p95": percentile(ordered, 0.95) * 1000,
+            "p99": percentile(ordered, 0.99) * 1000,
+            "max": ordered[-1] * 1000,
+        },
+        "particles": game.particle_system.get_particle_count(),
+        "projectiles": len(game.projectiles),
+    }
+
+    # Memory is measured in a separate, shorter run because tracing slows everything down
+    if measure_memory:
+        tracemalloc.start()
+        game = build_game(scenario, seed, ticks + warmup, screen, ecs)
+        for _ in range(min(ticks, 120)):
+            step(game, screen)
+        result["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    return result
+
+def print_results(results):
+    """Print a results table"""
+    print(f"{'scenario':<12}{'ticks/s':>10}{'fps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'peak MB':>9}")
+    for result in results:
+        frame = result["frame_ms"]
+        memory = result.get("peak_memory_mb")
+        memory_text = f"{memory:>9.1f}" if memory is not None else f"{'-':>9}"
+        print(f"{result['scenario']:<12}{result['ticks_per_sec']:>10.1f}{result['frames_per_sec']:>9.1f}"
+              f"{frame['p50']:>9.2f}{frame['p95']:>9.2f}{frame['p99']:>9.2f}{frame['max']:>9.2f}{memory_text}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game loop benchmark")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--ticks", type=int, default=600, help="Measured ticks per scenario")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory pass")
+    parser.add_argument("--ecs", action="store_true", help="Simulate entities with component storage")
+    parser.add_argument("--output", help="Write results to a JSON file")
+    args = parser.parse_args()
+
+    pygame.init()
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        results.append(run_scenario(name, SCENARIOS[name], args.ticks, args.seed,
+                                    measure_memory=not args.no_memory, ecs=args.ecs))
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {args.output}")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
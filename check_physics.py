@@ -0,0 +1,148 @@
+"""
+Check that the compiled physics extension matches the pure Python physics
+
+Runs seeded random moves, ground checks and overlap queries through both
+implementations in physics_wrapper and reports any difference. Obstacles
+are passed as lists, spatial indexes and flat or NumPy arrays, and the
+batch solver is checked against single moves. Build the
+extension first with:
+
+    python setup.py build_ext --inplace
+"""
+import argparse
+import math
+import random
+import sys
+from array import array
+
+import physics_wrapper
+from systems.spatial_hash import SpatialHash
+
+def random_obstacles(rng, count):
+    """Random platforms and walls, including some empty and fractional ones"""
+    obstacles = []
+    for _ in range(count):
+        x = rng.randint(-200, 800)
+        y = rng.randint(-200, 600)
+        if rng.random() < 0.5:
+            obstacles.append((x, y, rng.randint(0, 300), rng.randint(0, 24)))
+        else:
+            obstacles.append((x, y, rng.randint(0, 24), rng.randint(0, 300)))
+    if rng.random() < 0.2:
+        obstacles.append((rng.uniform(-100, 700), rng.uniform(-100, 500), rng.uniform(1, 50), rng.uniform(1, 50)))
+    return obstacles
+
+def random_mover(rng):
+    """A box with a displacement, sometimes axis-aligned or fast"""
+    speed = 400 if rng.random() < 0.1 else 40
+    velocity_x = 0 if rng.random() < 0.15 else rng.uniform(-speed, speed)
+    velocity_y = 0 if rng.random() < 0.15 else rng.uniform(-speed, speed)
+    if rng.random() < 0.3:
+        velocity_x, velocity_y = round(velocity_x), round(velocity_y)
+    return (rng.randint(-100, 700), rng.randint(-100, 500),
+            rng.randint(1, 48), rng.randint(1, 64), velocity_x, velocity_y)
+
+def same(expected, actual):
+    """Compare result tuples, allowing for float rounding"""
+    if len(expected) != len(actual):
+        return False
+    for a, b in zip(expected, actual):
+        if isinstance(a, float) or isinstance(b, float):
+            if not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9):
+                return False
+        elif a != b:
+            return False
+    return True
+
+def check_physics(cases=2000, seed=1):
+    """
+    Compare the extension with the Python implementation
+
+    Returns:
+        List of (function name, arguments, expected, actual) mismatches
+    """
+    rng = random.Random(seed)
+    mismatches = []
+
+    def compare(name, args, expected, actual):
+        if not same(expected, actual):
+            mismatches.append((name, args, expected, actual))
+
+    for _ in range(cases):
+        obstacles = random_obstacles(rng, rng.randint(0, 12))
+        index = SpatialHash(cell_size=64)
+        index.insert_many(obstacles)
+        mover = random_mover(rng)
+        iterations = rng.randint(1, 4)
+
+        # The same obstacles as a flat buffer and, with NumPy, an (n, 4) array
+        flat = array("d", (value for rect in obstacles for value in rect))
+        collections = [obstacles, index, flat]
+        if physics_wrapper.np is not None:
+            collections.append(physics_wrapper.np.array(obstacles, dtype=float).reshape(-1, 4))
+
+        for collection in collections:
+            expected = physics_wrapper.python_move_and_slide(*mover, collection, iterations)
+            actual = physics_wrapper.move_and_slide(*mover, collection, iterations)
+            compare("move_and_slide", (mover, collection, iterations), expected, actual)
+
+            new_x, new_y, _, _, normal_x, normal_y, _ = physics_wrapper.python_move_and_slide(*mover, collection)
+            expected = (new_x, new_y, normal_x != 0, normal_y != 0)
+            compare("sweep_test", (mover, collection), expected, physics_wrapper.sweep_test(*mover, collection))
+
+            box = mover[:4]
+            distance = rng.choice([1.0, 2.5, 8])
+            expected = (physics_wrapper.python_check_on_ground(*box, collection, distance),)
+            actual = (physics_wrapper.check_on_ground(*box, collection, distance),)
+            compare("check_on_ground", (box, collection, distance), expected, actual)
+
+            # Python fallbacks take the same inputs as the extension
+            expected = physics_wrapper.python_move_and_slide(*mover, obstacles, iterations)
+            actual = physics_wrapper.python_move_and_slide(*mover, collection, iterations)
+            compare("python_move_and_slide", (mover, collection, iterations), expected, actual)
+            expected = (physics_wrapper.python_check_on_ground(*box, obstacles, distance),)
+            actual = (physics_wrapper.python_check_on_ground(*box, collection, distance),)
+            compare("python_check_on_ground", (box, collection, distance), expected, actual)
+
+        # The batch solver against one move at a time
+        movers = [random_mover(rng) for _ in range(rng.randint(0, 8))]
+        for collection in collections:
+            results = physics_wrapper.sweep_batch(*zip(*movers) if movers else ([],) * 6, collection, iterations)
+            for i, mover in enumerate(movers):
+                expected = physics_wrapper.python_move_and_slide(*mover, collection, iterations)
+                actual = tuple(column[i] for column in results)
+                compare("sweep_batch", (mover, collection, iterations), expected, actual)
+
+        # Rect lists against flat buffers and NumPy arrays
+        boxes = [random_mover(rng)[:4] for _ in range(rng.randint(0, 30))]
+        expected = physics_wrapper.python_overlap_pairs(boxes, obstacles)
+        compare("overlap_pairs", (boxes, obstacles), expected, physics_wrapper.overlap_pairs(boxes, obstacles))
+        compare("overlap_pairs", (boxes, flat), expected, physics_wrapper.overlap_pairs(boxes, flat))
+        if physics_wrapper.np is not None:
+            rows = physics_wrapper.np.array(boxes, dtype=physics_wrapper.np.int64).reshape(-1, 4)
+            compare("overlap_pairs", (rows, obstacles), expected, physics_wrapper.overlap_pairs(rows, obstacles))
+
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the compiled physics extension with the Python version")
+    parser.add_argument("--cases", type=int, default=2000, help="Number of random cases")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args(argv)
+
+    if not physics_wrapper.using_c_extension:
+        print("The physics extension isn't built; run: python setup.py build_ext --inplace")
+        return 1
+
+    mismatches = check_physics(args.cases, args.seed)
+    if not mismatches:
+        print(f"The extension matches the Python implementation in {args.cases} cases")
+        return 0
+
+    print(f"{len(mismatches)} mismatches:")
+    for name, arguments, expected, actual in mismatches[:10]:
+        print(f"  {name}{arguments}: expected {expected}, got {actual}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,10 @@ from core.game import Game
 from core.config import Config
 from systems.camera import Camera
 from graphics.ui import UI
+from graphics.text_cache import text_cache
 from systems.controller import Controller
+from utils.profiler import FrameProfiler
+from utils.asset_manager import AssetManager
 
 logger = logging.getLogger(__name__)
 
@@ -46,12 +49,31 @@ class App:
         # Set up game components
         self.clock = pygame.time.Clock()
         self.fps_limit = self.config.get("video", "fps_limit", 60)
+        
+        # Push only changed screen areas to the display instead of flipping
+        self.use_dirty_rects = self.config.get("video", "dirty_rects", False)
+        self.previous_overlay_rects = []
+        
+        # Simulation timing
+        self.fixed_timestep = self.config.get("simulation", "fixed_timestep", True)
+        self.tick_rate = self.config.get("simulation", "tick_rate", 60)
+        self.max_catch_up_steps = self.config.get("simulation", "max_catch_up_steps", 5)
+        self.accumulator = 0.0
+        
         self.controller = Controller()
         self.camera = Camera(self.width, self.height)
         self.ui = UI(self.width, self.height)
         
+        # Frame profiler (F3 toggles it at runtime)
+        self.profiler = FrameProfiler(enabled=self.config.get("development", "profiler", False))
+        
+        # Decode the startup images in parallel behind a loading screen
+        self.assets = AssetManager()
+        self._show_loading_screen(self.assets.preload_manifest("assets/manifest.json", "startup"))
+        
         # Initialize game
-        self.game = Game(self.screen, self.controller, self.camera, self.ui, self.config)
+        self.game = Game(self.screen, self.controller, self.camera, self.ui, self.config, self.profiler,
+                         self.assets)
         
         # Game state
         self.running = True
@@ -66,26 +88,42 @@ class App:
             while self.running:
                 # Calculate delta time
                 dt = self.clock.tick(self.fps_limit) / 1000.0
+                self.profiler.begin_frame()
                 
                 # Process events
                 self._process_events()
                 
-                # Update controller
-                self.controller.update()
-                
-                # Update game
-                self.game.update(dt)
+                with self.profiler.section("update"):
+                    if self.fixed_timestep:
+                        interpolation = self._run_fixed_steps(dt)
+                    else:
+                        # Update controller
+                        self.controller.update()
+                        
+                        # Update game
+                        self.game.update(dt)
+                        interpolation = 1.0
                 
                 # Render
-                self.screen.fill((0, 0, 0))  # Clear screen
-                self.game.render(self.screen)
+                with self.profiler.section("render"):
+                    self.screen.fill((0, 0, 0))  # Clear screen
+                    self.game.render(self.screen, interpolation)
+                
+                # Overlays drawn on top of the game
+                overlay_rects = []
                 
                 # Display FPS if configured
                 if self.config.get("gameplay", "show_fps", False):
-                    self._show_fps()
+                    overlay_rects.append(self._show_fps())
+                
+                # Display profiler overlay
+                overlay_rects.append(self.profiler.render(self.screen))
                 
                 # Flip the display
-                pygame.display.flip()
+                with self.profiler.section("flip"):
+                    self._present(overlay_rects)
+                
+                self.profiler.end_frame()
                 
         except Exception as e:
             logger.error(f"Error in game loop: {e}")
@@ -95,6 +133,33 @@ class App:
         finally:
             self.quit()
     
+    def _run_fixed_steps(self, frame_time):
+        """
+        Advance the simulation in fixed-size ticks
+        
+        Args:
+            frame_time: Real time since the last frame in seconds
+        
+        Returns:
+            Interpolation alpha (0-1) between the last two simulation states
+        """
+        step = 1.0 / self.tick_rate
+        self.accumulator += frame_time
+        
+        steps = 0
+        while self.accumulator >= step and steps < self.max_catch_up_steps:
+            self.controller.update()
+            self.game.update(step)
+            self.accumulator -= step
+            steps += 1
+        
+        # Drop time we couldn't catch up on instead of spiralling further behind
+        if self.accumulator >= step:
+            logger.debug(f"Simulation behind, dropping {self.accumulator:.3f}s")
+            self.accumulator %= step
+        
+        return self.accumulator / step
+    
     def _process_events(self):
         """Process events from the event queue"""
         for event in pygame.event.get():
@@ -103,6 +168,9 @@ class App:
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                 # Toggle fullscreen with F11
                 self._toggle_fullscreen()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Toggle frame profiler with F3
+                self.profiler.toggle()
             
             # Pass events to game
             self.game.handle_event(event)
@@ -127,16 +195,60 @@ class App:
             
         logger.info(f"Fullscreen toggled: {self.fullscreen}")
     
+    def _show_loading_screen(self, batch):
+        """Draw a progress bar until a PreloadBatch has finished"""
+        bar = pygame.Rect(0, 0, self.width // 2, 20)
+        bar.center = (self.width // 2, self.height // 2)
+        
+        while not batch.done:
+            pygame.event.pump()
+            progress = batch.poll()
+            
+            self.screen.fill((0, 0, 0))
+            text = text_cache.render("Loading...", 36, (255, 255, 255))
+            self.screen.blit(text, text.get_rect(midbottom=(bar.centerx, bar.top - 10)))
+            pygame.draw.rect(self.screen, (80, 80, 80), bar, 2)
+            pygame.draw.rect(self.screen, (255, 255, 255), (bar.x, bar.y, int(bar.width * progress), bar.height))
+            pygame.display.flip()
+            self.clock.tick(60)
+        
+        if batch.failed:
+            logger.warning(f"{len(batch.failed)} images failed to preload")
+    
     def _show_fps(self):
         """Display FPS counter"""
         fps = int(self.clock.get_fps())
-        font = pygame.font.Font(None, 24)
-        fps_text = font.render(f"FPS: {fps}", True, (255, 255, 255))
-        self.screen.blit(fps_text, (10, 10))
+        fps_text = text_cache.render(f"FPS: {fps}", 24, (255, 255, 255))
+        return self.screen.blit(fps_text, (10, 10))
+    
+    def _present(self, overlay_rects):
+        """
+        Show the finished frame
+        
+        Args:
+            overlay_rects: Areas drawn over the game this frame (None entries are ignored)
+        """
+        dirty_rects = self.game.dirty_rects if self.use_dirty_rects else None
+        if dirty_rects is None:
+            pygame.display.flip()
+            return
+        
+        # Overlays are redrawn every frame, as are the areas they covered last frame
+        overlay_rects = [rect for rect in overlay_rects if rect is not None]
+        rects = dirty_rects + overlay_rects + self.previous_overlay_rects
+        self.previous_overlay_rects = overlay_rects
+        if rects:
+            pygame.display.update(rects)
     
     def quit(self):
         """Clean up and quit"""
         logger.info("Shutting down")
+        
+        # Save frame timings if any were collected
+        if self.profiler.frame_count:
+            self.profiler.dump(self.config.get("development", "profile_output", "logs/frame_profile.json"))
+        
+        self.assets.shutdown()
         pygame.quit()
         sys.exit()
 
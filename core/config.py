@@ -15,7 +15,8 @@ class Config:
             "height": 600,
             "fullscreen": False,
             "vsync": True,
-            "fps_limit": 60
+            "fps_limit": 60,
+            "dirty_rects": False
         },
         "audio": {
             "music_volume": 0.7,
@@ -40,9 +41,21 @@ class Config:
             "show_fps": False,
             "show_hitboxes": False
         },
+        "simulation": {
+            "fixed_timestep": True,
+            "tick_rate": 60,
+            "max_catch_up_steps": 5,
+            "ecs": False,  # Component storage updates every entity each tick, so the lod settings don't apply
+            "lod": True,
+            "lod_active_radius": 1000,
+            "lod_dormant_radius": 2400,
+            "lod_dormant_interval": 4
+        },
         "development": {
             "debug_mode": False,
-            "log_level": "INFO"
+            "log_level": "INFO",
+            "profiler": False,
+            "profile_output": "logs/frame_profile.json"
         }
     }
     
@@ -6,8 +6,23 @@ import logging
 from entities.player import Player
 from entities.enemy import Enemy
 from entities.collectible import Collectible
+from projectile import Projectile
+from physics_wrapper import move_and_slide, sweep_batch
+from systems.entity_pool import EntityRegistry
+from systems.culling import CullingStage
+from systems.simulation_lod import SimulationLOD
+from systems.sweep_and_prune import SweepAndPrune
+from graphics.particles import ParticleSystem
+from graphics.text_cache import text_cache
 from utils.asset_manager import AssetManager
 from core.level import Level
+from utils.profiler import FrameProfiler
+
+# Component storage needs NumPy
+try:
+    from systems.ecs import World, culling_system
+except ImportError:
+    World = None
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +30,7 @@ class Game:
     """
     Main game class that manages game logic and state
     """
-    def __init__(self, screen, controller=None, camera=None, ui=None, config=None):
+    def __init__(self, screen, controller=None, camera=None, ui=None, config=None, profiler=None, assets=None):
         """
         Initialize the game
         
@@ -25,15 +40,21 @@ class Game:
             camera: Camera for screen scrolling
             ui: UI renderer
             config: Game configuration
+            profiler: FrameProfiler for per-subsystem timings
+            assets: AssetManager, e.g. one that has already preloaded images
         """
         self.screen = screen
         self.controller = controller
         self.camera = camera
         self.ui = ui
         self.config = config
+        self.profiler = profiler or FrameProfiler(enabled=False)
+        
+        # Decides what the camera can see; also pauses off-screen animations
+        self.culling = CullingStage(camera, self.profiler)
         
         # Initialize asset manager
-        self.assets = AssetManager()
+        self.assets = assets or AssetManager()
         
         # Game state
         self.running = True
@@ -47,11 +68,45 @@ class Game:
         player_x = screen_width // 2
         player_y = screen_height // 2
         self.player = Player(player_x, player_y, self.assets)
+        self.player.controller = self.controller
+        
+        # Optional component storage that simulates enemies, collectibles and projectiles
+        use_ecs = self.config.get("simulation", "ecs", False) if self.config else False
+        tick_rate = self.config.get("simulation", "tick_rate", 60) if self.config else 60
+        self.world = World(tick_rate=tick_rate) if use_ecs and World is not None else None
+        
+        # Far-away enemies are updated at a reduced rate, or not at all
+        # (only without component storage, which updates every entity each tick)
+        self.lod = None
+        if self.world is None and self.config and self.config.get("simulation", "lod", True):
+            self.lod = SimulationLOD(
+                active_radius=self.config.get("simulation", "lod_active_radius", 1000),
+                dormant_radius=self.config.get("simulation", "lod_dormant_radius", 2400),
+                dormant_interval=self.config.get("simulation", "lod_dormant_interval", 4)
+            )
+        
+        # Pools for short-lived entities
+        self.pools = EntityRegistry()
+        self.pools.register("projectile", Projectile)
+        self.pools.register("collectible", Collectible)
+        
+        # Broadphase over moving entities for pickups and hits
+        self.broadphase = SweepAndPrune()
+        self.broadphase.add(self.player, "player")
         
         # Game objects
         self.enemies = []
         self.collectibles = []
         self.projectiles = []
+        self.particle_system = ParticleSystem()
+        
+        # Positions before the last update, for render interpolation
+        self.previous_positions = []
+        self.previous_camera_offset = None
+        
+        # Finished frame reused while the world is frozen (paused / game over)
+        self.frozen_frame = None
+        self.dirty_rects = None  # Screen areas changed by the last render, None for all
         
         # Set up initial game elements
         self._initialize_game_elements()
@@ -61,19 +116,50 @@ class Game:
     def _initialize_game_elements(self):
         """Initialize basic game elements like enemies and collectibles"""
         # Add some enemies
-        self.enemies = [
-            Enemy(200, 300, self.assets),
-            Enemy(600, 300, self.assets)
-        ]
+        self.enemies = []
+        self.spawn_enemy(200, 300)
+        self.spawn_enemy(600, 300)
         
         # Add some collectibles
-        self.collectibles = [
-            Collectible(300, 400, "health", self.assets),
-            Collectible(500, 400, "coin", self.assets)
-        ]
+        self.collectibles = []
+        self.spawn_collectible(300, 400, "health")
+        self.spawn_collectible(500, 400, "coin")
         
         logger.info("Game elements initialized")
     
+    def spawn_enemy(self, x, y, enemy_class=Enemy):
+        """Create an enemy and add it to the game"""
+        enemy = enemy_class(x, y, self.assets)
+        self.enemies.append(enemy)
+        self.broadphase.add(enemy, "enemies")
+        if self.world is not None:
+            self.world.attach(enemy)
+        return enemy
+    
+    def spawn_projectile(self, x, y, direction, **kwargs):
+        """Create a projectile (reusing a pooled one) and add it to the game"""
+        projectile = self.pools.spawn("projectile", x, y, direction, **kwargs)
+        self.projectiles.append(projectile)
+        self.broadphase.add(projectile, f"{projectile.owner}_projectiles")
+        if self.world is not None:
+            self.world.attach(projectile)
+        return projectile
+    
+    def spawn_collectible(self, x, y, collectible_type):
+        """Create a collectible (reusing a pooled one) and add it to the game"""
+        collectible = self.pools.spawn("collectible", x, y, collectible_type, self.assets)
+        self.collectibles.append(collectible)
+        self.broadphase.add(collectible, "collectibles")
+        if self.world is not None:
+            self.world.attach(collectible)
+        return collectible
+    
+    def _on_despawn(self, entity):
+        """Forget the broadphase entry and component entity of a despawned object"""
+        self.broadphase.remove(entity)
+        if self.world is not None:
+            self.world.detach(entity)
+    
     def handle_event(self, event):
         """Handle game events"""
         if event.type == pygame.KEYDOWN:
@@ -103,9 +189,22 @@ class Game:
         # Reset player
         screen_width, screen_height = self.screen.get_size()
         self.player = Player(screen_width // 2, screen_height // 2, self.assets)
+        self.player.controller = self.controller
         
-        # Reset game elements
+        # Hand the old entities back to their pools and reset game elements
+        self.pools.release_all("collectible", self.collectibles)
+        self.pools.release_all("projectile", self.projectiles)
+        if self.world is not None:
+            self.world.clear()
+        if self.lod is not None:
+            self.lod.forget()
+        self.broadphase.clear()
+        self.broadphase.add(self.player, "player")
         self._initialize_game_elements()
+        self.projectiles = []
+        self.particle_system = ParticleSystem()
+        self.previous_positions = []
+        self.previous_camera_offset = None
         
         logger.info("Game restarted")
     
@@ -115,83 +214,248 @@ class Game:
         if self.game_state != "playing":
             return
         
+        self._store_previous_positions()
+        
+        profiler = self.profiler
+        
         # Update player
-        if hasattr(self.player, 'update'):
-            self.player.update(dt)
+        with profiler.section("update.player"):
+            start_x, start_y = self.player.rect.topleft
+            if hasattr(self.player, 'update'):
+                self.player.update(dt)
         
         # Handle player-level collision
-        if hasattr(self.level, 'check_collision'):
-            # Check player feet for ground collision
-            feet_rect = pygame.Rect(
-                self.player.rect.x,
-                self.player.rect.y + self.player.rect.height - 5,
-                self.player.rect.width,
-                5
-            )
+        with profiler.section("update.collision"):
+            obstacles = self._level_obstacles()
+            if obstacles is not None:
+                # Sweep the player's whole move so fast falls can't skip thin platforms
+                rect = self.player.rect
+                new_x, new_y, _, _, _, normal_y, _ = move_and_slide(
+                    start_x, start_y, rect.width, rect.height,
+                    rect.x - start_x, rect.y - start_y, obstacles
+                )
+                rect.topleft = (new_x, new_y)
+                if normal_y:
+                    self.player.velocity[1] = 0
+                if normal_y < 0:
+                    # Landed on something
+                    self.player.on_ground = True
+                elif self.player.velocity[1] > 0:
+                    # Falling without landing: walked off a ledge
+                    self.player.on_ground = False
+        
+        # Update enemies (or, with component storage, every simulated entity at once)
+        with profiler.section("update.enemies"):
+            if self.world is not None:
+                self.world.update(dt)
+                self.world.sync_objects()
+            elif self.lod is not None:
+                self.lod.update("enemies", self.enemies, self.player.rect.center,
+                                lambda enemy, ticks: enemy.update(dt * ticks, ticks))
+                if profiler.enabled:
+                    for name, tiers in self.lod.get_stats().items():
+                        profiler.set_counter(f"lod.{name}", "{active}/{dormant}/{frozen}".format(**tiers))
+            else:
+                for enemy in self.enemies:
+                    if hasattr(enemy, 'update'):
+                        enemy.update(dt)
+        
+        # Update collectibles
+        with profiler.section("update.collectibles"):
+            if self.world is None:
+                for collectible in self.collectibles:
+                    if hasattr(collectible, 'update'):
+                        collectible.update(dt)
+        
+        # Update projectiles
+        with profiler.section("update.projectiles"):
+            # Projectiles that would hit level geometry on their next move are stopped
+            if obstacles is not None and self.projectiles:
+                projectiles = self.projectiles
+                time_of_impact = sweep_batch(
+                    [projectile.rect.x for projectile in projectiles],
+                    [projectile.rect.y for projectile in projectiles],
+                    [projectile.rect.width for projectile in projectiles],
+                    [projectile.rect.height for projectile in projectiles],
+                    [projectile.velocity_x for projectile in projectiles],
+                    [projectile.velocity_y for projectile in projectiles],
+                    obstacles, max_iterations=1
+                )[6]
+                for projectile, time in zip(projectiles, time_of_impact):
+                    if time < 1.0:
+                        projectile.kill()
             
-            ground_collisions = self.level.check_collision(feet_rect)
-            if ground_collisions:
-                # Set player on ground
-                self.player.rect.bottom = ground_collisions[0].top
-                self.player.velocity[1] = 0
-                self.player.on_ground = True
-        
-        # Update enemies
-        for enemy in self.enemies:
-            if hasattr(enemy, 'update'):
-                enemy.update(dt)
-        
-        # Update collectibles and check player collection
-        for collectible in self.collectibles[:]:
-            if hasattr(collectible, 'update'):
-                collectible.update(dt)
+            if self.world is None:
+                for projectile in self.projectiles:
+                    projectile.update()
+        
+        # Find pickups and hits among the moved entities
+        with profiler.section("update.hits"):
+            self.broadphase.update()
+            self._resolve_pickups()
+            self._resolve_projectile_hits()
             
-            if collectible.rect.colliderect(self.player.rect):
-                if collectible.collectible_type == "health":
-                    # Health pickup
-                    self.player.health = min(self.player.health + 25, self.player.max_health)
-                elif collectible.collectible_type == "coin":
-                    # Coin pickup
-                    if not hasattr(self.player, 'coins'):
-                        self.player.coins = 0
-                    self.player.coins += 1
-                
-                self.collectibles.remove(collectible)
-                logger.debug(f"Collected {collectible.collectible_type}")
+            # Drop collected items and spent projectiles in one pass each
+            self.collectibles = self.pools.compact("collectible", self.collectibles, self._on_despawn)
+            self.projectiles = self.pools.compact("projectile", self.projectiles, self._on_despawn)
+        
+        # Update particles
+        with profiler.section("update.particles"):
+            self.particle_system.update()
         
         # Update camera to follow player
         if self.camera:
             self.camera.follow(self.player)
     
-    def render(self, screen):
-        """Render the game"""
+    def _resolve_pickups(self):
+        """Collect the pickups the player touches"""
+        for _, collectible in self.broadphase.pairs("player", "collectibles"):
+            if collectible.collected:
+                continue
+            if collectible.collectible_type == "health":
+                # Health pickup
+                self.player.health = min(self.player.health + 25, self.player.max_health)
+            elif collectible.collectible_type == "coin":
+                # Coin pickup
+                if not hasattr(self.player, 'coins'):
+                    self.player.coins = 0
+                self.player.coins += 1
+            
+            collectible.collected = True
+            logger.debug(f"Collected {collectible.collectible_type}")
+    
+    def _resolve_projectile_hits(self):
+        """Apply projectile hits on enemies and the player from broadphase pairs"""
+        # A player projectile is spent on the first enemy it hits
+        dead = []
+        for projectile, enemy in self.broadphase.pairs("player_projectiles", "enemies"):
+            if projectile.is_expired() or enemy.health <= 0:
+                continue
+            enemy.health -= projectile.damage
+            projectile.kill()
+            if enemy.health <= 0:
+                dead.append(enemy)
+        
+        if dead:
+            for enemy in dead:
+                self._on_despawn(enemy)
+            self.enemies = [enemy for enemy in self.enemies if enemy.health > 0]
+        
+        for projectile, _ in self.broadphase.pairs("enemy_projectiles", "player"):
+            if not projectile.is_expired():
+                self.player.take_damage(projectile.damage)
+                projectile.kill()
+    
+    def _level_obstacles(self):
+        """Get the level's collision index, or None if it doesn't have one"""
+        for name in ("spatial_index", "tile_index"):
+            index = getattr(self.level, name, None)
+            if index is not None:
+                return index
+        return None
+    
+    def _store_previous_positions(self):
+        """Remember where entities are before this update for render interpolation"""
+        entities = [self.player] + self.enemies + self.collectibles + self.projectiles
+        self.previous_positions = [(entity, entity.rect.x, entity.rect.y) for entity in entities]
+        self.previous_camera_offset = self.camera.get_offset() if self.camera else None
+    
+    def render(self, screen, interpolation=1.0):
+        """
+        Render the game
+        
+        Args:
+            screen: Surface to draw on
+            interpolation: Fraction (0-1) of the way from the previous
+                simulation state to the current one, used to smooth motion
+                when the simulation runs at a fixed tick rate
+        """
+        # Nothing moves while paused or after game over, so reuse the last frame
+        frozen = self.game_state != "playing"
+        if not frozen:
+            self.frozen_frame = None
+        elif self.frozen_frame is not None and self.frozen_frame.get_size() == screen.get_size():
+            screen.blit(self.frozen_frame, (0, 0))
+            self.dirty_rects = []
+            return
+        
         # Get camera offset if camera exists
         camera_offset = self.camera.get_offset() if self.camera else (0, 0)
         
-        # Draw level
-        if hasattr(self.level, 'render'):
-            self.level.render(screen, camera_offset)
-        
-        # Draw collectibles
-        for collectible in self.collectibles:
-            collectible.render(screen, camera_offset)
+        # Draw entities between their previous and current positions
+        moved = []
+        if interpolation < 1.0 and self.game_state == "playing":
+            for entity, previous_x, previous_y in self.previous_positions:
+                current_x, current_y = entity.rect.x, entity.rect.y
+                if (current_x, current_y) != (previous_x, previous_y):
+                    moved.append((entity, current_x, current_y))
+                    entity.rect.x = round(previous_x + (current_x - previous_x) * interpolation)
+                    entity.rect.y = round(previous_y + (current_y - previous_y) * interpolation)
             
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.render(screen, camera_offset)
-            
-        # Draw player
-        self.player.render(screen, camera_offset)
+            if self.previous_camera_offset is not None:
+                camera_offset = (
+                    round(self.previous_camera_offset[0] + (camera_offset[0] - self.previous_camera_offset[0]) * interpolation),
+                    round(self.previous_camera_offset[1] + (camera_offset[1] - self.previous_camera_offset[1]) * interpolation)
+                )
+        
+        try:
+            self._render_world(screen, camera_offset)
+        finally:
+            # Put entities back at their simulated positions
+            for entity, x, y in moved:
+                entity.rect.x = x
+                entity.rect.y = y
         
         # Draw UI (if exists)
         if self.ui:
-            self.ui.render(screen, self.player)
+            with self.profiler.section("render.ui"):
+                self.ui.render(screen, self.player)
         
         # Render game state overlays
         if self.game_state == "paused":
             self._render_pause_screen(screen)
         elif self.game_state == "game_over":
             self._render_game_over_screen(screen)
+        
+        # The world scrolls, so a redrawn frame changes the whole screen
+        self.dirty_rects = None
+        if frozen:
+            self.frozen_frame = screen.copy()
+    
+    def _render_world(self, screen, camera_offset):
+        """Render the level and the entities inside the view"""
+        culling = self.culling
+        view = culling.begin(camera_offset, screen.get_size())
+        if self.world is not None:
+            culling_system(self.world, view.x, view.y, view.width, view.height)
+        
+        # Draw level
+        if hasattr(self.level, 'render'):
+            with self.profiler.section("render.level"):
+                self.level.render(screen, camera_offset, culling=culling)
+        
+        with self.profiler.section("render.entities"):
+            # Draw collectibles
+            for collectible in culling.visible("collectibles", self.collectibles):
+                collectible.render(screen, camera_offset)
+                
+            # Draw enemies
+            for enemy in culling.visible("enemies", self.enemies):
+                enemy.render(screen, camera_offset)
+                
+            # Draw projectiles
+            for projectile in culling.visible("projectiles", self.projectiles):
+                projectile.render(screen, camera_offset)
+                
+            # Draw player
+            self.player.render(screen, camera_offset)
+        
+        # Draw particles
+        with self.profiler.section("render.particles"):
+            drawn = self.particle_system.render(screen, camera_offset)
+            culling.record("particles", drawn, self.particle_system.get_particle_count() - drawn)
+        
+        culling.report()
     
     def _render_pause_screen(self, screen):
         """Render the pause screen overlay"""
@@ -202,14 +466,12 @@ class Game:
         screen.blit(overlay, (0, 0))
         
         # Pause text
-        font = pygame.font.Font(None, 74)
-        text = font.render("PAUSED", True, (255, 255, 255))
+        text = text_cache.render("PAUSED", 74, (255, 255, 255))
         text_rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
         screen.blit(text, text_rect)
         
         # Instructions
-        font_small = pygame.font.Font(None, 30)
-        instruct = font_small.render("Press ESC to resume", True, (200, 200, 200))
+        instruct = text_cache.render("Press ESC to resume", 30, (200, 200, 200))
         instruct_rect = instruct.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 + 50))
         screen.blit(instruct, instruct_rect)
     
@@ -222,13 +484,11 @@ class Game:
         screen.blit(overlay, (0, 0))
         
         # Game over text
-        font = pygame.font.Font(None, 74)
-        text = font.render("GAME OVER", True, (255, 0, 0))
+        text = text_cache.render("GAME OVER", 74, (255, 0, 0))
         text_rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
         screen.blit(text, text_rect)
         
         # Instructions
-        font_small = pygame.font.Font(None, 30)
-        instruct = font_small.render("Press R to restart", True, (200, 200, 200))
+        instruct = text_cache.render("Press R to restart", 30, (200, 200, 200))
         instruct_rect = instruct.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 + 50))
         screen.blit(instruct, instruct_rect)
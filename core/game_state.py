@@ -1,6 +1,7 @@
 import pygame
 import json
 import os
+from graphics.text_cache import text_cache
 
 class GameState:
     def __init__(self):
@@ -43,16 +44,14 @@ class GameState:
         screen.fill((0, 0, 0))
         
         # Draw title
-        font_title = pygame.font.Font(None, 74)
-        title_text = font_title.render("Metroidvania Game", True, (255, 255, 255))
+        title_text = text_cache.render("Metroidvania Game", 74, (255, 255, 255))
         title_rect = title_text.get_rect(center=(screen.get_width() // 2, 150))
         screen.blit(title_text, title_rect)
         
         # Draw options
-        font = pygame.font.Font(None, 48)
         for i, option in enumerate(self.menu_options):
             color = (255, 255, 0) if i == self.selected_option else (255, 255, 255)
-            text = font.render(option, True, color)
+            text = text_cache.render(option, 48, color)
             text_rect = text.get_rect(center=(screen.get_width() // 2, 300 + i * 60))
             screen.blit(text, text_rect)
     
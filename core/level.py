@@ -1,4 +1,6 @@
 import pygame
+from systems.spatial_hash import SpatialHash
+from systems.culling import CullingStage
 
 class Level:
     """Level management and rendering"""
@@ -6,6 +8,7 @@ class Level:
     def __init__(self, asset_manager):
         self.asset_manager = asset_manager
         self.platforms = []
+        self.spatial_index = SpatialHash(cell_size=128)  # Broadphase for platform collisions
         self.background = None
         self.width = 2000  # Level width (larger than screen)
         self.height = 1000  # Level height
@@ -26,6 +29,9 @@ class Level:
         
         self.platforms.extend([plat1, plat2, plat3])
         
+        # Register the static geometry once for collision queries
+        self.spatial_index.rebuild(self.platforms)
+        
         # Try to load background
         try:
             self.background = self.asset_manager.load_image("assets/images/tiles/background.png")
@@ -41,8 +47,24 @@ class Level:
         """Return the list of platforms for collision detection"""
         return self.platforms
     
-    def render(self, screen, camera_offset=(0, 0)):
-        """Render the level with camera offset"""
+    def add_platform(self, rect):
+        """Add a platform and register it in the collision index"""
+        self.platforms.append(rect)
+        self.spatial_index.insert(rect)
+    
+    def render(self, screen, camera_offset=(0, 0), culling=None):
+        """
+        Render the level with camera offset
+        
+        Args:
+            screen: Surface to draw on
+            camera_offset: Camera position
+            culling: CullingStage for this frame (a local one is used if omitted)
+        """
+        if culling is None:
+            culling = CullingStage(margin=0)
+            culling.begin(camera_offset, screen.get_size())
+        
         # Draw background
         if self.background:
             # Only draw visible portion of background
@@ -50,26 +72,12 @@ class Level:
                                    screen.get_width(), screen.get_height())
             screen.blit(self.background, (0, 0), view_rect)
         
-        # Draw platforms
-        for platform in self.platforms:
-            # Apply camera offset
-            platform_rect = pygame.Rect(
-                platform.x - camera_offset[0],
-                platform.y - camera_offset[1],
-                platform.width,
-                platform.height
-            )
-            
-            # Only draw if on screen
-            if (platform_rect.right > 0 and platform_rect.left < screen.get_width() and
-                platform_rect.bottom > 0 and platform_rect.top < screen.get_height()):
-                pygame.draw.rect(screen, (100, 100, 100), platform_rect)
-                pygame.draw.rect(screen, (50, 50, 50), platform_rect, 2)  # Border
+        # Draw the platforms the spatial index finds inside the view
+        for platform in culling.visible_rects("platforms", self.spatial_index):
+            platform_rect = platform.move(-camera_offset[0], -camera_offset[1])
+            pygame.draw.rect(screen, (100, 100, 100), platform_rect)
+            pygame.draw.rect(screen, (50, 50, 50), platform_rect, 2)  # Border
     
     def check_collision(self, entity_rect):
         """Check if an entity collides with any platform"""
-        collisions = []
-        for platform in self.platforms:
-            if entity_rect.colliderect(platform):
-                collisions.append(platform)
-        return collisions
+        return self.spatial_index.query(entity_rect)
@@ -1,6 +1,7 @@
 import pygame
 import json
 import os
+from graphics.text_cache import font_registry, text_cache
 
 class DialogSystem:
     """System for displaying in-game dialog and cutscenes"""
@@ -26,8 +27,9 @@ class DialogSystem:
         self.portrait_size = 100
         
         # Font settings
-        self.font = pygame.font.Font(None, 24)
-        self.name_font = pygame.font.Font(None, 30)
+        self.font_size = 24
+        self.name_font_size = 30
+        self.font = font_registry.get(self.font_size)
         
         # Load dialog data
         self._load_dialog_data()
@@ -178,7 +180,7 @@ class DialogSystem:
         
         # Draw speaker name if provided
         if speaker:
-            name_surface = self.name_font.render(speaker, True, (255, 255, 100))
+            name_surface = text_cache.render(speaker, self.name_font_size, (255, 255, 100))
             name_rect = name_surface.get_rect()
             name_rect.topleft = (text_start_x, dialog_rect.top + 15)
             screen.blit(name_surface, name_rect.topleft)
@@ -193,14 +195,14 @@ class DialogSystem:
         
         text_y = text_rect_top
         for line in wrapped_text:
-            text_surface = self.font.render(line, True, self.text_color)
+            text_surface = text_cache.render(line, self.font_size, self.text_color)
             screen.blit(text_surface, (text_start_x, text_y))
             text_y += self.font.get_linesize()
         
         # Draw "continue" indicator if waiting for input
         if self.waiting_for_input:
             indicator = "▼" if pygame.time.get_ticks() % 1000 < 500 else "▽"  # Blinking indicator
-            indicator_surface = self.font.render(indicator, True, (255, 255, 255))
+            indicator_surface = text_cache.render(indicator, self.font_size, (255, 255, 255))
             screen.blit(indicator_surface, (dialog_rect.right - 30, dialog_rect.bottom - 30))
     
     def wrap_text(self, text, max_width):
@@ -1,46 +1,62 @@
 import pygame
-from systems.animation import AnimatedSprite, Animation
+from systems.animation import AnimatedSprite, AnimationClip
 
 class Collectible(AnimatedSprite):
     """Collectible items that provide benefits to the player"""
     
     def __init__(self, x, y, collectible_type, asset_manager):
         super().__init__(x, y)
-        self.collectible_type = collectible_type
-        self.asset_manager = asset_manager
-        self.collected = False
+        self.collectible_type = None
         self.rect.width = 20
         self.rect.height = 20
+        self.reset(x, y, collectible_type, asset_manager)
+    
+    def reset(self, x, y, collectible_type, asset_manager):
+        """(Re)initialize the collectible; lets pooled collectibles be reused"""
+        self.rect.x = x
+        self.rect.y = y
+        self.asset_manager = asset_manager
+        self.collected = False
         
         # Define animation based on type
-        self._setup_animation()
+        if collectible_type != self.collectible_type:
+            self.collectible_type = collectible_type
+            self.animations = {}
+            self.current_animation = None
+            self._setup_animation()
+        else:
+            self.play_animation("idle")
     
     def _setup_animation(self):
         """Set up animations based on collectible type"""
         try:
-            # Try to load collectible animation
-            if self.collectible_type == "health":
-                image = self.asset_manager.load_image("assets/images/collectibles/health.png")
-                frames = [image]
-            elif self.collectible_type == "coin":
-                image = self.asset_manager.load_image("assets/images/collectibles/coin.png")
-                frames = [image]
+            # Try to load collectible animation (shared by every collectible of this type)
+            clip_name = f"collectible_{self.collectible_type}"
+            if self.collectible_type in ("health", "coin"):
+                clip = self.asset_manager.load_animation_clip(
+                    clip_name, f"assets/images/collectibles/{self.collectible_type}.png", 5)
             else:
                 # Default collectible
-                image = self.asset_manager.create_fallback_image(20, 20)
-                frames = [image]
+                clip = self.asset_manager.get_animation_clip(clip_name)
+                if clip is None:
+                    image = self.asset_manager.create_fallback_image(20, 20)
+                    clip = self.asset_manager.register_animation_clip(clip_name, AnimationClip([image], 5))
                 
             # Create animation
-            self.add_animation("idle", Animation(frames, 5))
+            self.add_animation("idle", clip)
             self.play_animation("idle")
             
         except Exception as e:
             print(f"Error loading collectible: {e}")
             # Create fallback animation
             fallback = [self.asset_manager.create_fallback_image(20, 20)]
-            self.add_animation("idle", Animation(fallback))
+            self.add_animation("idle", AnimationClip(fallback))
             self.play_animation("idle")
     
+    def is_expired(self):
+        """Check if the collectible has been picked up"""
+        return self.collected
+    
     def update(self, dt):
         """Update the collectible"""
         # Simple floating animation
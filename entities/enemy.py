@@ -1,7 +1,7 @@
 import pygame
 import math
 import random
-from systems.animation import AnimatedSprite, Animation
+from systems.animation import AnimatedSprite, AnimationClip
 
 class Enemy(AnimatedSprite):
     """Base class for all enemies"""
@@ -31,18 +31,25 @@ class Enemy(AnimatedSprite):
         """Load enemy animations"""
         try:
             # Load enemy sprite
-            idle_frames = [self.asset_manager.load_image("assets/images/enemies/enemy.png")]
-            self.add_animation("idle", Animation(idle_frames, 5))
+            idle = self.asset_manager.load_animation_clip("enemy_idle", "assets/images/enemies/enemy.png", 5)
+            self.add_animation("idle", idle)
             self.play_animation("idle")
         except Exception as e:
             print(f"Error loading enemy animations: {e}")
-            # Create fallback animation
+            # Create fallback animation, shared by later enemies
             fallback = [self.asset_manager.create_fallback_image(50, 50)]
-            self.add_animation("idle", Animation(fallback))
+            self.add_animation("idle", self.asset_manager.register_animation_clip("enemy_idle", AnimationClip(fallback)))
             self.play_animation("idle")
     
-    def update(self, dt):
-        """Update enemy behavior"""
+    def update(self, dt, ticks=1):
+        """
+        Update enemy behavior
+        
+        Args:
+            dt: Time step in seconds
+            ticks: Number of game ticks dt covers (more than one when the
+                enemy is updated at a reduced rate far from the player)
+        """
         # Simple movement
         self.velocity[0] = self.speed * self.direction
         
@@ -56,7 +63,7 @@ class Enemy(AnimatedSprite):
             self.direction = -1
         
         # Update animation
-        self.update_animation()
+        self.update_animation(ticks)
     
     def render(self, screen, camera_offset=(0, 0)):
         """Render the enemy with camera offset"""
@@ -99,20 +106,17 @@ class Boss(Enemy):
         self.speed = 30
         self.rect.width = 100
         self.rect.height = 100
-        
-        # Override animations
-        self._load_animations()
     
     def _load_animations(self):
         """Load boss animations"""
         try:
             # Load boss sprite
-            boss_frames = [self.asset_manager.load_image("assets/images/enemies/boss.png")]
-            self.add_animation("idle", Animation(boss_frames, 5))
+            idle = self.asset_manager.load_animation_clip("boss_idle", "assets/images/enemies/boss.png", 5)
+            self.add_animation("idle", idle)
             self.play_animation("idle")
         except Exception as e:
             print(f"Error loading boss animations: {e}")
             # Create fallback animation for boss
             fallback = [self.asset_manager.create_fallback_image(100, 100)]
-            self.add_animation("idle", Animation(fallback))
+            self.add_animation("idle", self.asset_manager.register_animation_clip("boss_idle", AnimationClip(fallback)))
             self.play_animation("idle")
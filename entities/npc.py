@@ -3,6 +3,8 @@ import random
 import json
 import os
 from dialog import DialogSystem
+from systems.animation import get_flipped
+from graphics.text_cache import text_cache
 
 class NPC:
     """Base class for non-player characters"""
@@ -34,6 +36,7 @@ class NPC:
         self.idle_direction_change = random.randint(60, 120)  # Frames before changing idle direction
         self.idle_move_speed = 0.2
         self.idle_direction = 0  # -1 = left, 0 = stand, 1 = right
+        self.on_screen = True  # Updated on every render
     
     def load_image(self, image_path):
         """Load NPC image"""
@@ -46,10 +49,17 @@ class NPC:
             self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
             self.image.fill(self.color)
     
-    def update(self, player=None):
-        """Update NPC state"""
+    def update(self, player=None, ticks=1):
+        """
+        Update NPC state
+        
+        Args:
+            player: Player, for subclasses that react to them
+            ticks: Number of game ticks to simulate (more than one when the
+                NPC is updated at a reduced rate far from the player)
+        """
         # Basic idle animation
-        self.idle_timer += 1
+        self.idle_timer += ticks
         if self.idle_timer >= self.idle_direction_change:
             self.idle_timer = 0
             self.idle_direction_change = random.randint(60, 120)
@@ -57,7 +67,7 @@ class NPC:
         
         # Apply idle movement
         if self.idle_direction != 0:
-            new_x = self.x + self.idle_direction * self.idle_move_speed
+            new_x = self.x + self.idle_direction * self.idle_move_speed * ticks
             # Check if movement would go out of bounds
             if 0 <= new_x <= 1280 - self.width:  # assuming 1280 is screen width
                 self.x = new_x
@@ -71,8 +81,19 @@ class NPC:
             elif self.idle_direction < 0:
                 self.facing_right = False
     
+    def is_visible(self, screen, camera_offset):
+        """Check whether the NPC or the labels above it overlap the screen"""
+        # Names and markers are drawn up to ~60px above and beside the sprite
+        view = pygame.Rect(camera_offset[0] - 100, camera_offset[1],
+                           screen.get_width() + 200, screen.get_height() + 60)
+        return view.colliderect(self.rect)
+    
     def render(self, screen, camera_offset):
         """Render NPC to the screen"""
+        self.on_screen = self.is_visible(screen, camera_offset)
+        if not self.on_screen:
+            return
+        
         npc_rect = self.rect.copy()
         npc_rect.x -= camera_offset[0]
         npc_rect.y -= camera_offset[1]
@@ -82,22 +103,20 @@ class NPC:
             if self.facing_right:
                 screen.blit(self.image, npc_rect.topleft)
             else:
-                flipped_image = pygame.transform.flip(self.image, True, False)
-                screen.blit(flipped_image, npc_rect.topleft)
+                screen.blit(get_flipped(self.image), npc_rect.topleft)
         else:
             # Draw a rectangle if no image
             pygame.draw.rect(screen, self.color, npc_rect)
         
         # Draw name above NPC
-        font = pygame.font.Font(None, 20)
-        name_text = font.render(self.name, True, (255, 255, 255))
+        name_text = text_cache.render(self.name, 20, (255, 255, 255))
         name_rect = name_text.get_rect(centerx=npc_rect.centerx, bottom=npc_rect.top - 5)
         screen.blit(name_text, name_rect)
         
         # Draw interaction indicator if player is within range
         if self.can_interact_with_player:
             indicator_y = npc_rect.top - 20
-            indicator_text = font.render("Press E to talk", True, (255, 255, 0))
+            indicator_text = text_cache.render("Press E to talk", 20, (255, 255, 0))
             indicator_rect = indicator_text.get_rect(centerx=npc_rect.centerx, bottom=indicator_y)
             screen.blit(indicator_text, indicator_rect)
     
@@ -199,6 +218,8 @@ class QuestGiverNPC(NPC):
     def render(self, screen, camera_offset):
         """Render quest giver NPC with quest indicator"""
         super().render(screen, camera_offset)
+        if not self.on_screen:
+            return
         
         # Add quest marker above NPC if they have available quests
         npc_rect = self.rect.copy()
@@ -207,8 +228,7 @@ class QuestGiverNPC(NPC):
         
         if self.available_quests or self.completion_quests:
             # Draw a yellow '!' for available quests
-            font = pygame.font.Font(None, 30)
-            quest_marker = font.render("!", True, (255, 255, 0))
+            quest_marker = text_cache.render("!", 30, (255, 255, 0))
             marker_rect = quest_marker.get_rect(centerx=npc_rect.centerx, bottom=npc_rect.top - 25)
             
             # Draw yellow circle behind the exclamation mark
@@ -16,6 +16,7 @@ class Player(AnimatedSprite):
         self.on_ground = False
         self.is_jumping = False
         self.facing_right = True
+        self.controller = None  # Controller to read input from (keyboard if None)
         
         # Combat properties
         self.health = 100
@@ -35,18 +36,17 @@ class Player(AnimatedSprite):
     def _load_animations(self):
         """Load player animations from sprite sheets"""
         try:
-            # Load animation frames from sprite sheets
-            idle_frames = self.asset_manager.load_sprite_sheet(
-                "assets/images/player/player_idle.png", 50, 50, 8)
-            run_frames = self.asset_manager.load_sprite_sheet(
-                "assets/images/player/player_run.png", 50, 50, 8)
-            jump_frames = self.asset_manager.load_sprite_sheet(
-                "assets/images/player/player_jump.png", 50, 50, 4)
-            
-            # Create animations with appropriate durations
-            self.add_animation("idle", Animation(idle_frames, 10))
-            self.add_animation("run", Animation(run_frames, 6))
-            self.add_animation("jump", Animation(jump_frames, 5, loop=False))
+            # Load shared animation clips from sprite sheets, with appropriate durations
+            assets = self.asset_manager
+            self.add_animation("idle", assets.load_animation_clip(
+                "player_idle", "assets/images/player/player_idle.png", 10,
+                frame_width=50, frame_height=50, frame_count=8))
+            self.add_animation("run", assets.load_animation_clip(
+                "player_run", "assets/images/player/player_run.png", 6,
+                frame_width=50, frame_height=50, frame_count=8))
+            self.add_animation("jump", assets.load_animation_clip(
+                "player_jump", "assets/images/player/player_jump.png", 5, loop=False,
+                frame_width=50, frame_height=50, frame_count=4))
             
             # Set initial animation
             self.play_animation("idle")
@@ -64,10 +64,7 @@ class Player(AnimatedSprite):
         if event.type == pygame.KEYDOWN:
             # Jump when space is pressed
             if event.key == pygame.K_SPACE and self.on_ground:
-                self.velocity[1] = -self.jump_power
-                self.on_ground = False
-                self.is_jumping = True
-                self.play_animation("jump")
+                self.jump()
             # Attack
             elif event.key == pygame.K_z or event.key == pygame.K_LCTRL:
                 self.attack()
@@ -81,19 +78,29 @@ class Player(AnimatedSprite):
         if self.invincibility_frames > 0:
             self.invincibility_frames -= dt
         
-        # Get keyboard state for movement
-        keys = pygame.key.get_pressed()
+        # Get input state for movement
+        if self.controller:
+            move_left = self.controller.is_pressed('left')
+            move_right = self.controller.is_pressed('right')
+            
+            # Jump (keyboard jumps also arrive through handle_event)
+            if self.controller.is_just_pressed('jump') and self.on_ground:
+                self.jump()
+        else:
+            keys = pygame.key.get_pressed()
+            move_left = keys[pygame.K_LEFT] or keys[pygame.K_a]
+            move_right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
         
         # Reset horizontal velocity
         self.velocity[0] = 0
         
         # Horizontal movement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if move_left:
             self.velocity[0] = -self.speed
             self.facing_right = False
             if self.on_ground and not self.is_jumping:
                 self.play_animation("run")
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        elif move_right:
             self.velocity[0] = self.speed
             self.facing_right = True
             if self.on_ground and not self.is_jumping:
@@ -130,6 +137,13 @@ class Player(AnimatedSprite):
         # Update animation
         self.update_animation()
     
+    def jump(self):
+        """Start a jump"""
+        self.velocity[1] = -self.jump_power
+        self.on_ground = False
+        self.is_jumping = True
+        self.play_animation("jump")
+    
     def attack(self):
         """Initiate an attack"""
         if self.attack_cooldown <= 0:
@@ -0,0 +1,274 @@
+"""
+Texture atlases: many small images packed into a few large pages
+
+An atlas is a set of page surfaces plus an index of named regions. Images
+taken from an atlas are subsurfaces of a page, so they share its pixels,
+and a frame can also be drawn straight from the page with its source rect
+(screen.blits([(atlas_page, position, area), ...])) so that consecutive
+draws use one source surface.
+
+Build an atlas offline with:
+
+    python -m graphics.atlas assets/Sprites assets/atlas/sprites
+
+which writes sprites_0.png, sprites_1.png, ... and sprites.json.
+"""
+import argparse
+import glob
+import json
+import os
+
+import pygame
+
+class TextureAtlas:
+    """Packed pages and the named regions inside them"""
+    def __init__(self, pages, regions):
+        """
+        Initialize an atlas
+
+        Args:
+            pages: List of page surfaces
+            regions: Dict of name -> (page_index, pygame.Rect)
+        """
+        self.pages = pages
+        self.regions = regions
+        self.surfaces = {}  # name -> subsurface, created on first use
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def __len__(self):
+        return len(self.regions)
+
+    def get_region(self, name):
+        """
+        Get the page surface and source rect of a region
+
+        Returns:
+            Tuple of (page surface, pygame.Rect)
+        """
+        page_index, rect = self.regions[name]
+        return self.pages[page_index], rect
+
+    def get_surface(self, name):
+        """Get a region as a subsurface sharing the page's pixels"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            page, rect = self.get_region(name)
+            surface = page.subsurface(rect)
+            self.surfaces[name] = surface
+        return surface
+
+    def get_frame_rects(self, name, frame_width, frame_height=None, count=None, spacing=0):
+        """
+        Get the source rects of the frames of a horizontal sprite sheet region
+
+        Args:
+            name: Region name
+            frame_width, frame_height: Frame size (height defaults to the region's)
+            count: Number of frames (defaults to as many as fit)
+            spacing: Pixels between frames
+
+        Returns:
+            Tuple of (page surface, list of pygame.Rect in page coordinates)
+        """
+        page, rect = self.get_region(name)
+        if frame_height is None:
+            frame_height = rect.height
+        if count is None:
+            count = max(1, (rect.width + spacing) // (frame_width + spacing))
+
+        rects = []
+        for i in range(count):
+            frame = pygame.Rect(rect.x + i * (frame_width + spacing), rect.y, frame_width, frame_height)
+            rects.append(frame.clip(rect))
+        return page, rects
+
+    def get_frames(self, name, frame_width, frame_height=None, count=None, spacing=0):
+        """Get the frames of a sprite sheet region as subsurfaces of its page"""
+        page, rects = self.get_frame_rects(name, frame_width, frame_height, count, spacing)
+        return [page.subsurface(rect) for rect in rects]
+
+    def save(self, path_prefix):
+        """
+        Write the pages and index
+
+        Args:
+            path_prefix: Output path without extension; pages are written to
+                <prefix>_<n>.png and the index to <prefix>.json
+        """
+        directory = os.path.dirname(path_prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        base = os.path.basename(path_prefix)
+        page_files = []
+        for index, page in enumerate(self.pages):
+            filename = f"{base}_{index}.png"
+            pygame.image.save(page, os.path.join(directory, filename))
+            page_files.append(filename)
+
+        index = {
+            "pages": page_files,
+            "regions": {name: {"page": page_index, "rect": list(rect)}
+                        for name, (page_index, rect) in self.regions.items()},
+        }
+        with open(path_prefix + ".json", "w") as f:
+            json.dump(index, f, indent=1)
+
+    @classmethod
+    def load(cls, index_path, convert=True):
+        """
+        Load an atlas written by save()
+
+        Args:
+            index_path: Path of the JSON index
+            convert: Convert the pages for the display (needs a display mode)
+        """
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        directory = os.path.dirname(index_path)
+        pages = []
+        for filename in index["pages"]:
+            page = pygame.image.load(os.path.join(directory, filename))
+            if convert and pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            pages.append(page)
+
+        regions = {name: (info["page"], pygame.Rect(info["rect"]))
+                   for name, info in index["regions"].items()}
+        return cls(pages, regions)
+
+class AtlasPacker:
+    """
+    Packs images into atlas pages with a shelf packer
+
+    Images are placed tallest first, left to right on horizontal shelves;
+    a new shelf starts when a row is full and a new page when a page is.
+    Images larger than a page get a page of their own.
+    """
+    def __init__(self, max_size=2048, padding=1):
+        """
+        Initialize the packer
+
+        Args:
+            max_size: Width and height limit of a page in pixels
+            padding: Empty pixels around every image, so that filtering and
+                rounding never pick up a neighbour
+        """
+        self.max_size = max_size
+        self.padding = padding
+        self.images = {}  # name -> surface
+
+    def add(self, name, surface):
+        """Queue an image for packing"""
+        if not surface.get_flags() & pygame.SRCALPHA:
+            # Bake colorkeys and opaque pixels into per-pixel alpha
+            with_alpha = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            with_alpha.blit(surface, (0, 0))
+            surface = with_alpha
+        self.images[name] = surface
+
+    def add_directory(self, root, pattern="**/*.png", name_prefix=None):
+        """
+        Queue every image under a directory
+
+        Args:
+            root: Directory to search
+            pattern: Glob pattern relative to root
+            name_prefix: Prefix for region names (defaults to root, so names
+                are the same paths AssetManager.load_image is given)
+
+        Returns:
+            Number of images added
+        """
+        if name_prefix is None:
+            name_prefix = root
+        paths = sorted(glob.glob(os.path.join(root, pattern), recursive=True))
+        for path in paths:
+            name = os.path.join(name_prefix, os.path.relpath(path, root)).replace(os.sep, "/")
+            self.add(name, pygame.image.load(path))
+        return len(paths)
+
+    def pack(self):
+        """
+        Pack the queued images
+
+        Returns:
+            TextureAtlas
+        """
+        padding = self.padding
+        limit = self.max_size
+        order = sorted(self.images.items(),
+                       key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+
+        placements = []  # (name, page_index, x, y)
+        page_sizes = []  # [used_width, used_height] per page
+        page = None
+        shelf_x = shelf_y = shelf_height = 0
+
+        for name, surface in order:
+            width = surface.get_width() + padding * 2
+            height = surface.get_height() + padding * 2
+
+            if width > limit or height > limit:
+                # Oversized images get a page to themselves
+                page_sizes.append([width, height])
+                placements.append((name, len(page_sizes) - 1, padding, padding))
+                page = None
+                continue
+
+            if page is not None and shelf_x + width > limit:
+                # Start a new shelf below the current one
+                shelf_y += shelf_height
+                shelf_x = shelf_height = 0
+            if page is None or shelf_y + height > limit:
+                page_sizes.append([0, 0])
+                page = len(page_sizes) - 1
+                shelf_x = shelf_y = shelf_height = 0
+
+            placements.append((name, page, shelf_x + padding, shelf_y + padding))
+            shelf_x += width
+            shelf_height = max(shelf_height, height)
+            size = page_sizes[page]
+            size[0] = max(size[0], shelf_x)
+            size[1] = max(size[1], shelf_y + shelf_height)
+
+        pages = [pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA) for w, h in page_sizes]
+        blits = [[] for _ in pages]
+        regions = {}
+        for name, page_index, x, y in placements:
+            surface = self.images[name]
+            blits[page_index].append((surface, (x, y)))
+            regions[name] = (page_index, pygame.Rect(x, y, surface.get_width(), surface.get_height()))
+
+        for page, page_blits in zip(pages, blits):
+            # Copy pixels, alpha included, instead of blending onto the empty page
+            page.blits([(surface, position, None, pygame.BLEND_RGBA_MAX) for surface, position in page_blits],
+                       doreturn=False)
+
+        return TextureAtlas(pages, regions)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack a directory of images into texture atlas pages")
+    parser.add_argument("source", help="Directory of images, e.g. assets/Sprites")
+    parser.add_argument("output", help="Output path without extension, e.g. assets/atlas/sprites")
+    parser.add_argument("--pattern", default="**/*.png", help="Glob pattern of images to pack")
+    parser.add_argument("--max-size", type=int, default=2048, help="Maximum page width and height")
+    parser.add_argument("--padding", type=int, default=1, help="Empty pixels around every image")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    packer = AtlasPacker(args.max_size, args.padding)
+    count = packer.add_directory(args.source, args.pattern)
+    atlas = packer.pack()
+    atlas.save(args.output)
+
+    source_pixels = sum(surface.get_width() * surface.get_height() for surface in packer.images.values())
+    page_pixels = sum(page.get_width() * page.get_height() for page in atlas.pages)
+    print(f"Packed {count} images into {len(atlas.pages)} pages "
+          f"({source_pixels / max(1, page_pixels):.0%} of page area used)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Compact binary map format (.tmap) for TileMap
+
+Layout (little-endian):
+
+    header      32 bytes, see HEADER
+    layers      layer_count * height * width uint16 tile ids, row-major
+    rects       rect_count * 4 int32 (x, y, width, height) merged collision rects
+    objects     objects_size bytes of UTF-8 JSON: the map's object list
+
+Tile layers are memory-mapped when NumPy is available, so opening a map
+only reads the header, the collision rects and the object table; rows are
+paged in as they are used. Without NumPy each row is read into an
+array('H').
+
+Convert a Tiled-style JSON map with:
+
+    python -m graphics.map_format level.json level.tmap --tile-size 32 --tileset assets/tileset
+"""
+import argparse
+import json
+import struct
+import sys
+from array import array
+
+import pygame
+
+# Memory-mapped layers need NumPy; rows of array('H') are used without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"TMAP"
+VERSION = 1
+EXTENSION = ".tmap"
+
+# magic, version, tile_size, width, height, layer_count, flags, rect_count, objects_size
+HEADER = struct.Struct("<4sHHIIHHII4x")
+RECT = struct.Struct("<4i")
+
+FLAG_MERGED = 1  # Collision rects were merged when the map was written
+
+class BinaryMap:
+    """Contents of a .tmap file"""
+    def __init__(self, tile_size, width, height, layers, collision_rects, objects, merged=True):
+        self.tile_size = tile_size
+        self.width = width
+        self.height = height
+        self.layers = layers  # Each layer is indexable as layer[y][x]
+        self.collision_rects = collision_rects
+        self.objects = objects
+        self.merged = merged
+
+def write_binary_map(path, tile_size, width, height, layers, collision_rects, objects=(), merged=True):
+    """
+    Write a map in the binary format
+
+    Args:
+        path: Output file path
+        tile_size: Tile width and height in pixels
+        width, height: Map size in tiles
+        layers: Tile layers, each a flat sequence or a list of rows of tile ids
+        collision_rects: Precomputed collision rects (pygame.Rect or 4-tuples)
+        objects: Tiled-style object dicts (spawns, transitions, collectibles)
+        merged: Whether the collision rects were merged
+    """
+    cells = width * height
+    objects_data = json.dumps(list(objects), separators=(",", ":")).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, tile_size, width, height, len(layers),
+                            FLAG_MERGED if merged else 0, len(collision_rects), len(objects_data)))
+
+        for layer in layers:
+            if np is not None and isinstance(layer, np.ndarray):
+                flat = array("H", np.ascontiguousarray(layer, dtype=np.uint16).tobytes())
+            elif len(layer) and isinstance(layer[0], (list, tuple, array)):
+                flat = array("H", (tile_id for row in layer for tile_id in row))
+            else:
+                flat = array("H", layer)
+            # Short layers are padded with empty tiles, long ones cut off
+            if len(flat) < cells:
+                flat.extend([0] * (cells - len(flat)))
+            del flat[cells:]
+            if sys.byteorder != "little":
+                flat.byteswap()
+            flat.tofile(f)
+
+        for rect in collision_rects:
+            f.write(RECT.pack(*rect))
+
+        f.write(objects_data)
+
+def read_binary_map(path, use_numpy=None):
+    """
+    Open a binary map
+
+    Args:
+        path: .tmap file path
+        use_numpy: Memory-map the layers as NumPy arrays (defaults to
+            whether NumPy is installed)
+
+    Returns:
+        BinaryMap
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a binary map")
+        (magic, version, tile_size, width, height, layer_count,
+         flags, rect_count, objects_size) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary map")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary map version {version} in {path}")
+
+        layer_bytes = width * height * 2
+        rects_offset = HEADER.size + layer_count * layer_bytes
+
+        if use_numpy:
+            # Copy-on-write, so set_tile() can edit a layer without touching the file
+            layers = [
+                np.memmap(path, dtype="<u2", mode="c", offset=HEADER.size + index * layer_bytes,
+                          shape=(height, width))
+                for index in range(layer_count)
+            ] if width and height else [[] for _ in range(layer_count)]
+        else:
+            layers = []
+            for _ in range(layer_count):
+                rows = []
+                for _ in range(height):
+                    row = array("H")
+                    row.fromfile(f, width)
+                    if sys.byteorder != "little":
+                        row.byteswap()
+                    rows.append(row)
+                layers.append(rows)
+
+        f.seek(rects_offset)
+        rect_data = f.read(rect_count * RECT.size)
+        collision_rects = [pygame.Rect(rect) for rect in RECT.iter_unpack(rect_data)]
+        objects = json.loads(f.read(objects_size).decode("utf-8")) if objects_size else []
+
+    return BinaryMap(tile_size, width, height, layers, collision_rects, objects, bool(flags & FLAG_MERGED))
+
+def convert_json_map(json_path, output_path, tile_size=32, tileset_path=None, merge=True):
+    """
+    Convert a Tiled-style JSON map to the binary format
+
+    Collision rects are computed the same way TileMap does: from the first
+    layer, counting tiles whose tileset type is "solid" (every non-empty
+    tile when no tileset is given).
+
+    Args:
+        json_path: Input JSON map
+        output_path: Output .tmap path
+        tile_size: Tile width and height in pixels
+        tileset_path: Tileset path without extension, as for TileMap.load_tileset
+        merge: Merge adjacent solid tiles into larger rects
+
+    Returns:
+        BinaryMap with the converted contents
+    """
+    from graphics.tilemap import merge_tile_positions
+
+    with open(json_path, "r") as f:
+        map_data = json.load(f)
+
+    width = map_data["width"]
+    height = map_data["height"]
+    layers = []
+    objects = []
+    for layer_data in map_data["layers"]:
+        if layer_data["type"] == "tilelayer":
+            layers.append(layer_data["data"])
+        elif layer_data["type"] == "objectgroup":
+            objects.extend(layer_data["objects"])
+
+    solid_ids = None
+    if tileset_path:
+        with open(tileset_path + ".json", "r") as f:
+            tileset_data = json.load(f)
+        solid_ids = {int(tile_id) for tile_id, info in tileset_data["tiles"].items()
+                     if info.get("type", "solid") == "solid"}
+
+    solid_positions = []
+    if layers:
+        data = layers[0]
+        for index in range(min(len(data), width * height)):
+            tile_id = data[index]
+            if tile_id > 0 and (solid_ids is None or tile_id in solid_ids):
+                solid_positions.append(((index % width) * tile_size, (index // width) * tile_size))
+
+    if merge:
+        collision_rects = merge_tile_positions(solid_positions, tile_size)
+    else:
+        collision_rects = [pygame.Rect(x, y, tile_size, tile_size) for x, y in solid_positions]
+
+    write_binary_map(output_path, tile_size, width, height, layers, collision_rects, objects, merge)
+    return BinaryMap(tile_size, width, height, layers, collision_rects, objects, merge)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a JSON tile map to the binary .tmap format")
+    parser.add_argument("input", help="Tiled-style JSON map")
+    parser.add_argument("output", help="Output .tmap file")
+    parser.add_argument("--tile-size", type=int, default=32, help="Tile size in pixels")
+    parser.add_argument("--tileset", help="Tileset path without extension, to find solid tiles")
+    parser.add_argument("--no-merge", action="store_true", help="Keep one collision rect per tile")
+    args = parser.parse_args(argv)
+
+    result = convert_json_map(args.input, args.output, args.tile_size, args.tileset, not args.no_merge)
+    print(f"Wrote {args.output}: {result.width}x{result.height} tiles, {len(result.layers)} layers, "
+          f"{len(result.collision_rects)} collision rects, {len(result.objects)} objects")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import pygame
+from graphics.text_cache import text_cache
 
 class Minimap:
     """Minimap system for displaying player position and explored areas"""
@@ -140,8 +141,7 @@ class Minimap:
         expanded.fill((0, 0, 0, 200))  # Darker background for expanded view
         
         # Draw title
-        font = pygame.font.Font(None, 24)
-        title = font.render("Map", True, (255, 255, 255))
+        title = text_cache.render("Map", 24, (255, 255, 255))
         expanded.blit(title, (10, 10))
         
         # Draw room labels and more detailed connections
@@ -189,7 +189,7 @@ class Minimap:
                     
                     # Draw room name for explored rooms
                     if self.is_expanded:
-                        label = font.render(f"Room {room_id}", True, (255, 255, 255))
+                        label = text_cache.render(f"Room {room_id}", 24, (255, 255, 255))
                         expanded.blit(label, (rect.x, rect.y - 15))
                 else:
                     # Unexplored but visible rooms
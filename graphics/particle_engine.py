@@ -0,0 +1,349 @@
+"""
+Vectorized particle backend that stores particles as NumPy arrays
+"""
+import numpy as np
+import pygame
+from graphics.particle_sprites import particle_sprite_cache
+
+# Per-particle behaviours beyond basic motion
+BEHAVIOR_NONE = 0
+BEHAVIOR_FIRE = 1  # Darkens as it burns out
+BEHAVIOR_WATER = 2  # Bounces on the ground
+
+BEHAVIOR_CODES = {
+    None: BEHAVIOR_NONE,
+    "fire": BEHAVIOR_FIRE,
+    "water": BEHAVIOR_WATER,
+}
+
+# Spawn parameters for each particle type. Ranges match the ParticleEffect
+# subclasses in graphics.particles: ints are inclusive (random.randint),
+# floats are uniform (random.uniform).
+PARTICLE_SPECS = {
+    "generic": {
+        "color": ((255, 255), (255, 255), (255, 255)),
+        "size": (5, 5),
+        "lifetime": (30, 30),
+        "velocity_x": (-2.0, 2.0),
+        "velocity_y": (-2.0, 2.0),
+        "gravity": 0.1,
+    },
+    "blood": {
+        "color": ((255, 255), (0, 0), (0, 0)),
+        "size": (2, 5),
+        "lifetime": (20, 40),
+        "velocity_x": (-2.0, 2.0),
+        "velocity_y": (-2.0, 2.0),
+        "gravity": 0.1,
+    },
+    "spark": {
+        "color": ((255, 255), (255, 255), (0, 0)),
+        "size": (1, 3),
+        "lifetime": (10, 20),
+        "velocity_x": (-3.0, 3.0),
+        "velocity_y": (-3.0, 3.0),
+        "gravity": 0.05,
+    },
+    "dust": {
+        "color": ((150, 150), (150, 150), (150, 150)),
+        "size": (2, 4),
+        "lifetime": (30, 50),
+        "velocity_x": (-1.0, 1.0),
+        "velocity_y": (-0.5, 0.0),
+        "gravity": 0.03,
+    },
+    "fire": {
+        "color": ((255, 255), (100, 200), (0, 0)),
+        "size": (3, 8),
+        "lifetime": (20, 40),
+        "velocity_x": (-0.5, 0.5),
+        "velocity_y": (-1.5, -0.5),
+        "gravity": -0.01,
+        "behavior": "fire",
+    },
+    "water": {
+        "color": ((0, 0), (100, 200), (150, 255)),
+        "size": (2, 5),
+        "lifetime": (30, 60),
+        "velocity_x": (-1.0, 1.0),
+        "velocity_y": (-0.5, 2.0),
+        "gravity": 0.15,
+        "behavior": "water",
+        "bounce_factor": 0.6,
+    },
+}
+
+# Array fields and their dtypes; colour has three channels
+FIELDS = {
+    "x": np.float32,
+    "y": np.float32,
+    "velocity_x": np.float32,
+    "velocity_y": np.float32,
+    "gravity": np.float32,
+    "lifetime": np.float32,
+    "current_lifetime": np.float32,
+    "initial_size": np.float32,
+    "size": np.float32,
+    "color": np.float32,
+    "fade": np.bool_,
+    "behavior": np.int8,
+    "bounce_factor": np.float32,
+    "ground_y": np.float32,
+}
+
+class ParticleEngine:
+    """
+    Structure-of-arrays particle store
+
+    Every particle attribute lives in its own NumPy array and the live
+    particles are packed into the first `count` slots. Updating and
+    expiring particles are whole-array operations; dead particles are
+    removed by moving live particles from the tail into the holes.
+    """
+    def __init__(self, capacity=1024, rng=None, default_ground_y=500, sprite_cache=None):
+        """
+        Initialize the particle engine
+
+        Args:
+            capacity: Number of particles to allocate room for up front
+            rng: numpy.random.Generator used for spawning (for seeding)
+            default_ground_y: Ground level for bouncing particles
+            sprite_cache: ParticleSpriteCache to draw with (defaults to the shared one)
+        """
+        self.sprite_cache = sprite_cache if sprite_cache is not None else particle_sprite_cache
+        self.capacity = 0
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.default_ground_y = default_ground_y
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        """Grow every array to a new capacity, keeping live particles"""
+        for name, dtype in FIELDS.items():
+            shape = (capacity, 3) if name == "color" else (capacity,)
+            array = np.zeros(shape, dtype=dtype)
+            if self.count:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def _reserve(self, extra):
+        """Make room for extra particles and return the slice they go into"""
+        needed = self.count + extra
+        if needed > self.capacity:
+            self._allocate(max(needed, self.capacity * 2))
+        start = self.count
+        self.count = needed
+        return slice(start, needed)
+
+    def spawn(self, particle_type, x, y, count=1, spread=0.0, color=None, ground_y=None):
+        """
+        Spawn a batch of particles of one type
+
+        Args:
+            particle_type: Key in PARTICLE_SPECS (blood, spark, dust, fire, water, generic)
+            x, y: Spawn position
+            count: Number of particles to spawn
+            spread: Random position offset range in pixels
+            color: Optional RGB colour overriding the type's colour
+            ground_y: Ground level for bouncing particles
+
+        Returns:
+            Number of particles spawned
+        """
+        spec = PARTICLE_SPECS.get(particle_type)
+        if spec is None or count <= 0:
+            return 0
+
+        rng = self.rng
+        s = self._reserve(count)
+
+        if spread:
+            self.x[s] = x + rng.uniform(-spread, spread, count)
+            self.y[s] = y + rng.uniform(-spread, spread, count)
+        else:
+            self.x[s] = x
+            self.y[s] = y
+
+        self.velocity_x[s] = rng.uniform(*spec["velocity_x"], count)
+        self.velocity_y[s] = rng.uniform(*spec["velocity_y"], count)
+        self.gravity[s] = spec["gravity"]
+
+        lifetime = rng.integers(spec["lifetime"][0], spec["lifetime"][1] + 1, count)
+        self.lifetime[s] = lifetime
+        self.current_lifetime[s] = lifetime
+
+        size = rng.integers(spec["size"][0], spec["size"][1] + 1, count)
+        self.initial_size[s] = size
+        self.size[s] = size
+
+        if color is not None:
+            self.color[s] = color[:3]
+        else:
+            for channel, (low, high) in enumerate(spec["color"]):
+                self.color[s, channel] = rng.integers(low, high + 1, count)
+
+        self.fade[s] = True
+        self.behavior[s] = BEHAVIOR_CODES[spec.get("behavior")]
+        self.bounce_factor[s] = spec.get("bounce_factor", 0.0)
+        self.ground_y[s] = self.default_ground_y if ground_y is None else ground_y
+        return count
+
+    def add_effects(self, effects):
+        """
+        Copy ParticleEffect objects into the arrays
+
+        This lets the object-based create_* helpers feed the engine.
+        """
+        count = len(effects)
+        if not count:
+            return
+        s = self._reserve(count)
+        start = s.start
+
+        for i, effect in enumerate(effects, start):
+            self.x[i] = effect.x
+            self.y[i] = effect.y
+            self.velocity_x[i] = effect.velocity_x
+            self.velocity_y[i] = effect.velocity_y
+            self.gravity[i] = effect.gravity
+            self.lifetime[i] = effect.lifetime
+            self.current_lifetime[i] = effect.current_lifetime
+            self.initial_size[i] = effect.initial_size
+            self.size[i] = effect.size
+            self.color[i] = effect.color[:3]
+            self.fade[i] = effect.fade
+            self.behavior[i] = BEHAVIOR_CODES.get(getattr(effect, "behavior", None), BEHAVIOR_NONE)
+            self.bounce_factor[i] = getattr(effect, "bounce_factor", 0.0)
+            self.ground_y[i] = getattr(effect, "ground_y", self.default_ground_y)
+
+    def update(self):
+        """Advance every particle by one tick and drop expired ones"""
+        n = self.count
+        if not n:
+            return
+
+        x = self.x[:n]
+        y = self.y[:n]
+        velocity_x = self.velocity_x[:n]
+        velocity_y = self.velocity_y[:n]
+        lifetime = self.lifetime[:n]
+        current_lifetime = self.current_lifetime[:n]
+        behavior = self.behavior[:n]
+
+        # Motion
+        x += velocity_x
+        y += velocity_y
+        velocity_y += self.gravity[:n]
+
+        # Shrink over time
+        np.multiply(self.initial_size[:n], current_lifetime / lifetime, out=self.size[:n])
+        np.maximum(self.size[:n], 0, out=self.size[:n])
+
+        current_lifetime -= 1
+
+        # Fire darkens during the second half of its life
+        half_life = lifetime / 2
+        burning = (behavior == BEHAVIOR_FIRE) & (current_lifetime < half_life)
+        if burning.any():
+            ratio = np.maximum(current_lifetime[burning] / half_life[burning], 0)
+            color = self.color[:n]
+            color[burning, 0] = np.floor(255 * ratio)
+            color[burning, 1] = np.floor(color[burning, 1] * ratio)
+            color[burning, 2] = 0
+
+        # Water bounces on the ground
+        landed = (behavior == BEHAVIOR_WATER) & (y > self.ground_y[:n])
+        if landed.any():
+            y[landed] = self.ground_y[:n][landed]
+            fall_speed = velocity_y[landed]
+            bouncing = np.abs(fall_speed) > 0.5
+            velocity_y[landed] = np.where(bouncing, -fall_speed * self.bounce_factor[:n][landed], 0)
+            velocity_x[landed] = np.where(bouncing, velocity_x[landed], velocity_x[landed] * 0.9)
+
+        self._compact(current_lifetime > 0)
+
+    def _compact(self, alive):
+        """Remove dead particles by moving live ones from the tail into the holes"""
+        n = self.count
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+
+        # Dead slots inside the kept region, and live particles beyond it
+        holes = np.flatnonzero(~alive[:alive_count])
+        movers = np.flatnonzero(alive[alive_count:]) + alive_count
+
+        if len(holes):
+            for name in FIELDS:
+                array = getattr(self, name)
+                array[holes] = array[movers]
+
+        self.count = alive_count
+
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+
+    def visible(self, camera_offset, view_width, view_height):
+        """
+        Get screen positions and render data for particles inside the view
+
+        Returns:
+            Tuple of (screen_x, screen_y, size, color, alpha) arrays
+        """
+        n = self.count
+        size = self.size[:n]
+        screen_x = self.x[:n] - camera_offset[0]
+        screen_y = self.y[:n] - camera_offset[1]
+
+        alpha = np.where(self.fade[:n], 255 * self.current_lifetime[:n] / self.lifetime[:n], 255)
+        shown = ((alpha >= 1) & (size > 0) &
+                 (screen_x + size >= 0) & (screen_x - size < view_width) &
+                 (screen_y + size >= 0) & (screen_y - size < view_height))
+
+        return (screen_x[shown].astype(np.int32), screen_y[shown].astype(np.int32),
+                size[shown], self.color[:n][shown].astype(np.int32), alpha[shown].astype(np.int32))
+
+    def render(self, screen, camera_offset):
+        """
+        Render all on-screen particles in a single blits call
+
+        Returns:
+            Number of particles drawn
+        """
+        if not self.count:
+            return 0
+
+        screen_x, screen_y, size, color, alpha = self.visible(
+            camera_offset, screen.get_width(), screen.get_height())
+        if not len(screen_x):
+            return 0
+
+        # Quantize the same way ParticleSpriteCache does
+        cache = self.sprite_cache
+        radius = np.clip((size + 0.5).astype(np.int32), 1, 4095)
+        alpha_bucket = (np.clip(alpha, 0, 255) * (cache.alpha_levels - 1) / 255 + 0.5).astype(np.int32)
+        step = cache.color_step
+        color = np.minimum(color // step * step, 255)
+
+        shown = alpha_bucket > 0
+        if not shown.all():
+            screen_x, screen_y = screen_x[shown], screen_y[shown]
+            radius, alpha_bucket, color = radius[shown], alpha_bucket[shown], color[shown]
+
+        # Pack each sprite key into one integer to look up every distinct sprite once
+        codes = ((((color[:, 0].astype(np.int64) << 8 | color[:, 1]) << 8 | color[:, 2]) << 12 | radius) << 8
+                 | alpha_bucket)
+        _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        sprites = [
+            cache.get((int(color[i, 0]), int(color[i, 1]), int(color[i, 2])), int(radius[i]), int(alpha_bucket[i]))
+            for i in first.tolist()
+        ]
+
+        positions = zip((screen_x - radius).tolist(), (screen_y - radius).tolist())
+        screen.blits(list(zip([sprites[i] for i in inverse.ravel().tolist()], positions)), doreturn=False)
+        return len(screen_x)
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,108 @@
+"""
+Cache of pre-rendered particle sprites
+"""
+from collections import OrderedDict
+import pygame
+
+class ParticleSpriteCache:
+    """
+    Pre-renders particle circles and reuses them across frames
+
+    Sprites are keyed by (colour, radius, alpha bucket). Radius, alpha and
+    colour are quantized so that fading and colour-shifting particles
+    (fire, water) keep hitting the same few sprites instead of needing a
+    new surface every frame. The least recently used sprites are evicted
+    once the cache is full.
+    """
+    def __init__(self, max_sprites=8192, alpha_levels=16, color_step=16, soft=False):
+        """
+        Initialize the sprite cache
+
+        Args:
+            max_sprites: Number of sprites kept before evicting
+            alpha_levels: Number of distinct alpha values
+            color_step: Colour channels are rounded to multiples of this
+            soft: Fade sprite edges out radially instead of hard circles
+        """
+        self.max_sprites = max_sprites
+        self.alpha_levels = alpha_levels
+        self.color_step = color_step
+        self.soft = soft
+        self.sprites = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def quantize_alpha(self, alpha):
+        """Get the alpha bucket for an alpha value (0 means invisible)"""
+        levels = self.alpha_levels - 1
+        return int(max(0, min(255, alpha)) * levels / 255 + 0.5)
+
+    def quantize_radius(self, size):
+        """Get the sprite radius for a particle size"""
+        return max(1, int(size + 0.5))
+
+    def quantize_color(self, color):
+        """Round a colour to the cache's colour step"""
+        step = self.color_step
+        return tuple(min(255, int(channel) // step * step) for channel in color[:3])
+
+    def get(self, color, radius, alpha_bucket):
+        """
+        Get the sprite for already-quantized values
+
+        Args:
+            color: RGB tuple
+            radius: Circle radius in pixels
+            alpha_bucket: Value from quantize_alpha()
+        """
+        key = (color, radius, alpha_bucket)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self._render_sprite(color, radius, alpha_bucket)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def get_sprite(self, color, size, alpha):
+        """Get the sprite for a particle with a raw colour, size and alpha"""
+        return self.get(self.quantize_color(color), self.quantize_radius(size), self.quantize_alpha(alpha))
+
+    def _render_sprite(self, color, radius, alpha_bucket):
+        """Draw a new particle sprite"""
+        alpha = int(alpha_bucket * 255 / (self.alpha_levels - 1))
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+
+        if self.soft:
+            # Concentric circles fading from the centre outwards
+            for ring in range(radius, 0, -1):
+                ring_alpha = int(alpha * (1 - (ring - 1) / radius))
+                pygame.draw.circle(sprite, (*color, ring_alpha), (radius, radius), ring)
+        else:
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+
+        return sprite
+
+    def clear(self):
+        """Remove all cached sprites"""
+        self.sprites.clear()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "sprites": len(self.sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# Cache shared by all particle renderers
+particle_sprite_cache = ParticleSpriteCache()
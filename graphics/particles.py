@@ -1,8 +1,18 @@
 import pygame
 import random
 import math
+from graphics.particle_sprites import particle_sprite_cache
+
+# Use the vectorized NumPy backend when it is available
+try:
+    from graphics.particle_engine import ParticleEngine
+    using_numpy = True
+except ImportError:
+    using_numpy = False
 
 class ParticleEffect:
+    behavior = None  # Special behaviour understood by ParticleEngine
+    
     def __init__(self, x, y, color, size=5, lifetime=30):
         self.x = x
         self.y = y
@@ -28,24 +38,43 @@ class ParticleEffect:
         # Reduce lifetime
         self.current_lifetime -= 1
     
-    def render(self, screen, camera_offset):
-        # Apply camera offset
-        x = int(self.x - camera_offset[0])
-        y = int(self.y - camera_offset[1])
+    def get_blit(self, camera_offset, view_size=None):
+        """
+        Get the (sprite, position) pair for drawing this particle
+        
+        Args:
+            camera_offset: Camera position
+            view_size: Optional (width, height) of the view; particles
+                outside it are culled
         
+        Returns:
+            Tuple for Surface.blits, or None if the particle is invisible
+        """
         # Calculate alpha based on remaining lifetime
         alpha = int(255 * (self.current_lifetime / self.lifetime)) if self.fade else 255
+        if alpha <= 0 or self.size <= 0:
+            return None
         
-        # Draw the particle
-        if alpha > 0 and self.size > 0:
-            particle_surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(
-                particle_surf, 
-                (*self.color, alpha),
-                (self.size, self.size), 
-                self.size
-            )
-            screen.blit(particle_surf, (x - self.size, y - self.size))
+        cache = particle_sprite_cache
+        alpha_bucket = cache.quantize_alpha(alpha)
+        if alpha_bucket <= 0:
+            return None
+        
+        radius = cache.quantize_radius(self.size)
+        sprite = cache.get(cache.quantize_color(self.color), radius, alpha_bucket)
+        
+        # Apply camera offset
+        x = int(self.x - camera_offset[0])
+        y = int(self.y - camera_offset[1])
+        if view_size is not None and (x + radius < 0 or x - radius >= view_size[0] or
+                                      y + radius < 0 or y - radius >= view_size[1]):
+            return None
+        return sprite, (x - radius, y - radius)
+    
+    def render(self, screen, camera_offset):
+        blit = self.get_blit(camera_offset, screen.get_size())
+        if blit:
+            screen.blit(*blit)
     
     def is_expired(self):
         return self.current_lifetime <= 0
@@ -70,6 +99,8 @@ class DustEffect(ParticleEffect):
 
 class FireEffect(ParticleEffect):
     """Fire particle with upward movement and color transition"""
+    behavior = "fire"
+    
     def __init__(self, x, y):
         size = random.randint(3, 8)
         lifetime = random.randint(20, 40)
@@ -93,6 +124,8 @@ class FireEffect(ParticleEffect):
 
 class WaterEffect(ParticleEffect):
     """Water droplet with physics"""
+    behavior = "water"
+    
     def __init__(self, x, y):
         size = random.randint(2, 5)
         lifetime = random.randint(30, 60)
@@ -118,18 +151,60 @@ class WaterEffect(ParticleEffect):
                 self.velocity_y = 0
                 self.velocity_x *= 0.9  # Friction when sliding on ground
 
+# Particle classes for each emitter type
+PARTICLE_TYPES = {
+    "blood": BloodEffect,
+    "spark": SparkEffect,
+    "dust": DustEffect,
+    "fire": FireEffect,
+    "water": WaterEffect,
+}
+
 class ParticleSystem:
     """A system to manage multiple particle effects"""
-    def __init__(self):
-        self.particles = []
+    def __init__(self, use_engine=None):
+        """
+        Initialize the particle system
+        
+        Args:
+            use_engine: Store particles in a NumPy ParticleEngine
+                (defaults to True when NumPy is installed)
+        """
+        if use_engine is None:
+            use_engine = using_numpy
+        self.engine = ParticleEngine() if use_engine else None
+        self.particles = []  # Particle objects when the engine isn't used
         self.emitters = []
 
     def add_particles(self, particles):
         """Add particles to the system"""
-        if isinstance(particles, list):
-            self.particles.extend(particles)
+        if not isinstance(particles, list):
+            particles = [particles]
+        
+        if self.engine is not None:
+            self.engine.add_effects(particles)
         else:
-            self.particles.append(particles)
+            self.particles.extend(particles)
+
+    def emit(self, particle_type, x, y, count=1, spread=0.0):
+        """
+        Spawn particles of a type directly, without creating particle objects
+        
+        Args:
+            particle_type: blood, spark, dust, fire or water
+            x, y: Spawn position
+            count: Number of particles
+            spread: Random position offset range in pixels
+        """
+        if self.engine is not None:
+            self.engine.spawn(particle_type, x, y, count, spread)
+        elif particle_type in PARTICLE_TYPES:
+            effect_class = PARTICLE_TYPES[particle_type]
+            for _ in range(count):
+                self.particles.append(effect_class(
+                    x + random.uniform(-spread, spread),
+                    y + random.uniform(-spread, spread)
+                ))
 
     def add_emitter(self, emitter):
         """Add an emitter to the system"""
@@ -138,24 +213,45 @@ class ParticleSystem:
     def update(self):
         """Update all particles and emitters"""
         # Update existing particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.is_expired():
-                self.particles.remove(particle)
+        if self.engine is not None:
+            self.engine.update()
+        else:
+            for particle in self.particles:
+                particle.update()
+            self.particles = [particle for particle in self.particles if not particle.is_expired()]
         
         # Update emitters and generate new particles
-        for emitter in self.emitters[:]:
-            new_particles = emitter.update()
-            if new_particles:
-                self.add_particles(new_particles)
-            
-            if emitter.is_expired():
-                self.emitters.remove(emitter)
+        for emitter in self.emitters:
+            if self.engine is not None:
+                emitter.emit_into(self.engine)
+            else:
+                new_particles = emitter.update()
+                if new_particles:
+                    self.add_particles(new_particles)
+        
+        self.emitters = [emitter for emitter in self.emitters if not emitter.is_expired()]
 
     def render(self, screen, camera_offset):
-        """Render all particles"""
-        for particle in self.particles:
-            particle.render(screen, camera_offset)
+        """
+        Render all on-screen particles
+        
+        Returns:
+            Number of particles drawn
+        """
+        if self.engine is not None:
+            return self.engine.render(screen, camera_offset)
+        
+        view_size = screen.get_size()
+        blit_list = [particle.get_blit(camera_offset, view_size) for particle in self.particles]
+        blit_list = [blit for blit in blit_list if blit]
+        screen.blits(blit_list, doreturn=False)
+        return len(blit_list)
+
+    def get_particle_count(self):
+        """Get the number of live particles"""
+        if self.engine is not None:
+            return len(self.engine)
+        return len(self.particles)
 
 class ParticleEmitter:
     """Continuously generates particles based on parameters"""
@@ -169,35 +265,38 @@ class ParticleEmitter:
         self.timer = 0
         self.particle_count = 0
     
-    def update(self):
-        """Update emitter and generate particles if needed"""
+    def _advance(self):
+        """Advance the emitter by one tick and get how many particles are due"""
         if self.duration is not None:
             self.duration -= 1
         
         self.timer += self.rate
+        count = int(self.timer)
+        self.timer -= count
+        self.particle_count += count
+        return count
+    
+    def update(self):
+        """Update emitter and generate particles if needed"""
         new_particles = []
+        effect_class = PARTICLE_TYPES.get(self.particle_type)
         
-        while self.timer >= 1:
+        for _ in range(self._advance()):
             # Create new particle with variation in position
             var_x = self.x + random.uniform(-self.variation, self.variation) * 10
             var_y = self.y + random.uniform(-self.variation, self.variation) * 10
             
-            if self.particle_type == "blood":
-                new_particles.append(BloodEffect(var_x, var_y))
-            elif self.particle_type == "spark":
-                new_particles.append(SparkEffect(var_x, var_y))
-            elif self.particle_type == "dust":
-                new_particles.append(DustEffect(var_x, var_y))
-            elif self.particle_type == "fire":
-                new_particles.append(FireEffect(var_x, var_y))
-            elif self.particle_type == "water":
-                new_particles.append(WaterEffect(var_x, var_y))
-            
-            self.timer -= 1
-            self.particle_count += 1
+            if effect_class:
+                new_particles.append(effect_class(var_x, var_y))
         
         return new_particles
     
+    def emit_into(self, engine):
+        """Update emitter and spawn its particles straight into a ParticleEngine"""
+        count = self._advance()
+        if count:
+            engine.spawn(self.particle_type, self.x, self.y, count, self.variation * 10)
+    
     def is_expired(self):
         """Check if the emitter has reached its duration"""
         return self.duration is not None and self.duration <= 0
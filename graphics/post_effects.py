@@ -0,0 +1,199 @@
+"""
+Full-screen post effects applied in place on a surface's pixels
+
+Effects modify the surface they are given instead of returning a new one.
+They run in the compiled shaders extension (shaders.c, built with
+`python setup.py build_ext --inplace`) on 32-bit surfaces, and otherwise
+through NumPy views of the pixels from pygame.surfarray. Both produce the
+same pixels. The NumPy views of single color channels only exist for 24
+and 32-bit surfaces, so on 8 and 16-bit surfaces only screen_shake and
+wave apply. Effects that can't run do nothing and return False.
+"""
+import math
+
+import pygame
+
+# The compiled extension is optional
+try:
+    import shaders as _shaders
+except ImportError:
+    _shaders = None
+
+# The fallback works on NumPy views of the pixels
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+using_c_extension = _shaders is not None
+
+# Bit depths pygame.surfarray has per-channel views for
+CHANNEL_VIEW_DEPTHS = (24, 32)
+
+_vignette_masks = {}  # (width, height, strength, radius) -> per-pixel factor out of 256
+
+def _use_extension(surface):
+    """Whether the compiled extension can handle a surface"""
+    return _shaders is not None and surface.get_bitsize() == 32
+
+def _has_channel_views(surface):
+    """Whether NumPy can view a surface's color channels separately"""
+    return np is not None and surface.get_bitsize() in CHANNEL_VIEW_DEPTHS
+
+def _single(value):
+    """Round a parameter to single precision, as the extension receives it"""
+    return float(np.float32(value))
+
+def screen_shake(surface, amplitude, frame):
+    """
+    Shake the surface contents by an offset that changes every frame
+
+    The exposed edges are cleared to black.
+
+    Args:
+        surface: Surface to modify, usually the finished frame
+        amplitude: Largest offset in pixels
+        frame: Frame number driving the shake
+    """
+    if _use_extension(surface):
+        _shaders.screen_shake(surface, int(amplitude), int(frame))
+        return True
+
+    offset_x = int(math.sin(frame * 0.5) * int(amplitude))
+    offset_y = int(math.cos(frame * 0.7) * int(amplitude))
+    width, height = surface.get_size()
+    surface.scroll(offset_x, offset_y)
+    black = (0, 0, 0)
+    if offset_x > 0:
+        surface.fill(black, (0, 0, offset_x, height))
+    elif offset_x < 0:
+        surface.fill(black, (width + offset_x, 0, -offset_x, height))
+    if offset_y > 0:
+        surface.fill(black, (0, 0, width, offset_y))
+    elif offset_y < 0:
+        surface.fill(black, (0, height + offset_y, width, -offset_y))
+    return True
+
+def wave(surface, time, amplitude=4.0, frequency=0.05):
+    """
+    Shift every row sideways along a sine wave (heat haze, underwater)
+
+    Args:
+        surface: Surface to modify
+        time: Phase of the wave; advance it every frame to animate
+        amplitude: Largest row offset in pixels
+        frequency: Phase change per row
+    """
+    if _use_extension(surface):
+        _shaders.wave_effect(surface, time, amplitude, frequency)
+        return True
+    if np is None:
+        return False
+
+    width, height = surface.get_size()
+    if not width:
+        return True
+    rows = np.arange(height)
+    offsets = (np.sin(_single(time) + rows * _single(frequency)) * _single(amplitude)).astype(np.int64)
+    columns = np.clip(np.arange(width)[:, None] - offsets[None, :], 0, width - 1)
+    # 24-bit pixels have no whole-pixel view, so their channels move together
+    if surface.get_bitsize() == 24:
+        pixels = pygame.surfarray.pixels3d(surface)
+    else:
+        pixels = pygame.surfarray.pixels2d(surface)
+    pixels[...] = pixels[columns, rows[None, :]]
+    del pixels
+    return True
+
+def chromatic_offset(surface, offset=2):
+    """
+    Split the color channels apart: red moves left and blue right
+
+    Args:
+        surface: Surface to modify
+        offset: Distance in pixels each channel moves
+    """
+    offset = int(offset)
+    if _use_extension(surface):
+        _shaders.chromatic_offset(surface, offset)
+        return True
+    if not _has_channel_views(surface):
+        return False
+
+    width = surface.get_width()
+    if not offset or not width:
+        return True
+    columns = np.arange(width)
+    red = pygame.surfarray.pixels_red(surface)
+    red[...] = red[np.clip(columns + offset, 0, width - 1)]
+    del red
+    blue = pygame.surfarray.pixels_blue(surface)
+    blue[...] = blue[np.clip(columns - offset, 0, width - 1)]
+    del blue
+    return True
+
+def palette_flash(surface, color=(255, 255, 255), strength=0.5):
+    """
+    Blend every pixel towards a color, e.g. a lightning flash or damage tint
+
+    Args:
+        surface: Surface to modify
+        color: Flash color
+        strength: 0 leaves the surface unchanged, 1 fills it with the color
+    """
+    color = tuple(pygame.Color(color))[:3]
+    if _use_extension(surface):
+        _shaders.palette_flash(surface, color, strength)
+        return True
+    if not _has_channel_views(surface):
+        return False
+
+    weight = min(256, max(0, int(_single(strength) * 256)))
+    if not weight:
+        return True
+    rgb = pygame.surfarray.pixels3d(surface)
+    blended = rgb.astype(np.uint32) * (256 - weight)
+    blended += np.array(color, dtype=np.uint32) * weight
+    rgb[...] = blended >> 8
+    del rgb
+    return True
+
+def vignette(surface, strength=0.5, radius=0.6):
+    """
+    Darken the surface towards its corners
+
+    Args:
+        surface: Surface to modify
+        strength: How dark the corners get (0-1)
+        radius: Size of the untouched center, as a fraction of the distance
+            to the corners
+    """
+    if _use_extension(surface):
+        _shaders.vignette(surface, strength, radius)
+        return True
+    if not _has_channel_views(surface):
+        return False
+
+    width, height = surface.get_size()
+    if not width or not height:
+        return True
+    key = (width, height, strength, radius)
+    factor = _vignette_masks.get(key)
+    if factor is None:
+        strength = _single(strength)
+        inner = _single(radius) * _single(radius)
+        falloff = 1.0 - inner if inner < 1.0 else 1.0
+        center_x, center_y = width / 2.0, height / 2.0
+        dx = np.arange(width)[:, None] + 0.5 - center_x
+        dy = np.arange(height)[None, :] + 0.5 - center_y
+        distance = (dx * dx + dy * dy) / (center_x * center_x + center_y * center_y)
+        amount = np.minimum(np.maximum((distance - inner) / falloff, 0.0), 1.0)
+        factor = np.maximum(((1.0 - strength * amount) * 256).astype(np.int64), 0).astype(np.uint32)
+        factor = factor[:, :, None]
+        _vignette_masks.clear()  # Only the current screen size is worth keeping
+        _vignette_masks[key] = factor
+
+    rgb = pygame.surfarray.pixels3d(surface)
+    rgb[...] = (rgb * factor) >> 8
+    del rgb
+    return True
@@ -0,0 +1,112 @@
+"""
+Shared fonts and a cache of rendered text surfaces
+"""
+import os
+from collections import OrderedDict
+import pygame
+
+class FontRegistry:
+    """
+    Creates each font once and hands out the same Font object afterwards
+
+    Fonts are keyed by (name, size). A name of None is pygame's default
+    font, a path to a .ttf/.otf file is loaded from disk and anything else
+    is looked up as a system font.
+    """
+    def __init__(self):
+        self.fonts = {}  # (name, size) -> pygame.font.Font
+
+    def get(self, size=24, name=None):
+        """
+        Get a font, creating it on first use
+
+        Args:
+            size: Font size in points
+            name: None for the default font, a font file path or a system font name
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if name is None or os.path.isfile(name):
+                font = pygame.font.Font(name, size)
+            else:
+                font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def clear(self):
+        """Forget all fonts (e.g. after pygame.font.quit())"""
+        self.fonts.clear()
+
+class TextCache:
+    """
+    Caches rendered text surfaces
+
+    Surfaces are keyed by (font, size, text, colour, antialias), so static
+    labels and values that change only occasionally (scores, combo counts,
+    NPC names) are rendered once and then reused every frame. The least
+    recently used surfaces are evicted once the cache is full.
+
+    Returned surfaces are shared between callers and must not be modified;
+    take a copy() before changing alpha or drawing onto one.
+    """
+    def __init__(self, max_entries=512, fonts=None):
+        """
+        Initialize the text cache
+
+        Args:
+            max_entries: Number of surfaces kept before evicting
+            fonts: FontRegistry to take fonts from (defaults to the shared one)
+        """
+        self.max_entries = max_entries
+        self.fonts = fonts if fonts is not None else font_registry
+        self.surfaces = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size=24, color=(255, 255, 255), font=None, antialias=True):
+        """
+        Get a rendered text surface
+
+        Args:
+            text: String to render
+            size: Font size in points
+            color: RGB text colour
+            font: Font name or file path (None for the default font)
+            antialias: Whether to antialias the text
+        """
+        key = (font, size, str(text), tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, font).render(key[2], antialias, key[3])
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Remove all cached surfaces"""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "surfaces": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# Registry and cache shared by all UI code
+font_registry = FontRegistry()
+text_cache = TextCache()
@@ -1,6 +1,47 @@
 import pygame
 import json
 import os
+from systems.spatial_hash import SpatialHash
+from graphics import map_format
+
+def merge_tile_positions(positions, tile_size):
+    """
+    Greedily merge equal-sized tiles into as few rectangles as possible
+    
+    Runs of tiles are first grown to the right, then the whole run is grown
+    downwards while every tile below it is also present.
+    
+    Args:
+        positions: Iterable of (x, y) top-left tile positions in pixels
+        tile_size: Width and height of a tile in pixels
+    
+    Returns:
+        List of pygame.Rect covering exactly the given tiles
+    """
+    remaining = set(positions)
+    merged = []
+    
+    for x, y in sorted(remaining, key=lambda pos: (pos[1], pos[0])):
+        if (x, y) not in remaining:
+            continue  # Already covered by an earlier rectangle
+        
+        # Grow horizontally
+        width = 1
+        while (x + width * tile_size, y) in remaining:
+            width += 1
+        
+        # Grow vertically while the full run below is still free
+        height = 1
+        while all((x + i * tile_size, y + height * tile_size) in remaining for i in range(width)):
+            height += 1
+        
+        for row in range(height):
+            for col in range(width):
+                remaining.discard((x + col * tile_size, y + row * tile_size))
+        
+        merged.append(pygame.Rect(x, y, width * tile_size, height * tile_size))
+    
+    return merged
 
 class Tile:
     def __init__(self, image, tile_type="solid", properties=None):
@@ -9,19 +50,26 @@ class Tile:
         self.properties = properties or {}
 
 class TileMap:
-    def __init__(self, tile_size=32):
+    def __init__(self, tile_size=32, merge_collision_rects=True):
         self.tile_size = tile_size
+        self.merge_collision_rects = merge_collision_rects  # False keeps one rect per tile for debugging
         self.tiles = {}  # Dictionary of tile types (by ID)
         self.layers = []  # List of layers, each is a 2D array of tile IDs
         self.width = 0
         self.height = 0
         self.collision_rects = []  # For collision detection
+        self.spatial_index = SpatialHash(cell_size=tile_size * 4)  # Broadphase over collision_rects
+        self.collision_chunks = None  # (chunk_x, chunk_y) -> (rects, index entry ids); None if not built per chunk
         self.spawn_points = {}  # Player and enemy spawn points
         self.transition_points = []  # Level transition points
         self.collectibles = []  # Collectible items
         
         # Parallax layers for background/foreground effects
         self.parallax_layers = []
+        
+        # Pre-rendered layer chunks, keyed by (layer_index, chunk_x, chunk_y)
+        self.chunk_size = 512  # Chunk width and height in pixels
+        self.chunks = {}
     
     def load_tileset(self, tileset_path):
         """Load tile images from a tileset image"""
@@ -47,12 +95,19 @@ class TileMap:
                 tile_type = tile_info.get("type", "solid")
                 properties = tile_info.get("properties", {})
                 self.tiles[tile_id] = Tile(tile_image, tile_type, properties)
+            
+            # Tile images changed, so any baked chunks are stale
+            self.bake_chunks()
                 
         except Exception as e:
             print(f"Error loading tileset: {e}")
     
     def load_map(self, map_path):
-        """Load a map from a JSON file (similar to Tiled format)"""
+        """Load a map from a JSON file (similar to Tiled format) or a binary .tmap file"""
+        if map_path.endswith(map_format.EXTENSION):
+            self.load_binary_map(map_path)
+            return
+        
         try:
             with open(map_path, 'r') as f:
                 map_data = json.load(f)
@@ -63,17 +118,13 @@ class TileMap:
             # Load layers
             for layer_data in map_data["layers"]:
                 if layer_data["type"] == "tilelayer":
-                    # Convert 1D array to 2D for easier access
-                    layer = []
-                    for y in range(self.height):
-                        row = []
-                        for x in range(self.width):
-                            index = y * self.width + x
-                            if index < len(layer_data["data"]):
-                                row.append(layer_data["data"][index])
-                            else:
-                                row.append(0)  # Empty tile
-                        layer.append(row)
+                    # Convert 1D array to 2D for easier access, padding short data with empty tiles
+                    data = layer_data["data"]
+                    width = self.width
+                    layer = [data[y * width:(y + 1) * width] for y in range(self.height)]
+                    for row in layer:
+                        if len(row) < width:
+                            row.extend([0] * (width - len(row)))
                     self.layers.append(layer)
                 elif layer_data["type"] == "objectgroup":
                     self.load_objects(layer_data["objects"])
@@ -81,11 +132,65 @@ class TileMap:
             # Build collision rects
             self.build_collision_rects()
             
+            # Pre-render the tile layers
+            self.bake_chunks()
+            
         except Exception as e:
             print(f"Error loading map: {e}")
             # Create a basic fallback map
             self.create_default_map()
     
+    def load_binary_map(self, map_path):
+        """
+        Load a map written by graphics.map_format
+        
+        Tile layers are memory-mapped (or read into array('H') rows without
+        NumPy) and the stored collision rects are used as-is.
+        """
+        try:
+            binary_map = map_format.read_binary_map(map_path)
+            
+            self.tile_size = binary_map.tile_size
+            self.width = binary_map.width
+            self.height = binary_map.height
+            self.layers = binary_map.layers
+            self.load_objects(binary_map.objects)
+            
+            # Collision rects were precomputed by the converter
+            self.collision_rects = binary_map.collision_rects
+            self.merge_collision_rects = binary_map.merged
+            self.spatial_index = SpatialHash(cell_size=self.tile_size * 4)
+            self.spatial_index.rebuild(self.collision_rects)
+            self.collision_chunks = None  # Merged across chunks; split on the first edit
+            
+            # Pre-render the tile layers
+            self.bake_chunks()
+            
+        except Exception as e:
+            print(f"Error loading binary map: {e}")
+            # Create a basic fallback map
+            self.create_default_map()
+    
+    def save_binary_map(self, map_path):
+        """Write the map, its collision rects and its objects to a .tmap file"""
+        objects = []
+        if "player" in self.spawn_points:
+            x, y = self.spawn_points["player"]
+            objects.append({"type": "spawn", "x": x, "y": y})
+        for x, y, enemy_type in self.spawn_points.get("enemies", []):
+            objects.append({"type": "enemy", "x": x, "y": y, "properties": {"enemy_type": enemy_type}})
+        for rect, target_level, spawn_x, spawn_y in self.transition_points:
+            objects.append({"type": "transition", "x": rect.x, "y": rect.y, "width": rect.width,
+                            "height": rect.height,
+                            "properties": {"target": target_level, "spawn_x": spawn_x, "spawn_y": spawn_y}})
+        for collectible in self.collectibles:
+            rect = collectible["rect"]
+            objects.append({"type": "collectible", "x": rect.x, "y": rect.y, "width": rect.width,
+                            "height": rect.height, "properties": {"type": collectible["type"]}})
+        
+        map_format.write_binary_map(map_path, self.tile_size, self.width, self.height, self.layers,
+                                    self.collision_rects, objects, self.merge_collision_rects)
+    
     def load_objects(self, objects):
         """Process object layers from the map"""
         for obj in objects:
@@ -112,26 +217,92 @@ class TileMap:
                 collectible_type = obj.get("properties", {}).get("type", "health")
                 self.collectibles.append({"rect": obj_rect, "type": collectible_type})
     
-    def build_collision_rects(self):
-        """Create collision rectangles from the map tiles"""
+    def build_collision_rects(self, merge=None):
+        """
+        Create collision rectangles from the map tiles
+        
+        Tiles are merged within each chunk (never across chunk edges), so
+        set_tile only has to rebuild the rects of the chunk it changes.
+        
+        Args:
+            merge: Merge adjacent solid tiles into larger rectangles
+                (defaults to self.merge_collision_rects)
+        """
+        if merge is not None:
+            self.merge_collision_rects = merge
+        
         self.collision_rects = []
+        self.collision_chunks = {}
+        self.spatial_index.clear()
         
         # Assume first layer is the main collision layer
         if not self.layers:
             return
-            
+        
+        # Scan each tile, grouped by chunk
+        by_chunk = {}
+        size = self.chunk_size
+        for x, y in self._solid_positions(0, 0, self.width, self.height):
+            by_chunk.setdefault((x // size, y // size), []).append((x, y))
+        
+        # Register the static geometry once for collision queries
+        for key, positions in by_chunk.items():
+            self._add_collision_chunk(key, positions)
+        self.collision_rects = [rect for rects, _ in self.collision_chunks.values() for rect in rects]
+    
+    def _solid_positions(self, start_x, start_y, end_x, end_y):
+        """Get the pixel positions of the solid collision-layer tiles in a range of tiles"""
         layer = self.layers[0]
+        solid_ids = [tile_id for tile_id, tile in self.tiles.items() if tile_id > 0 and tile.type == "solid"]
+        if map_format.np is not None and isinstance(layer, map_format.np.ndarray):
+            # Memory-mapped layers are scanned in one vectorized pass
+            np = map_format.np
+            ys, xs = np.nonzero(np.isin(layer[start_y:end_y, start_x:end_x], solid_ids))
+            return list(zip(((xs + start_x) * self.tile_size).tolist(), ((ys + start_y) * self.tile_size).tolist()))
         
-        # Scan each tile
-        for y, row in enumerate(layer):
-            for x, tile_id in enumerate(row):
-                if tile_id > 0 and tile_id in self.tiles and self.tiles[tile_id].type == "solid":
-                    self.collision_rects.append(pygame.Rect(
-                        x * self.tile_size,
-                        y * self.tile_size,
-                        self.tile_size,
-                        self.tile_size
-                    ))
+        solid_ids = set(solid_ids)
+        solid_positions = []
+        for y in range(start_y, min(end_y, len(layer))):
+            row = layer[y]
+            for x in range(start_x, min(end_x, len(row))):
+                if row[x] in solid_ids:
+                    solid_positions.append((x * self.tile_size, y * self.tile_size))
+        return solid_positions
+    
+    def _add_collision_chunk(self, key, positions):
+        """Build and index the collision rects of one chunk's solid tiles"""
+        if self.merge_collision_rects:
+            rects = merge_tile_positions(positions, self.tile_size)
+        else:
+            rects = [pygame.Rect(x, y, self.tile_size, self.tile_size) for x, y in positions]
+        if rects:
+            self.collision_chunks[key] = (rects, self.spatial_index.insert_many(rects))
+    
+    def _rebuild_collision_chunks(self, chunk_keys):
+        """Rebuild the collision rects of some chunks after their tiles changed"""
+        if self.collision_chunks is None:
+            # Loaded rects were merged across chunks, so split them up once
+            self.build_collision_rects()
+            return
+        
+        size = self.chunk_size
+        tile_size = self.tile_size
+        for chunk_x, chunk_y in chunk_keys:
+            _, entry_ids = self.collision_chunks.pop((chunk_x, chunk_y), ((), ()))
+            for entry_id in entry_ids:
+                self.spatial_index.remove(entry_id)
+            
+            # Tiles whose top-left corner lies in the chunk
+            start_x = -(-chunk_x * size // tile_size)
+            start_y = -(-chunk_y * size // tile_size)
+            end_x = -(-(chunk_x + 1) * size // tile_size)
+            end_y = -(-(chunk_y + 1) * size // tile_size)
+            self._add_collision_chunk((chunk_x, chunk_y), self._solid_positions(start_x, start_y, end_x, end_y))
+        self.collision_rects = [rect for rects, _ in self.collision_chunks.values() for rect in rects]
+    
+    def check_collision(self, entity_rect):
+        """Get all collision rects that an entity overlaps"""
+        return self.spatial_index.query(entity_rect)
     
     def create_default_map(self):
         """Create a simple default map if loading fails"""
@@ -162,43 +333,141 @@ class TileMap:
         # Build collision rectangles
         self.build_collision_rects()
         
+        # Pre-render the tile layers
+        self.bake_chunks()
+        
         # Add spawn point
         self.spawn_points["player"] = (100, 100)
     
-    def render(self, screen, camera_offset):
-        """Render the map with camera offset"""
-        # Calculate visible range based on camera position
+    def set_tile(self, layer_index, x, y, tile_id):
+        """
+        Change a single tile and rebuild only the chunks it covers
+        
+        A tile straddles several chunks when tile_size doesn't divide
+        chunk_size. Every chunk it overlaps is re-baked and, on the
+        collision layer, has its collision rects re-merged and re-indexed.
+        
+        Args:
+            layer_index: Index of the layer to modify
+            x, y: Tile coordinates
+            tile_id: New tile ID (0 for empty)
+        """
+        layer = self.layers[layer_index]
+        if layer[y][x] == tile_id:
+            return
+        layer[y][x] = tile_id
+        
+        # Chunks overlapped by the tile's pixel rect
+        size = self.chunk_size
+        left = x * self.tile_size
+        top = y * self.tile_size
+        chunk_keys = [(chunk_x, chunk_y)
+                      for chunk_y in range(top // size, (top + self.tile_size - 1) // size + 1)
+                      for chunk_x in range(left // size, (left + self.tile_size - 1) // size + 1)]
+        
+        # The first layer is the collision layer
+        if layer_index == 0:
+            self._rebuild_collision_chunks(chunk_keys)
+        
+        for chunk_x, chunk_y in chunk_keys:
+            self.chunks[(layer_index, chunk_x, chunk_y)] = self._bake_chunk(layer_index, chunk_x, chunk_y)
+    
+    def bake_chunks(self):
+        """Pre-render every layer into chunk surfaces"""
+        self.chunks = {}
+        chunks_x, chunks_y = self._chunk_counts()
+        
+        for layer_index in range(len(self.layers)):
+            for chunk_y in range(chunks_y):
+                for chunk_x in range(chunks_x):
+                    self.chunks[(layer_index, chunk_x, chunk_y)] = self._bake_chunk(layer_index, chunk_x, chunk_y)
+    
+    def _chunk_counts(self):
+        """Get the number of chunks needed to cover the map horizontally and vertically"""
+        chunks_x = -(-self.width * self.tile_size // self.chunk_size)
+        chunks_y = -(-self.height * self.tile_size // self.chunk_size)
+        return chunks_x, chunks_y
+    
+    def _bake_chunk(self, layer_index, chunk_x, chunk_y):
+        """
+        Render one chunk of a layer to a surface
+        
+        Returns:
+            The chunk surface, or None if the chunk contains no tiles
+        """
+        layer = self.layers[layer_index]
+        size = self.chunk_size
+        origin_x = chunk_x * size
+        origin_y = chunk_y * size
+        
+        # Tiles that overlap this chunk
+        start_x = origin_x // self.tile_size
+        start_y = origin_y // self.tile_size
+        end_x = min(self.width, (origin_x + size - 1) // self.tile_size + 1)
+        end_y = min(self.height, len(layer), (origin_y + size - 1) // self.tile_size + 1)
+        
+        blit_list = []
+        for y in range(start_y, end_y):
+            row = layer[y][start_x:end_x]
+            if not isinstance(row, list):
+                row = row.tolist()  # Plain ints from memory-mapped or array('H') rows
+            for x, tile_id in enumerate(row, start_x):
+                if tile_id > 0 and tile_id in self.tiles:
+                    blit_list.append((
+                        self.tiles[tile_id].image,
+                        (x * self.tile_size - origin_x, y * self.tile_size - origin_y)
+                    ))
+        
+        if not blit_list:
+            return None
+        
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        surface.blits(blit_list, doreturn=False)
+        return surface
+    
+    def render(self, screen, camera_offset, culling=None):
+        """
+        Render the map with camera offset
+        
+        Args:
+            screen: Surface to draw on
+            camera_offset: Camera position
+            culling: Optional CullingStage that receives drawn/culled counts
+        """
+        # Calculate the range of chunks overlapping the camera
         cam_x, cam_y = camera_offset
-        start_x = max(0, cam_x // self.tile_size)
-        start_y = max(0, cam_y // self.tile_size)
-        end_x = min(self.width, (cam_x + screen.get_width()) // self.tile_size + 1)
-        end_y = min(self.height, (cam_y + screen.get_height()) // self.tile_size + 1)
-        
-        # Render each layer
-        for layer_index, layer in enumerate(self.layers):
-            # Skip rendering for empty layers
-            if not layer:
-                continue
-                
-            for y in range(start_y, end_y):
-                if y >= len(layer):
-                    continue
+        size = self.chunk_size
+        chunks_x, chunks_y = self._chunk_counts()
+        start_x = max(0, int(cam_x // size))
+        start_y = max(0, int(cam_y // size))
+        end_x = min(chunks_x, int((cam_x + screen.get_width() - 1) // size) + 1)
+        end_y = min(chunks_y, int((cam_y + screen.get_height() - 1) // size) + 1)
+        
+        # Render each layer from its pre-baked chunks
+        blit_list = []
+        for layer_index in range(len(self.layers)):
+            for chunk_y in range(start_y, end_y):
+                for chunk_x in range(start_x, end_x):
+                    key = (layer_index, chunk_x, chunk_y)
+                    if key not in self.chunks:
+                        # Layers added after the last bake are rendered on demand
+                        self.chunks[key] = self._bake_chunk(layer_index, chunk_x, chunk_y)
                     
-                for x in range(start_x, end_x):
-                    if x >= len(layer[y]):
-                        continue
-                        
-                    tile_id = layer[y][x]
-                    if tile_id > 0 and tile_id in self.tiles:
-                        # Calculate screen position
-                        screen_x = x * self.tile_size - cam_x
-                        screen_y = y * self.tile_size - cam_y
-                        
-                        # Draw the tile
-                        screen.blit(self.tiles[tile_id].image, (screen_x, screen_y))
+                    chunk = self.chunks[key]
+                    if chunk is not None:
+                        blit_list.append((chunk, (chunk_x * size - cam_x, chunk_y * size - cam_y)))
+        
+        if blit_list:
+            screen.blits(blit_list, doreturn=False)
+        if culling is not None:
+            chunk_count = chunks_x * chunks_y * len(self.layers)
+            culling.record("chunks", len(blit_list), chunk_count - len(blit_list))
+            debug_rects = culling.visible_rects("collision_rects", self.spatial_index)
+        else:
+            debug_rects = self.collision_rects
         
         # Debug: visualize collision rects and transition points
-        for rect in self.collision_rects:
+        for rect in debug_rects:
             debug_rect = rect.copy()
             debug_rect.x -= camera_offset[0]
             debug_rect.y -= camera_offset[1]
@@ -1,25 +1,90 @@
 import pygame
+from graphics.text_cache import font_registry, text_cache
 
 class UI:
-    """User interface rendering"""
+    """
+    User interface rendering
     
-    def __init__(self, screen_width, screen_height):
+    In retained mode (the default) the HUD widgets are drawn into a
+    transparent layer that is only updated when a widget's bound values
+    change; each frame just blits the widget areas of that layer.
+    """
+    
+    def __init__(self, screen_width, screen_height, retained=True):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font = pygame.font.Font(None, 24)  # Default font
-        self.title_font = pygame.font.Font(None, 48)  # Larger font for titles
+        self.font_size = 24  # Default font
+        self.title_font_size = 48  # Larger font for titles
+        self.font = font_registry.get(self.font_size)
+        self.title_font = font_registry.get(self.title_font_size)
+        
+        # Retained HUD layer
+        self.retained = retained
+        self.layer = None
+        self.widgets = {}  # widget name -> (bound values, rect on the layer)
     
     def render(self, screen, player):
         """Render the game UI elements"""
+        if not self.retained:
+            # Immediate mode: draw everything straight to the screen
+            if hasattr(player, 'health') and hasattr(player, 'max_health'):
+                self._draw_health_bar(screen, player)
+            if hasattr(player, 'coins'):
+                self._draw_coin_counter(screen, player.coins)
+            return
+        
+        if self.layer is None or self.layer.get_size() != screen.get_size():
+            self.layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.widgets.clear()
+        
         # Draw health bar
-        self._draw_health_bar(screen, player)
+        if hasattr(player, 'health') and hasattr(player, 'max_health'):
+            self._update_widget("health", (player.health, player.max_health),
+                                lambda surface: self._draw_health_bar(surface, player))
+        else:
+            self._remove_widget("health")
         
         # Draw score/coins if applicable
         if hasattr(player, 'coins'):
-            self._draw_coin_counter(screen, player.coins)
+            self._update_widget("coins", (player.coins,),
+                                lambda surface: self._draw_coin_counter(surface, player.coins))
+        else:
+            self._remove_widget("coins")
+        
+        screen.blits([(self.layer, rect.topleft, rect) for _, rect in self.widgets.values()], doreturn=False)
+    
+    def _update_widget(self, name, values, draw):
+        """Redraw a widget on the HUD layer if its bound values changed"""
+        widget = self.widgets.get(name)
+        if widget is not None and widget[0] == values:
+            return
+        
+        self._remove_widget(name)
+        rect = draw(self.layer)
+        self.widgets[name] = (values, rect)
+    
+    def _remove_widget(self, name):
+        """Clear a widget from the HUD layer and return the rect it covered"""
+        widget = self.widgets.pop(name, None)
+        if widget is None:
+            return None
+        self.layer.fill((0, 0, 0, 0), widget[1])
+        return widget[1]
+    
+    def invalidate(self):
+        """Force every HUD widget to be redrawn on the next render"""
+        self.layer = None
+    
+    def _blit_text(self, surface, text_surface, position):
+        """Blit text to the screen or to the HUD layer"""
+        if surface is self.layer:
+            # The layer is transparent under the text, so copy the pixels
+            # instead of alpha blending them (which would darken the edges)
+            return surface.blit(text_surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+        return surface.blit(text_surface, position)
     
     def _draw_health_bar(self, screen, player):
-        """Draw the player's health bar"""
+        """Draw the player's health bar and return the area it covers"""
         if hasattr(player, 'health') and hasattr(player, 'max_health'):
             # Health bar background
             bar_width = 200
@@ -51,18 +116,20 @@ class UI:
             
             # Draw health text
             health_text = f"Health: {player.health}/{player.max_health}"
-            text_surface = self.font.render(health_text, True, (255, 255, 255))
-            screen.blit(text_surface, (x + 10, y + bar_height + 5))
+            text_surface = text_cache.render(health_text, self.font_size, (255, 255, 255))
+            text_rect = self._blit_text(screen, text_surface, (x + 10, y + bar_height + 5))
+            return text_rect.union((x, y, bar_width, bar_height))
+        return pygame.Rect(0, 0, 0, 0)
     
     def _draw_coin_counter(self, screen, coins):
-        """Draw the coin/score counter"""
+        """Draw the coin/score counter and return the area it covers"""
         coin_text = f"Coins: {coins}"
-        text_surface = self.font.render(coin_text, True, (255, 215, 0))  # Gold color
-        screen.blit(text_surface, (self.screen_width - 150, 20))
+        text_surface = text_cache.render(coin_text, self.font_size, (255, 215, 0))  # Gold color
+        return self._blit_text(screen, text_surface, (self.screen_width - 150, 20))
     
     def draw_message(self, screen, message, position=None, color=(255, 255, 255)):
         """Draw a message on the screen"""
-        text_surface = self.font.render(message, True, color)
+        text_surface = text_cache.render(message, self.font_size, color)
         if position:
             screen.blit(text_surface, position)
         else:
@@ -1,161 +1,334 @@
 import pygame
 import json
 import os
+from systems.spatial_hash import SpatialHash
+from systems.culling import CullingStage
+from systems.area_streaming import AreaStreamer
+from graphics.tilemap import merge_tile_positions
 
-class Level:
-    def __init__(self, asset_manager=None):
+class LevelArea:
+    """
+    Geometry, contents and images of one area, built independently of the Level
+    
+    Areas are built on the streaming thread, so building one must not touch
+    the Level or any other shared state. Images are decoded there too and
+    converted for the display on the main thread when the area is entered.
+    """
+    # Rough per-object sizes for the memory estimate
+    RECT_BYTES = 64
+    INDEX_ENTRY_BYTES = 96
+    
+    def __init__(self, name):
+        self.name = name
         self.tiles = []
+        self.collision_rects = []  # Tiles merged into larger rects for collision
+        self.tile_index = SpatialHash(cell_size=160)  # Broadphase over collision_rects
+        self.render_index = SpatialHash(cell_size=160)  # Individual tiles, for view culling
+        self.transition_points = []  # (rect, target_level, spawn_x, spawn_y)
+        self.collectibles = []
+        self.images = {}  # name -> Surface, loaded and evicted with the area
+        self.images_converted = False
+        self.nbytes = 0
+    
+    def load_images(self, project_root, paths):
+        """
+        Decode the area's images; safe to run on the streaming thread
+        
+        Args:
+            project_root: Directory the paths are relative to
+            paths: Dictionary of image name -> path
+        """
+        for name, path in paths.items():
+            full_path = os.path.join(project_root, path)
+            try:
+                self.images[name] = pygame.image.load(full_path)
+            except (OSError, pygame.error) as e:
+                print(f"Error loading image {full_path}: {e}")
+    
+    def convert_images(self):
+        """Convert the images to the display format; call on the main thread"""
+        if self.images_converted or pygame.display.get_surface() is None:
+            return
+        self.images = {name: image.convert_alpha() for name, image in self.images.items()}
+        self.images_converted = True
+    
+    def estimate_size(self):
+        """Estimate the memory used by the area's geometry and indexes in bytes"""
+        rects = len(self.tiles) + len(self.collision_rects) + len(self.transition_points) + len(self.collectibles)
+        entries = sum(len(bucket) for bucket in self.tile_index.cells.values()) + \
+            sum(len(bucket) for bucket in self.render_index.cells.values())
+        pixels = sum(image.get_width() * image.get_height() * image.get_bytesize()
+                     for image in self.images.values())
+        self.nbytes = rects * self.RECT_BYTES + entries * self.INDEX_ENTRY_BYTES + pixels
+        return self.nbytes
+
+class Level:
+    # Images each area uses, by name; they are streamed in and evicted with the area
+    AREA_IMAGES = {
+        "starting_area": {"tile": "assets/images/tiles/tile.png"},
+        "underground_cave": {"tile": "assets/images/tiles/tile.png"},
+        "boss_chamber": {"tile": "assets/images/tiles/tile.png"},
+    }
+    
+    def __init__(self, asset_manager=None, max_resident_areas=4, area_memory_budget=16 * 1024 * 1024):
+        """
+        Initialize the level
+        
+        Args:
+            asset_manager: AssetManager whose project root area images are
+                loaded from
+            max_resident_areas: Number of areas kept loaded
+            area_memory_budget: Estimated bytes of area data kept loaded
+        """
+        self.tile_size = 40
+        self.merge_collision_rects = True  # False keeps one rect per tile for debugging
         self.background_layers = []
         self.foreground_layers = []
-        self.transition_points = []
         self.current_area = None
-        self.areas = {}  # Dictionary of level areas
-        self.collectibles = []
+        self.area = None  # LevelArea being played
         self.asset_manager = asset_manager
-        self.tile_image = None
         
-        # Load the tile image if asset manager is available
-        if self.asset_manager:
-            self.tile_image = self.asset_manager.get_image("tile/tile")
+        # Areas behind nearby transitions are built in the background
+        self.streamer = AreaStreamer(self.build_area, max_resident_areas, area_memory_budget)
+        self.areas = self.streamer.resident  # Dictionary of loaded level areas
+        self.prefetch_distance = 300  # Start loading when the player is this close to a transition
         
         self.load_level("starting_area")
     
+    # The current area's contents
+    
+    @property
+    def tiles(self):
+        return self.area.tiles
+    
+    @property
+    def collision_rects(self):
+        return self.area.collision_rects
+    
+    @property
+    def tile_index(self):
+        return self.area.tile_index
+    
+    @property
+    def render_index(self):
+        return self.area.render_index
+    
+    @property
+    def transition_points(self):
+        return self.area.transition_points
+    
+    @property
+    def collectibles(self):
+        return self.area.collectibles
+    
+    @property
+    def tile_image(self):
+        return self.area.images.get("tile")
+    
     def load_level(self, level_name):
+        """
+        Switch to an area
+        
+        Areas that were prefetched are swapped in without any building;
+        anything else is built now.
+        """
+        if self.current_area is not None:
+            self.streamer.unpin(self.current_area)
+        
+        self.area = self.streamer.get(level_name)
+        self.area.convert_images()
         self.current_area = level_name
-        self.tiles = []
-        self.transition_points = []  # Reset to empty list
-        self.collectibles = []
+        self.streamer.pin(level_name)
+        
+        # Load background images (in a real game)
+        # self.load_background_layers(level_name)
+    
+    def build_area(self, level_name):
+        """
+        Build an area from its layout; runs on the streaming thread
+        
+        Returns:
+            LevelArea with its collision index built and images decoded
+        """
+        area = LevelArea(level_name)
         
         # In a real game, you would load this from a JSON or Tiled map file
         # For this example, we'll create some predefined level layouts
         if level_name == "starting_area":
-            self.create_starting_area()
+            self.create_starting_area(area)
         elif level_name == "underground_cave":
-            self.create_underground_cave()
+            self.create_underground_cave(area)
         elif level_name == "boss_chamber":
-            self.create_boss_chamber()
+            self.create_boss_chamber(area)
         
-        # Load background images (in a real game)
-        # self.load_background_layers(level_name)
+        # Merge tiles and register the static geometry once for collision queries
+        self.build_collision_rects(area)
+        
+        # The area's images come and go with it
+        if self.asset_manager is not None:
+            area.load_images(self.asset_manager.project_root, self.AREA_IMAGES.get(level_name, {}))
+        area.estimate_size()
+        return area
     
-    def create_starting_area(self):
+    def update(self, player_rect):
+        """
+        Stream in the areas behind transitions the player is approaching
+        
+        Args:
+            player_rect: Player's rect
+        """
+        self.streamer.poll()
+        
+        nearby = player_rect.inflate(self.prefetch_distance * 2, self.prefetch_distance * 2)
+        for transition_rect, target_level, _, _ in self.transition_points:
+            if nearby.colliderect(transition_rect):
+                self.streamer.request(target_level)
+    
+    def create_starting_area(self, area):
         # Create a simple starting area
         tile_size = 40
         
         # Floor
         for x in range(0, 1280, tile_size):
             tile = pygame.Rect(x, 500, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Platforms
         for x in range(200, 400, tile_size):
             tile = pygame.Rect(x, 350, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         for x in range(600, 900, tile_size):
             tile = pygame.Rect(x, 400, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Walls
         for y in range(300, 500, tile_size):
             # Left wall
             tile = pygame.Rect(0, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
             # Right wall
             tile = pygame.Rect(1240, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Add transition to underground cave - make it more visible
         transition = pygame.Rect(1160, 420, 80, 80)
         # Store as tuple (rect, target_level, spawn_x, spawn_y) 
-        self.transition_points.append((transition, "underground_cave", 50, 400))
+        area.transition_points.append((transition, "underground_cave", 50, 400))
         
         # Add a collectible
-        self.collectibles.append({
+        area.collectibles.append({
             "rect": pygame.Rect(500, 450, 20, 20),
             "type": "health"
         })
     
-    def create_underground_cave(self):
+    def create_underground_cave(self, area):
         # Create an underground cave area
         tile_size = 40
         
         # Floor
         for x in range(0, 1280, tile_size):
             tile = pygame.Rect(x, 500, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Ceiling
         for x in range(0, 1280, tile_size):
             tile = pygame.Rect(x, 100, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Platforms with gaps for challenging jumps
         for x in range(200, 300, tile_size):
             tile = pygame.Rect(x, 350, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         for x in range(400, 500, tile_size):
             tile = pygame.Rect(x, 400, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         for x in range(600, 700, tile_size):
             tile = pygame.Rect(x, 350, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         for x in range(800, 900, tile_size):
             tile = pygame.Rect(x, 400, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Walls
         for y in range(100, 500, tile_size):
             # Left wall
             tile = pygame.Rect(0, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
             # Right wall
             tile = pygame.Rect(1240, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Add transition back to starting area - make it more visible
         transition = pygame.Rect(0, 420, 40, 80)
-        self.transition_points.append((transition, "starting_area", 1150, 400))
+        area.transition_points.append((transition, "starting_area", 1150, 400))
         
         # Add transition to boss chamber (needs a special ability to access)
         transition = pygame.Rect(1200, 420, 40, 80)
-        self.transition_points.append((transition, "boss_chamber", 50, 400))
+        area.transition_points.append((transition, "boss_chamber", 50, 400))
         
         # Add collectibles
-        self.collectibles.append({
+        area.collectibles.append({
             "rect": pygame.Rect(650, 300, 20, 20),
             "type": "ability_double_jump"
         })
     
-    def create_boss_chamber(self):
+    def create_boss_chamber(self, area):
         # Create a boss chamber area
         tile_size = 40
         
         # Floor
         for x in range(0, 1280, tile_size):
             tile = pygame.Rect(x, 550, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Ceiling
         for x in range(0, 1280, tile_size):
             tile = pygame.Rect(x, 50, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Walls
         for y in range(50, 550, tile_size):
             # Left wall
             tile = pygame.Rect(0, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
             # Right wall
             tile = pygame.Rect(1240, y, tile_size, tile_size)
-            self.tiles.append(tile)
+            area.tiles.append(tile)
         
         # Add transition back to underground cave
         transition = pygame.Rect(0, 470, 40, 80)
-        self.transition_points.append((transition, "underground_cave", 1150, 400))
+        area.transition_points.append((transition, "underground_cave", 1150, 400))
+    
+    def build_collision_rects(self, area=None):
+        """
+        Build collision rects from the tiles and index them (plus the tiles, for rendering)
+        
+        Args:
+            area: LevelArea to build (defaults to the current one)
+        """
+        if area is None:
+            area = self.area
+        tile_size = self.tile_size
+        if self.merge_collision_rects:
+            # Only square tiles can be merged, anything else is kept as-is
+            square = [(tile.x, tile.y) for tile in area.tiles
+                      if tile.width == tile_size and tile.height == tile_size]
+            other = [tile for tile in area.tiles
+                     if tile.width != tile_size or tile.height != tile_size]
+            area.collision_rects = merge_tile_positions(square, tile_size) + other
+        else:
+            area.collision_rects = list(area.tiles)
+        
+        area.tile_index.rebuild(area.collision_rects)
+        area.render_index.rebuild(area.tiles)
+    
+    def check_collision(self, entity_rect):
+        """Get all collision rects that an entity overlaps"""
+        return self.tile_index.query(entity_rect)
     
     def check_transitions(self, player_rect):
         for transition_rect, target_level, spawn_x, spawn_y in self.transition_points:
@@ -163,26 +336,39 @@ class Level:
                 return (target_level, spawn_x, spawn_y)
         return None
     
-    def render(self, screen, camera_offset):
+    def render(self, screen, camera_offset, culling=None):
+        """
+        Render the parts of the level inside the view
+        
+        Args:
+            screen: Surface to draw on
+            camera_offset: Camera position
+            culling: CullingStage for this frame (a local one is used if omitted)
+        """
+        if culling is None:
+            culling = CullingStage(margin=0)
+            culling.begin(camera_offset, screen.get_size())
+        view = culling.view
+        
         # Render background layers
         for layer in self.background_layers:
             # Parallax scrolling would be implemented here
             pass
         
         # Render tiles
-        for tile in self.tiles:
-            # Apply camera offset
-            tile_rect = tile.copy()
-            tile_rect.x -= camera_offset[0]
-            tile_rect.y -= camera_offset[1]
-            
-            if self.tile_image:
-                screen.blit(self.tile_image, tile_rect)
-            else:
-                pygame.draw.rect(screen, (100, 100, 100), tile_rect)
+        tiles = culling.visible_rects("tiles", self.render_index)
+        if self.tile_image:
+            offset_x, offset_y = camera_offset
+            screen.blits([(self.tile_image, (tile.x - offset_x, tile.y - offset_y)) for tile in tiles],
+                         doreturn=False)
+        else:
+            for tile in tiles:
+                pygame.draw.rect(screen, (100, 100, 100), tile.move(-camera_offset[0], -camera_offset[1]))
         
         # Render transition points with a visible indicator
-        for transition, target_level, _, _ in self.transition_points:
+        transitions = [point for point in self.transition_points if view.colliderect(point[0])]
+        culling.record("transitions", len(transitions), len(self.transition_points) - len(transitions))
+        for transition, target_level, _, _ in transitions:
             transition_rect = transition.copy()
             transition_rect.x -= camera_offset[0]
             transition_rect.y -= camera_offset[1]
@@ -194,7 +380,9 @@ class Level:
             pygame.draw.rect(screen, (0, 200, 0), inner_rect, 2) 
         
         # Render collectibles
-        for collectible in self.collectibles:
+        collectibles = [collectible for collectible in self.collectibles if view.colliderect(collectible["rect"])]
+        culling.record("level_collectibles", len(collectibles), len(self.collectibles) - len(collectibles))
+        for collectible in collectibles:
             collectible_rect = collectible["rect"].copy()
             collectible_rect.x -= camera_offset[0]
             collectible_rect.y -= camera_offset[1]
@@ -0,0 +1,540 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <math.h>
+#include <stdlib.h>
+#include <string.h>
+
+/*
+ * Compiled collision routines used by physics_wrapper
+ *
+ * Build in place with:
+ *
+ *     python setup.py build_ext --inplace
+ *
+ * physics_wrapper falls back to its pure Python versions when this module
+ * can't be imported; check_physics.py compares the two.
+ */
+
+// Axis-aligned box as (x, y, width, height)
+typedef struct {
+    double x, y, w, h;
+} Box;
+
+// Read one rect: a 4-item sequence (tuple, list, pygame.Rect) or an object with a rect attribute
+static int read_box(PyObject* item, Box* box) {
+    double values[4];
+    PyObject* rect = NULL;
+
+    if (!PySequence_Check(item)) {
+        rect = PyObject_GetAttrString(item, "rect");
+        if (!rect) {
+            return -1;
+        }
+        item = rect;
+    }
+
+    Py_ssize_t size = PySequence_Size(item);
+    if (size != 4) {
+        if (size >= 0) {
+            PyErr_SetString(PyExc_ValueError, "Rects must have 4 values (x, y, width, height)");
+        }
+        Py_XDECREF(rect);
+        return -1;
+    }
+
+    for (int i = 0; i < 4; i++) {
+        PyObject* value = PySequence_GetItem(item, i);
+        if (!value) {
+            Py_XDECREF(rect);
+            return -1;
+        }
+        values[i] = PyFloat_AsDouble(value);
+        Py_DECREF(value);
+        if (values[i] == -1.0 && PyErr_Occurred()) {
+            Py_XDECREF(rect);
+            return -1;
+        }
+    }
+    Py_XDECREF(rect);
+
+    box->x = values[0];
+    box->y = values[1];
+    box->w = values[2];
+    box->h = values[3];
+    return 0;
+}
+
+// Struct-module format characters accepted for rect arrays
+#define BUFFER_FORMATS "dfbBhHiIlLqQ"
+
+// Read one element of a buffer with a struct-module format character
+static int read_buffer_value(const char* data, char format, double* value) {
+    switch (format) {
+        case 'd': *value = *(const double*)data; return 0;
+        case 'f': *value = *(const float*)data; return 0;
+        case 'b': *value = *(const signed char*)data; return 0;
+        case 'B': *value = *(const unsigned char*)data; return 0;
+        case 'h': *value = *(const short*)data; return 0;
+        case 'H': *value = *(const unsigned short*)data; return 0;
+        case 'i': *value = *(const int*)data; return 0;
+        case 'I': *value = *(const unsigned int*)data; return 0;
+        case 'l': *value = *(const long*)data; return 0;
+        case 'L': *value = *(const unsigned long*)data; return 0;
+        case 'q': *value = *(const long long*)data; return 0;
+        case 'Q': *value = *(const unsigned long long*)data; return 0;
+        default: return -1;
+    }
+}
+
+/*
+ * Read a collection of rects into a newly allocated array
+ *
+ * Accepts buffer-protocol arrays of 4 values per rect (NumPy arrays of
+ * shape (n, 4), array.array, memoryview) or sequences of rects. The caller
+ * frees *boxes with PyMem_Free.
+ */
+static int read_boxes(PyObject* obj, Box** boxes, Py_ssize_t* count) {
+    *boxes = NULL;
+    *count = 0;
+
+    if (PyObject_CheckBuffer(obj)) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(obj, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0) {
+            return -1;
+        }
+
+        // Native byte order only; '@', '=' and '<' (on little-endian machines) mean the same here
+        const char* format = view.format ? view.format : "B";
+        if (format[0] == '@' || format[0] == '=' || format[0] == '<') {
+            format++;
+        }
+        if (format[0] == '\0' || format[1] != '\0' || !strchr(BUFFER_FORMATS, format[0])) {
+            PyErr_Format(PyExc_TypeError, "Unsupported buffer format '%s' for rects", view.format);
+            PyBuffer_Release(&view);
+            return -1;
+        }
+
+        Py_ssize_t values = view.itemsize ? view.len / view.itemsize : 0;
+        if (values % 4) {
+            PyErr_SetString(PyExc_ValueError, "Rect arrays must have 4 values (x, y, width, height) per rect");
+            PyBuffer_Release(&view);
+            return -1;
+        }
+
+        Py_ssize_t n = values / 4;
+        Box* result = PyMem_Malloc(sizeof(Box) * (n ? n : 1));
+        if (!result) {
+            PyBuffer_Release(&view);
+            PyErr_NoMemory();
+            return -1;
+        }
+
+        const char* data = (const char*)view.buf;
+        for (Py_ssize_t i = 0; i < n; i++) {
+            double* fields = &result[i].x;
+            for (int k = 0; k < 4; k++) {
+                read_buffer_value(data + (i * 4 + k) * view.itemsize, format[0], &fields[k]);
+            }
+        }
+        PyBuffer_Release(&view);
+
+        *boxes = result;
+        *count = n;
+        return 0;
+    }
+
+    PyObject* sequence = PySequence_Fast(obj, "Rects must be a sequence or a buffer-protocol array");
+    if (!sequence) {
+        return -1;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(sequence);
+    Box* result = PyMem_Malloc(sizeof(Box) * (n ? n : 1));
+    if (!result) {
+        Py_DECREF(sequence);
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    PyObject** items = PySequence_Fast_ITEMS(sequence);
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (read_box(items[i], &result[i]) < 0) {
+            PyMem_Free(result);
+            Py_DECREF(sequence);
+            return -1;
+        }
+    }
+    Py_DECREF(sequence);
+
+    *boxes = result;
+    *count = n;
+    return 0;
+}
+
+/*
+ * Read the obstacles near an area
+ *
+ * A spatial index (anything with a query_candidates method) is queried
+ * for the area; other collections are read whole, like
+ * physics_wrapper._nearby_obstacles.
+ */
+static int read_nearby_boxes(PyObject* obstacles, double x, double y, double width, double height,
+                             Box** boxes, Py_ssize_t* count) {
+    if (PyObject_HasAttrString(obstacles, "query_candidates")) {
+        PyObject* candidates = PyObject_CallMethod(obstacles, "query_candidates", "dddd", x, y, width, height);
+        if (!candidates) {
+            return -1;
+        }
+        int status = read_boxes(candidates, boxes, count);
+        Py_DECREF(candidates);
+        return status;
+    }
+    return read_boxes(obstacles, boxes, count);
+}
+
+// Whether an obstacle collection is empty, without reading it
+static int is_empty(PyObject* obstacles) {
+    if (PyObject_CheckBuffer(obstacles)) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(obstacles, &view, PyBUF_SIMPLE) < 0) {
+            return -1;
+        }
+        int empty = view.len == 0;
+        PyBuffer_Release(&view);
+        return empty;
+    }
+    int truth = PyObject_IsTrue(obstacles);
+    return truth < 0 ? -1 : !truth;
+}
+
+// Truncate a box to integers the way pygame.Rect does
+static void truncate_box(const Box* box, long long* x, long long* y, long long* w, long long* h) {
+    *x = (long long)box->x;
+    *y = (long long)box->y;
+    *w = (long long)box->w;
+    *h = (long long)box->h;
+}
+
+// pygame.Rect.colliderect on integer boxes: empty boxes never collide, negative sizes are flipped
+static int rects_collide(long long ax, long long ay, long long aw, long long ah,
+                         long long bx, long long by, long long bw, long long bh) {
+    if (aw == 0 || ah == 0 || bw == 0 || bh == 0) {
+        return 0;
+    }
+    long long a_left = aw < 0 ? ax + aw : ax, a_right = aw < 0 ? ax : ax + aw;
+    long long a_top = ah < 0 ? ay + ah : ay, a_bottom = ah < 0 ? ay : ay + ah;
+    long long b_left = bw < 0 ? bx + bw : bx, b_right = bw < 0 ? bx : bx + bw;
+    long long b_top = bh < 0 ? by + bh : by, b_bottom = bh < 0 ? by : by + bh;
+    return a_left < b_right && b_left < a_right && a_top < b_bottom && b_top < a_bottom;
+}
+
+// Time of first contact between a moving box and an obstacle; same rules as physics_wrapper.swept_aabb
+static double swept_aabb(double x, double y, double width, double height,
+                         double velocity_x, double velocity_y, const Box* obstacle,
+                         int* normal_x, int* normal_y) {
+    double entry_x, exit_x, entry_y, exit_y;
+    *normal_x = 0;
+    *normal_y = 0;
+
+    if (velocity_x > 0) {
+        entry_x = (obstacle->x - (x + width)) / velocity_x;
+        exit_x = (obstacle->x + obstacle->w - x) / velocity_x;
+    } else if (velocity_x < 0) {
+        entry_x = (obstacle->x + obstacle->w - x) / velocity_x;
+        exit_x = (obstacle->x - (x + width)) / velocity_x;
+    } else if (x < obstacle->x + obstacle->w && x + width > obstacle->x) {
+        entry_x = -INFINITY;
+        exit_x = INFINITY;
+    } else {
+        return 1.0;
+    }
+
+    if (velocity_y > 0) {
+        entry_y = (obstacle->y - (y + height)) / velocity_y;
+        exit_y = (obstacle->y + obstacle->h - y) / velocity_y;
+    } else if (velocity_y < 0) {
+        entry_y = (obstacle->y + obstacle->h - y) / velocity_y;
+        exit_y = (obstacle->y - (y + height)) / velocity_y;
+    } else if (y < obstacle->y + obstacle->h && y + height > obstacle->y) {
+        entry_y = -INFINITY;
+        exit_y = INFINITY;
+    } else {
+        return 1.0;
+    }
+
+    double entry = entry_x > entry_y ? entry_x : entry_y;
+    double exit = exit_x < exit_y ? exit_x : exit_y;
+    if (entry < 0 || entry >= 1 || entry >= exit) {
+        return 1.0;
+    }
+
+    if (entry_x > entry_y) {
+        *normal_x = velocity_x > 0 ? -1 : 1;
+    } else {
+        *normal_y = velocity_y > 0 ? -1 : 1;
+    }
+    return entry;
+}
+
+// Result of a move_and_slide step
+typedef struct {
+    double x, y, velocity_x, velocity_y;
+    int normal_x, normal_y;
+    double first_impact;
+} Slide;
+
+// Move a box, stopping at obstacles and sliding along them; same rules as physics_wrapper.move_and_slide
+static int slide(double x, double y, double width, double height, double velocity_x, double velocity_y,
+                 PyObject* obstacles, int max_iterations, Slide* result) {
+    result->normal_x = 0;
+    result->normal_y = 0;
+    result->first_impact = 1.0;
+    result->velocity_x = velocity_x;
+    result->velocity_y = velocity_y;
+    result->x = x + velocity_x;
+    result->y = y + velocity_y;
+
+    if (velocity_x == 0 && velocity_y == 0) {
+        return 0;
+    }
+    int empty = is_empty(obstacles);
+    if (empty) {
+        return empty < 0 ? -1 : 0;
+    }
+
+    // The slide never leaves the box swept by the full move
+    Box* boxes;
+    Py_ssize_t count;
+    if (read_nearby_boxes(obstacles,
+                          fmin(x, x + velocity_x) - 1, fmin(y, y + velocity_y) - 1,
+                          width + fabs(velocity_x) + 2, height + fabs(velocity_y) + 2,
+                          &boxes, &count) < 0) {
+        return -1;
+    }
+
+    double remaining_x = velocity_x, remaining_y = velocity_y;
+    double elapsed = 0.0;
+    for (int iteration = 0; iteration < max_iterations; iteration++) {
+        if (remaining_x == 0 && remaining_y == 0) {
+            break;
+        }
+
+        double time = 1.0;
+        int hit_normal_x = 0, hit_normal_y = 0;
+        const Box* hit = NULL;
+        for (Py_ssize_t i = 0; i < count; i++) {
+            int nx, ny;
+            double toi = swept_aabb(x, y, width, height, remaining_x, remaining_y, &boxes[i], &nx, &ny);
+            if (toi < time) {
+                time = toi;
+                hit_normal_x = nx;
+                hit_normal_y = ny;
+                hit = &boxes[i];
+            }
+        }
+
+        if (!hit) {
+            x += remaining_x;
+            y += remaining_y;
+            break;
+        }
+
+        if (result->first_impact == 1.0) {
+            result->first_impact = elapsed + (1.0 - elapsed) * time;
+        }
+        elapsed += (1.0 - elapsed) * time;
+
+        // Move up to the contact, snapping exactly onto the surface
+        x += remaining_x * time;
+        y += remaining_y * time;
+        if (hit_normal_x) {
+            x = hit_normal_x < 0 ? hit->x - width : hit->x + hit->w;
+            result->normal_x = hit_normal_x;
+            remaining_x = 0;
+            result->velocity_x = 0;
+            remaining_y *= 1.0 - time;
+        } else {
+            y = hit_normal_y < 0 ? hit->y - height : hit->y + hit->h;
+            result->normal_y = hit_normal_y;
+            remaining_y = 0;
+            result->velocity_y = 0;
+            remaining_x *= 1.0 - time;
+        }
+    }
+    PyMem_Free(boxes);
+
+    result->x = x;
+    result->y = y;
+    return 0;
+}
+
+// Move a box by a displacement, stopping at obstacles and sliding along them
+static PyObject* move_and_slide(PyObject* self, PyObject* args, PyObject* kwargs) {
+    static char* keywords[] = {"x", "y", "width", "height", "velocity_x", "velocity_y",
+                               "obstacles", "max_iterations", NULL};
+    double x, y, width, height, velocity_x, velocity_y;
+    PyObject* obstacles;
+    int max_iterations = 3;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "ddddddO|i", keywords, &x, &y, &width, &height,
+                                     &velocity_x, &velocity_y, &obstacles, &max_iterations)) {
+        return NULL;
+    }
+
+    Slide result;
+    if (slide(x, y, width, height, velocity_x, velocity_y, obstacles, max_iterations, &result) < 0) {
+        return NULL;
+    }
+    return Py_BuildValue("(ddddiid)", result.x, result.y, result.velocity_x, result.velocity_y,
+                         result.normal_x, result.normal_y, result.first_impact);
+}
+
+// Perform a sweep test for collision detection
+static PyObject* sweep_test(PyObject* self, PyObject* args) {
+    double x, y, width, height, velocity_x, velocity_y;
+    PyObject* obstacles;
+
+    if (!PyArg_ParseTuple(args, "ddddddO", &x, &y, &width, &height, &velocity_x, &velocity_y, &obstacles)) {
+        return NULL;
+    }
+
+    Slide result;
+    if (slide(x, y, width, height, velocity_x, velocity_y, obstacles, 3, &result) < 0) {
+        return NULL;
+    }
+    return Py_BuildValue("(ddNN)", result.x, result.y,
+                         PyBool_FromLong(result.normal_x != 0), PyBool_FromLong(result.normal_y != 0));
+}
+
+// Check if a box is standing on an obstacle
+static PyObject* check_on_ground(PyObject* self, PyObject* args) {
+    double x, y, width, height;
+    double check_distance = 1.0;
+    PyObject* obstacles;
+
+    if (!PyArg_ParseTuple(args, "ddddO|d", &x, &y, &width, &height, &obstacles, &check_distance)) {
+        return NULL;
+    }
+
+    int empty = is_empty(obstacles);
+    if (empty) {
+        if (empty < 0) {
+            return NULL;
+        }
+        Py_RETURN_FALSE;
+    }
+
+    // Probe below the feet, truncated like the pygame.Rect the Python version builds
+    Box probe = {x, y + height, width, check_distance};
+    long long px, py, pw, ph;
+    truncate_box(&probe, &px, &py, &pw, &ph);
+
+    Box* boxes;
+    Py_ssize_t count;
+    if (read_nearby_boxes(obstacles, (double)px, (double)py, (double)pw, (double)ph, &boxes, &count) < 0) {
+        return NULL;
+    }
+
+    int grounded = 0;
+    for (Py_ssize_t i = 0; i < count && !grounded; i++) {
+        long long bx, by, bw, bh;
+        truncate_box(&boxes[i], &bx, &by, &bw, &bh);
+        grounded = rects_collide(px, py, pw, ph, bx, by, bw, bh);
+    }
+    PyMem_Free(boxes);
+
+    return PyBool_FromLong(grounded);
+}
+
+// Get every overlapping pair between two collections of rects
+static PyObject* overlap_pairs(PyObject* self, PyObject* args) {
+    PyObject* a_obj;
+    PyObject* b_obj;
+
+    if (!PyArg_ParseTuple(args, "OO", &a_obj, &b_obj)) {
+        return NULL;
+    }
+
+    Box* a;
+    Box* b;
+    Py_ssize_t a_count, b_count;
+    if (read_boxes(a_obj, &a, &a_count) < 0) {
+        return NULL;
+    }
+    if (read_boxes(b_obj, &b, &b_count) < 0) {
+        PyMem_Free(a);
+        return NULL;
+    }
+
+    // Integer rects, so the result matches pygame.Rect.colliderect
+    long long* b_values = PyMem_Malloc(sizeof(long long) * 4 * (b_count ? b_count : 1));
+    PyObject* first = PyList_New(0);
+    PyObject* second = PyList_New(0);
+    if (!b_values || !first || !second) {
+        PyMem_Free(a);
+        PyMem_Free(b);
+        PyMem_Free(b_values);
+        Py_XDECREF(first);
+        Py_XDECREF(second);
+        return PyErr_Occurred() ? NULL : PyErr_NoMemory();
+    }
+    for (Py_ssize_t j = 0; j < b_count; j++) {
+        truncate_box(&b[j], &b_values[j * 4], &b_values[j * 4 + 1], &b_values[j * 4 + 2], &b_values[j * 4 + 3]);
+    }
+
+    int failed = 0;
+    for (Py_ssize_t i = 0; i < a_count && !failed; i++) {
+        long long ax, ay, aw, ah;
+        truncate_box(&a[i], &ax, &ay, &aw, &ah);
+        for (Py_ssize_t j = 0; j < b_count; j++) {
+            const long long* other = &b_values[j * 4];
+            if (!rects_collide(ax, ay, aw, ah, other[0], other[1], other[2], other[3])) {
+                continue;
+            }
+            PyObject* index_a = PyLong_FromSsize_t(i);
+            PyObject* index_b = PyLong_FromSsize_t(j);
+            if (!index_a || !index_b || PyList_Append(first, index_a) < 0 || PyList_Append(second, index_b) < 0) {
+                failed = 1;
+            }
+            Py_XDECREF(index_a);
+            Py_XDECREF(index_b);
+            if (failed) {
+                break;
+            }
+        }
+    }
+    PyMem_Free(a);
+    PyMem_Free(b);
+    PyMem_Free(b_values);
+
+    if (failed) {
+        Py_DECREF(first);
+        Py_DECREF(second);
+        return NULL;
+    }
+    return Py_BuildValue("(NN)", first, second);
+}
+
+// Module method table
+static PyMethodDef PhysicsMethods[] = {
+    {"move_and_slide", (PyCFunction)(void(*)(void))move_and_slide, METH_VARARGS | METH_KEYWORDS,
+     "Move a box by a displacement, stopping at obstacles and sliding along them"},
+    {"sweep_test", sweep_test, METH_VARARGS, "Perform a sweep test for collision detection"},
+    {"check_on_ground", check_on_ground, METH_VARARGS, "Check if a box is standing on an obstacle"},
+    {"overlap_pairs", overlap_pairs, METH_VARARGS, "Get every overlapping pair between two collections of rects"},
+    {NULL, NULL, 0, NULL}  // Sentinel
+};
+
+// Module definition
+static struct PyModuleDef physicsmodule = {
+    PyModuleDef_HEAD_INIT,
+    "physics",         // name of module
+    "C collision routines for physics_wrapper",  // module documentation
+    -1,                // size of per-interpreter state or -1
+    PhysicsMethods     // method table
+};
+
+// Module initialization function
+PyMODINIT_FUNC PyInit_physics(void) {
+    return PyModule_Create(&physicsmodule);
+}
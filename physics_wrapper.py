@@ -1,12 +1,186 @@
 """
-Pure Python implementation of the physics engine.
-The C extension has been removed for simplicity.
+Physics routines: swept collision, ground checks and batch overlap queries.
+
+The compiled physics extension (physics.c, built with
+`python setup.py build_ext --inplace`) replaces move_and_slide,
+sweep_test, check_on_ground and overlap_pairs when it can be imported.
+The pure Python versions below are the fallback, and the reference that
+check_physics.py compares the extension against.
+
+Movement is resolved with swept AABBs: a mover's whole displacement is
+tested against the obstacles near its path, it stops at the earliest time
+of impact and slides along the surface it hit with the rest of its motion.
+Fast movers therefore can't skip over thin platforms however large a step
+is.
 """
+import math
 import pygame
 
-# Simply set the flag to False since we're not using the C extension
-using_c_extension = False
-print("Using Python implementation for physics")
+# The batch solver vectorizes with NumPy when it is available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from systems import batch_collision
+
+# The compiled extension is optional
+try:
+    import physics as _physics
+except ImportError:
+    _physics = None
+
+using_c_extension = _physics is not None
+print("Using C extension for physics" if using_c_extension else "Using Python implementation for physics")
+
+def _nearby_obstacles(obstacles, x, y, width, height):
+    """
+    Narrow an obstacle collection down to the ones near an area.
+    
+    A spatial index (anything with a query_candidates method, such as
+    systems.spatial_hash.SpatialHash) is queried directly; plain lists
+    are returned unchanged.
+    """
+    if hasattr(obstacles, 'query_candidates'):
+        return obstacles.query_candidates(x, y, width, height)
+    return obstacles
+
+def _as_obstacles(obstacles):
+    """
+    Turn buffer-protocol obstacle arrays into a list of (x, y, width, height)
+    tuples, the way the extension reads them; lists and spatial indexes are
+    returned unchanged.
+    """
+    if isinstance(obstacles, (list, tuple)) or hasattr(obstacles, 'query_candidates'):
+        return obstacles
+    try:
+        view = memoryview(obstacles)
+    except TypeError:
+        return obstacles
+    if np is not None:
+        return [tuple(row) for row in np.asarray(view).reshape(-1, 4).tolist()]
+    values = view.tolist()
+    while values and isinstance(values[0], list):
+        values = [value for row in values for value in row]
+    return [tuple(values[i:i + 4]) for i in range(0, len(values), 4)]
+
+def swept_aabb(x, y, width, height, velocity_x, velocity_y, obstacle):
+    """
+    Get when a moving box first touches an obstacle
+    
+    Boxes that already overlap the obstacle, or only graze its corner,
+    don't count as hitting it.
+    
+    Args:
+        x, y, width, height: Mover box at the start of the move
+        velocity_x, velocity_y: Displacement over the move
+        obstacle: Obstacle rect as (x, y, width, height)
+    
+    Returns:
+        Tuple of (time_of_impact, normal_x, normal_y); time_of_impact is in
+        [0, 1), or 1.0 with a zero normal if there is no hit
+    """
+    obstacle_x, obstacle_y, obstacle_width, obstacle_height = obstacle
+    
+    if velocity_x > 0:
+        entry_x = (obstacle_x - (x + width)) / velocity_x
+        exit_x = (obstacle_x + obstacle_width - x) / velocity_x
+    elif velocity_x < 0:
+        entry_x = (obstacle_x + obstacle_width - x) / velocity_x
+        exit_x = (obstacle_x - (x + width)) / velocity_x
+    elif x < obstacle_x + obstacle_width and x + width > obstacle_x:
+        entry_x, exit_x = -math.inf, math.inf
+    else:
+        return 1.0, 0, 0
+    
+    if velocity_y > 0:
+        entry_y = (obstacle_y - (y + height)) / velocity_y
+        exit_y = (obstacle_y + obstacle_height - y) / velocity_y
+    elif velocity_y < 0:
+        entry_y = (obstacle_y + obstacle_height - y) / velocity_y
+        exit_y = (obstacle_y - (y + height)) / velocity_y
+    elif y < obstacle_y + obstacle_height and y + height > obstacle_y:
+        entry_y, exit_y = -math.inf, math.inf
+    else:
+        return 1.0, 0, 0
+    
+    entry = max(entry_x, entry_y)
+    if entry < 0 or entry >= 1 or entry >= min(exit_x, exit_y):
+        return 1.0, 0, 0
+    
+    if entry_x > entry_y:
+        return entry, (-1 if velocity_x > 0 else 1), 0
+    return entry, 0, (-1 if velocity_y > 0 else 1)
+
+def move_and_slide(x, y, width, height, velocity_x, velocity_y, obstacles, max_iterations=3):
+    """
+    Move a box by a displacement, stopping at obstacles and sliding along them
+    
+    Args:
+        x, y, width, height: Mover box
+        velocity_x, velocity_y: Displacement for this step
+        obstacles: List of obstacle rects as (x, y, width, height) tuples,
+            or a spatial index of obstacle rects
+        max_iterations: Number of surfaces the mover may hit in one step
+    
+    Returns:
+        Tuple of (new_x, new_y, velocity_x, velocity_y, normal_x, normal_y,
+        time_of_impact). The velocity has the blocked components zeroed,
+        normal_x / normal_y are the normals of the x and y contacts (0 when
+        there was none) and time_of_impact is when the first hit happened
+        (1.0 without one).
+    """
+    normal_x = normal_y = 0
+    first_impact = 1.0
+    obstacles = _as_obstacles(obstacles)
+    if len(obstacles) == 0 or (velocity_x == 0 and velocity_y == 0):
+        return x + velocity_x, y + velocity_y, velocity_x, velocity_y, normal_x, normal_y, first_impact
+    
+    # The slide never leaves the box swept by the full move
+    obstacles = _nearby_obstacles(
+        obstacles,
+        min(x, x + velocity_x) - 1, min(y, y + velocity_y) - 1,
+        width + abs(velocity_x) + 2, height + abs(velocity_y) + 2
+    )
+    
+    remaining_x, remaining_y = velocity_x, velocity_y
+    elapsed = 0.0
+    for _ in range(max_iterations):
+        if remaining_x == 0 and remaining_y == 0:
+            break
+        
+        time, hit_normal_x, hit_normal_y, hit = 1.0, 0, 0, None
+        for obstacle in obstacles:
+            toi, nx, ny = swept_aabb(x, y, width, height, remaining_x, remaining_y, obstacle)
+            if toi < time:
+                time, hit_normal_x, hit_normal_y, hit = toi, nx, ny, obstacle
+        
+        if hit is None:
+            x += remaining_x
+            y += remaining_y
+            break
+        
+        if first_impact == 1.0:
+            first_impact = elapsed + (1.0 - elapsed) * time
+        elapsed += (1.0 - elapsed) * time
+        
+        # Move up to the contact, snapping exactly onto the surface
+        x += remaining_x * time
+        y += remaining_y * time
+        if hit_normal_x:
+            x = hit[0] - width if hit_normal_x < 0 else hit[0] + hit[2]
+            normal_x = hit_normal_x
+            remaining_x = 0
+            velocity_x = 0
+            remaining_y *= 1.0 - time
+        else:
+            y = hit[1] - height if hit_normal_y < 0 else hit[1] + hit[3]
+            normal_y = hit_normal_y
+            remaining_y = 0
+            velocity_y = 0
+            remaining_x *= 1.0 - time
+    
+    return x, y, velocity_x, velocity_y, normal_x, normal_y, first_impact
 
 def sweep_test(player_x, player_y, player_width, player_height, velocity_x, velocity_y, obstacles):
     """
@@ -16,46 +190,170 @@ def sweep_test(player_x, player_y, player_width, player_height, velocity_x, velo
         player_x, player_y: Player position
         player_width, player_height: Player dimensions
         velocity_x, velocity_y: Player velocity
-        obstacles: List of obstacle rects as (x, y, width, height) tuples
+        obstacles: List of obstacle rects as (x, y, width, height) tuples,
+            or a spatial index of obstacle rects
     
     Returns:
         Tuple of (new_x, new_y, collided_x, collided_y)
     """
-    # Python implementation (simplified)
-    final_x = player_x + velocity_x
-    final_y = player_y + velocity_y
-    collided_x = False
-    collided_y = False
-    
-    # If there are no obstacles, just return the final position with no collisions
-    if not obstacles:
-        return final_x, final_y, collided_x, collided_y
-    
-    # Create player rect at new position
-    new_player_rect_x = pygame.Rect(final_x, player_y, player_width, player_height)
-    new_player_rect_y = pygame.Rect(player_x, final_y, player_width, player_height)
-    
-    # Check for collisions in X direction
-    for obstacle in obstacles:
-        obstacle_rect = pygame.Rect(*obstacle)
-        if new_player_rect_x.colliderect(obstacle_rect):
-            collided_x = True
-            if velocity_x > 0:
-                final_x = obstacle_rect.left - player_width
-            elif velocity_x < 0:
-                final_x = obstacle_rect.right
-    
-    # Check for collisions in Y direction
-    for obstacle in obstacles:
-        obstacle_rect = pygame.Rect(*obstacle)
-        if new_player_rect_y.colliderect(obstacle_rect):
-            collided_y = True
-            if velocity_y > 0:
-                final_y = obstacle_rect.top - player_height
-            elif velocity_y < 0:
-                final_y = obstacle_rect.bottom
-    
-    return final_x, final_y, collided_x, collided_y
+    new_x, new_y, _, _, normal_x, normal_y, _ = move_and_slide(
+        player_x, player_y, player_width, player_height, velocity_x, velocity_y, obstacles)
+    return new_x, new_y, normal_x != 0, normal_y != 0
+
+def sweep_batch(x, y, width, height, velocity_x, velocity_y, obstacles, max_iterations=3):
+    """
+    Move many boxes at once with move_and_slide semantics
+    
+    Args:
+        x, y, width, height: Sequences (or arrays) of mover boxes
+        velocity_x, velocity_y: Sequences (or arrays) of displacements
+        obstacles: List of obstacle rects or a spatial index of them
+        max_iterations: Number of surfaces a mover may hit in one step
+    
+    Returns:
+        Tuple of arrays (new_x, new_y, velocity_x, velocity_y, normal_x,
+        normal_y, time_of_impact), as lists when NumPy isn't installed
+    """
+    obstacles = _as_obstacles(obstacles)
+    if np is None:
+        results = [move_and_slide(*mover, obstacles, max_iterations)
+                   for mover in zip(x, y, width, height, velocity_x, velocity_y)]
+        return tuple(list(column) for column in zip(*results)) if results else ([],) * 7
+    
+    x = np.array(x, dtype=np.float64)
+    y = np.array(y, dtype=np.float64)
+    width = np.asarray(width, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    velocity_x = np.array(velocity_x, dtype=np.float64)
+    velocity_y = np.array(velocity_y, dtype=np.float64)
+    count = len(x)
+    normal_x = np.zeros(count, dtype=np.int8)
+    normal_y = np.zeros(count, dtype=np.int8)
+    first_impact = np.ones(count)
+    if not count or len(obstacles) == 0:
+        return x + velocity_x, y + velocity_y, velocity_x, velocity_y, normal_x, normal_y, first_impact
+    
+    # Broadphase once; the slide stays inside the box swept by the full move
+    mover, rects = _broadphase_pairs(x, y, width, height, velocity_x, velocity_y, obstacles)
+    
+    remaining_x = velocity_x.copy()
+    remaining_y = velocity_y.copy()
+    elapsed = np.zeros(count)
+    if len(mover):
+        ox, oy, ow, oh = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+        
+        for _ in range(max_iterations):
+            toi, nx, ny = _swept_aabb_pairs(x[mover], y[mover], width[mover], height[mover],
+                                            remaining_x[mover], remaining_y[mover], ox, oy, ow, oh)
+            hits = np.flatnonzero(toi < 1.0)
+            if not len(hits):
+                x += remaining_x
+                y += remaining_y
+                break
+            
+            # Earliest hit per mover
+            order = hits[np.lexsort((toi[hits], mover[hits]))]
+            movers, first = np.unique(mover[order], return_index=True)
+            best = order[first]
+            time = toi[best]
+            
+            first_impact[movers] = np.where(first_impact[movers] == 1.0,
+                                            elapsed[movers] + (1.0 - elapsed[movers]) * time, first_impact[movers])
+            elapsed[movers] += (1.0 - elapsed[movers]) * time
+            
+            # Move up to the contact, snap onto the surface and slide
+            hit_x = nx[best] != 0
+            hit_y = ~hit_x
+            x[movers] += remaining_x[movers] * time
+            y[movers] += remaining_y[movers] * time
+            
+            m, b = movers[hit_x], best[hit_x]
+            x[m] = np.where(nx[b] < 0, ox[b] - width[m], ox[b] + ow[b])
+            normal_x[m] = nx[b]
+            remaining_y[m] *= 1.0 - time[hit_x]
+            remaining_x[m] = 0
+            velocity_x[m] = 0
+            
+            m, b = movers[hit_y], best[hit_y]
+            y[m] = np.where(ny[b] < 0, oy[b] - height[m], oy[b] + oh[b])
+            normal_y[m] = ny[b]
+            remaining_x[m] *= 1.0 - time[hit_y]
+            remaining_y[m] = 0
+            velocity_y[m] = 0
+            
+            # Movers that hit nothing this round finish their motion
+            free = np.ones(count, dtype=bool)
+            free[movers] = False
+            x[free] += remaining_x[free]
+            y[free] += remaining_y[free]
+            remaining_x[free] = 0
+            remaining_y[free] = 0
+    else:
+        x += remaining_x
+        y += remaining_y
+    return x, y, velocity_x, velocity_y, normal_x, normal_y, first_impact
+
+# Up to this many obstacles are tested against every mover without a spatial query
+BATCH_ALL_PAIRS_LIMIT = 64
+
+def _broadphase_pairs(x, y, width, height, velocity_x, velocity_y, obstacles):
+    """
+    Find the (mover, obstacle) pairs whose swept box and obstacle overlap
+    
+    Returns:
+        Tuple of (mover index array, (n, 4) array of obstacle rects)
+    """
+    left = np.minimum(x, x + velocity_x) - 1
+    top = np.minimum(y, y + velocity_y) - 1
+    right = left + width + np.abs(velocity_x) + 2
+    bottom = top + height + np.abs(velocity_y) + 2
+    moving = np.flatnonzero((velocity_x != 0) | (velocity_y != 0))
+    
+    if len(obstacles) <= BATCH_ALL_PAIRS_LIMIT:
+        # Few obstacles: test every pair at once
+        rects = np.array([tuple(rect) for rect in obstacles], dtype=np.float64).reshape(-1, 4)
+        near = ((left[moving, None] < rects[None, :, 0] + rects[None, :, 2]) &
+                (right[moving, None] > rects[None, :, 0]) &
+                (top[moving, None] < rects[None, :, 1] + rects[None, :, 3]) &
+                (bottom[moving, None] > rects[None, :, 1]))
+        movers, obstacle_indices = np.nonzero(near)
+        return moving[movers], rects[obstacle_indices]
+    
+    pair_mover = []
+    pair_rects = []
+    for i, mx, my, mw, mh in zip(moving.tolist(), left[moving].tolist(), top[moving].tolist(),
+                                 (right - left)[moving].tolist(), (bottom - top)[moving].tolist()):
+        candidates = _nearby_obstacles(obstacles, mx, my, mw, mh)
+        pair_mover.extend([i] * len(candidates))
+        pair_rects.extend(tuple(rect) for rect in candidates)
+    return np.array(pair_mover, dtype=np.intp), np.array(pair_rects, dtype=np.float64).reshape(-1, 4)
+
+def _swept_aabb_pairs(x, y, width, height, velocity_x, velocity_y, ox, oy, ow, oh):
+    """Vectorized swept_aabb over arrays of (mover, obstacle) pairs"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entry_x = np.where(velocity_x > 0, (ox - (x + width)) / velocity_x, (ox + ow - x) / velocity_x)
+        exit_x = np.where(velocity_x > 0, (ox + ow - x) / velocity_x, (ox - (x + width)) / velocity_x)
+        entry_y = np.where(velocity_y > 0, (oy - (y + height)) / velocity_y, (oy + oh - y) / velocity_y)
+        exit_y = np.where(velocity_y > 0, (oy + oh - y) / velocity_y, (oy - (y + height)) / velocity_y)
+    
+    # Not moving on an axis: always inside its slab if overlapping, never otherwise
+    still_x = velocity_x == 0
+    overlap_x = (x < ox + ow) & (x + width > ox)
+    entry_x = np.where(still_x, np.where(overlap_x, -np.inf, np.inf), entry_x)
+    exit_x = np.where(still_x, np.inf, exit_x)
+    still_y = velocity_y == 0
+    overlap_y = (y < oy + oh) & (y + height > oy)
+    entry_y = np.where(still_y, np.where(overlap_y, -np.inf, np.inf), entry_y)
+    exit_y = np.where(still_y, np.inf, exit_y)
+    
+    entry = np.maximum(entry_x, entry_y)
+    hit = (entry >= 0) & (entry < 1) & (entry < np.minimum(exit_x, exit_y))
+    toi = np.where(hit, entry, 1.0)
+    along_x = hit & (entry_x > entry_y)
+    along_y = hit & ~along_x
+    normal_x = np.where(along_x, np.where(velocity_x > 0, -1, 1), 0).astype(np.int8)
+    normal_y = np.where(along_y, np.where(velocity_y > 0, -1, 1), 0).astype(np.int8)
+    return toi, normal_x, normal_y
 
 def check_on_ground(player_x, player_y, player_width, player_height, obstacles, check_distance=1.0):
     """
@@ -64,14 +362,16 @@ def check_on_ground(player_x, player_y, player_width, player_height, obstacles,
     Args:
         player_x, player_y: Player position
         player_width, player_height: Player dimensions
-        obstacles: List of obstacle rects as (x, y, width, height) tuples
+        obstacles: List of obstacle rects as (x, y, width, height) tuples,
+            or a spatial index of obstacle rects
         check_distance: Distance to check below player
     
     Returns:
         Boolean indicating if player is on the ground
     """
     # If there are no obstacles, player can't be on ground
-    if not obstacles:
+    obstacles = _as_obstacles(obstacles)
+    if len(obstacles) == 0:
         return False
         
     ground_check_rect = pygame.Rect(
@@ -79,9 +379,48 @@ def check_on_ground(player_x, player_y, player_width, player_height, obstacles,
         player_width, check_distance
     )
     
-    for obstacle in obstacles:
-        obstacle_rect = pygame.Rect(*obstacle)
-        if ground_check_rect.colliderect(obstacle_rect):
-            return True
+    obstacles = _nearby_obstacles(
+        obstacles,
+        ground_check_rect.x, ground_check_rect.y,
+        ground_check_rect.width, ground_check_rect.height
+    )
+    
+    return ground_check_rect.collidelist(obstacles) != -1
+
+def overlap_pairs(a, b):
+    """
+    Get every overlapping pair between two collections of rects
+    
+    Rects overlap the way pygame.Rect.colliderect decides.
     
-    return False
+    Args:
+        a, b: Buffer-protocol arrays with 4 values (x, y, width, height) per
+            rect, such as NumPy arrays of shape (n, 4), or sequences of rects
+    
+    Returns:
+        Tuple of (indices into a, indices into b), sorted by a then b
+    """
+    first, second = batch_collision.overlap_pairs(_as_rect_rows(a), _as_rect_rows(b))
+    if np is not None and isinstance(first, np.ndarray):
+        return first.tolist(), second.tolist()
+    return list(first), list(second)
+
+def _as_rect_rows(rects):
+    """View flat buffer-protocol arrays as rows of 4 for the Python path"""
+    if np is not None and not isinstance(rects, (list, tuple)):
+        try:
+            return np.asarray(memoryview(rects)).reshape(-1, 4)
+        except TypeError:
+            pass
+    return rects
+
+# The pure Python versions, kept for comparison with the extension
+python_move_and_slide = move_and_slide
+python_check_on_ground = check_on_ground
+python_overlap_pairs = overlap_pairs
+
+if _physics is not None:
+    move_and_slide = _physics.move_and_slide
+    sweep_test = _physics.sweep_test
+    check_on_ground = _physics.check_on_ground
+    overlap_pairs = _physics.overlap_pairs
@@ -2,12 +2,25 @@ import pygame
 import math
 
 class Projectile:
+    # Plain projectile images by owner, shared by all instances
+    _images = {}
+    
     def __init__(self, x, y, direction, speed=8, damage=10, owner="player", lifetime=180):
-        self.image = pygame.Surface((10, 5))
-        self.image.fill((255, 255, 0) if owner == "player" else (0, 0, 255))
+        self.reset(x, y, direction, speed, damage, owner, lifetime)
+    
+    def reset(self, x, y, direction, speed=8, damage=10, owner="player", lifetime=180):
+        """(Re)initialize the projectile; lets pooled projectiles be reused"""
+        self.image = Projectile._images.get(owner)
+        if self.image is None:
+            self.image = pygame.Surface((10, 5))
+            self.image.fill((255, 255, 0) if owner == "player" else (0, 0, 255))
+            Projectile._images[owner] = self.image
+        self.rotated_image = None
+        self.rotated_source = None
         
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        self.alive = True
         
         # Convert direction to radians if it's in degrees
         if isinstance(direction, (int, float)):
@@ -39,16 +52,22 @@ class Projectile:
         proj_rect.x -= camera_offset[0]
         proj_rect.y -= camera_offset[1]
         
-        # Rotate image to match direction
-        angle = math.degrees(self.direction_rad)
-        rotated_image = pygame.transform.rotate(self.image, -angle)
-        rotated_rect = rotated_image.get_rect(center=proj_rect.center)
+        # Rotate image to match direction (once, the direction never changes)
+        if self.rotated_source is not self.image:
+            angle = math.degrees(self.direction_rad)
+            self.rotated_image = pygame.transform.rotate(self.image, -angle)
+            self.rotated_source = self.image
+        rotated_rect = self.rotated_image.get_rect(center=proj_rect.center)
         
         # Draw projectile
-        screen.blit(rotated_image, rotated_rect.topleft)
+        screen.blit(self.rotated_image, rotated_rect.topleft)
+    
+    def kill(self):
+        """Mark the projectile for removal (e.g. after a hit)"""
+        self.alive = False
     
     def is_expired(self):
-        return self.lifetime <= 0
+        return not self.alive or self.lifetime <= 0
 
 class ChargedProjectile(Projectile):
     def __init__(self, x, y, direction, charge_level=1.0, **kwargs):
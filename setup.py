@@ -1,6 +1,25 @@
 """
-This file is kept for reference but is no longer used
-since we've removed the C/C++ extensions.
+Build the compiled extensions in place:
+
+    python setup.py build_ext --inplace
+
+The game runs without them; physics_wrapper falls back to its pure Python
+collision routines when the physics module can't be imported, and
+graphics.post_effects to NumPy when shaders can't.
 """
-# The game now uses a pure Python implementation
-# This file can be safely removed
+import sys
+from setuptools import setup, Extension
+
+# MSVC optimizes release builds already
+compile_args = [] if sys.platform == "win32" else ["-O2"]
+
+setup(
+    name="platformer-extensions",
+    version="1.0",
+    description="Compiled helpers for the platformer",
+    py_modules=[],
+    ext_modules=[
+        Extension("physics", sources=["physics.c"], extra_compile_args=compile_args),
+        Extension("shaders", sources=["shaders.c"], extra_compile_args=compile_args),
+    ],
+)
@@ -1,131 +1,353 @@
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <math.h>
+#include <stdint.h>
+#include <string.h>
 
-// Apply a simple screen shake effect
-static PyObject* apply_screen_shake(PyObject* self, PyObject* args) {
-    PyObject* surface;
-    int amplitude;
-    int frame;
-    
-    if (!PyArg_ParseTuple(args, "Oii", &surface, &amplitude, &frame)) {
-        return NULL;
-    }
-    
-    // Get surface info using pygame's C API
+/*
+ * Full-screen pixel effects applied in place on a pygame Surface
+ *
+ * Every effect works directly on the surface's pixel buffer (through
+ * Surface.get_buffer() and the buffer protocol) in one pass, without
+ * allocating surfaces or calling back into Python per pixel. Only 32-bit
+ * surfaces are supported; graphics.post_effects falls back to NumPy for
+ * the rest, and when this module isn't built.
+ */
+
+// Locked pixel buffer of a 32-bit surface
+typedef struct {
+    PyObject* proxy;  // BufferProxy keeping the surface locked
+    Py_buffer view;
+    uint8_t* pixels;
+    Py_ssize_t pitch;
     int width, height;
-    if (!PyObject_HasAttrString(surface, "get_size")) {
-        PyErr_SetString(PyExc_TypeError, "First argument must be a pygame Surface");
-        return NULL;
+    int shifts[4];  // r, g, b, a
+    uint32_t alpha_mask;
+} Pixels;
+
+// Read a 4-tuple of integers returned by a surface method
+static int get_int4(PyObject* surface, const char* method, long values[4]) {
+    PyObject* result = PyObject_CallMethod(surface, method, NULL);
+    if (!result) {
+        return -1;
+    }
+    int status = PyArg_ParseTuple(result, "llll", &values[0], &values[1], &values[2], &values[3]) ? 0 : -1;
+    Py_DECREF(result);
+    return status;
+}
+
+// Call a surface method returning an integer
+static long get_long(PyObject* surface, const char* method) {
+    PyObject* result = PyObject_CallMethod(surface, method, NULL);
+    if (!result) {
+        return -1;
     }
-    
+    long value = PyLong_AsLong(result);
+    Py_DECREF(result);
+    return value;
+}
+
+// Lock a surface and get writable access to its pixels
+static int lock_pixels(PyObject* surface, Pixels* pixels) {
+    memset(pixels, 0, sizeof(Pixels));
+
+    long bitsize = get_long(surface, "get_bitsize");
+    if (bitsize < 0) {
+        return -1;
+    }
+    if (bitsize != 32) {
+        PyErr_SetString(PyExc_ValueError, "Effects need a 32-bit surface");
+        return -1;
+    }
+
     PyObject* size_tuple = PyObject_CallMethod(surface, "get_size", NULL);
     if (!size_tuple) {
-        return NULL;
+        return -1;
     }
-    
-    width = PyLong_AsLong(PyTuple_GetItem(size_tuple, 0));
-    height = PyLong_AsLong(PyTuple_GetItem(size_tuple, 1));
+    int ok = PyArg_ParseTuple(size_tuple, "ii", &pixels->width, &pixels->height);
     Py_DECREF(size_tuple);
-    
-    // Create a new surface to hold the result
-    PyObject* pygame_module = PyImport_ImportModule("pygame");
-    if (!pygame_module) {
-        return NULL;
+    if (!ok) {
+        return -1;
+    }
+
+    long shifts[4], masks[4];
+    if (get_int4(surface, "get_shifts", shifts) < 0 || get_int4(surface, "get_masks", masks) < 0) {
+        return -1;
+    }
+    for (int i = 0; i < 4; i++) {
+        pixels->shifts[i] = (int)shifts[i];
+    }
+    pixels->alpha_mask = (uint32_t)masks[3];
+
+    pixels->pitch = get_long(surface, "get_pitch");
+    if (pixels->pitch < 0) {
+        return -1;
+    }
+
+    pixels->proxy = PyObject_CallMethod(surface, "get_buffer", NULL);
+    if (!pixels->proxy) {
+        return -1;
+    }
+    if (PyObject_GetBuffer(pixels->proxy, &pixels->view, PyBUF_WRITABLE) < 0) {
+        Py_CLEAR(pixels->proxy);
+        return -1;
+    }
+    if (pixels->view.len < pixels->pitch * pixels->height) {
+        PyErr_SetString(PyExc_ValueError, "Surface buffer is smaller than its size");
+        PyBuffer_Release(&pixels->view);
+        Py_CLEAR(pixels->proxy);
+        return -1;
+    }
+    pixels->pixels = (uint8_t*)pixels->view.buf;
+    return 0;
+}
+
+// Release the pixel buffer, unlocking the surface
+static void unlock_pixels(Pixels* pixels) {
+    if (pixels->proxy) {
+        PyBuffer_Release(&pixels->view);
+        Py_CLEAR(pixels->proxy);
+    }
+}
+
+static inline uint32_t* pixel_row(const Pixels* pixels, int y) {
+    return (uint32_t*)(pixels->pixels + y * pixels->pitch);
+}
+
+// Shift a row of pixels sideways in place, filling the exposed end with a pixel value
+static void shift_row(uint32_t* row, int width, int offset, uint32_t fill) {
+    if (offset >= width || -offset >= width) {
+        for (int x = 0; x < width; x++) {
+            row[x] = fill;
+        }
+    } else if (offset > 0) {
+        memmove(row + offset, row, (size_t)(width - offset) * sizeof(uint32_t));
+        for (int x = 0; x < offset; x++) {
+            row[x] = fill;
+        }
+    } else if (offset < 0) {
+        memmove(row, row - offset, (size_t)(width + offset) * sizeof(uint32_t));
+        for (int x = width + offset; x < width; x++) {
+            row[x] = fill;
+        }
     }
-    
-    PyObject* new_surface = PyObject_CallMethod(pygame_module, "Surface", "(ii)", width, height);
-    Py_DECREF(pygame_module);
-    
-    if (!new_surface) {
+}
+
+// Shake the surface in place: move its contents by an offset and clear the exposed edges to black
+static PyObject* apply_screen_shake(PyObject* self, PyObject* args) {
+    PyObject* surface;
+    int amplitude;
+    int frame;
+
+    if (!PyArg_ParseTuple(args, "Oii", &surface, &amplitude, &frame)) {
         return NULL;
     }
-    
+
     // Calculate shake offset
     int offset_x = (int)(sin(frame * 0.5) * amplitude);
     int offset_y = (int)(cos(frame * 0.7) * amplitude);
-    
-    // Apply the shake by blitting the source surface with an offset
-    PyObject* result = PyObject_CallMethod(new_surface, "blit", "O(ii)", surface, offset_x, offset_y);
-    if (!result) {
-        Py_DECREF(new_surface);
+
+    Pixels pixels;
+    if (lock_pixels(surface, &pixels) < 0) {
         return NULL;
     }
-    Py_DECREF(result);
-    
-    return new_surface;
+
+    int width = pixels.width, height = pixels.height;
+    uint32_t black = pixels.alpha_mask;
+
+    // Rows move down when the offset is positive, so copy from the bottom up
+    int start = offset_y > 0 ? height - 1 : 0;
+    int step = offset_y > 0 ? -1 : 1;
+    for (int y = start; y >= 0 && y < height; y += step) {
+        uint32_t* row = pixel_row(&pixels, y);
+        int source_y = y - offset_y;
+        if (source_y < 0 || source_y >= height) {
+            shift_row(row, width, width, black);
+            continue;
+        }
+        if (source_y != y) {
+            memcpy(row, pixel_row(&pixels, source_y), (size_t)width * sizeof(uint32_t));
+        }
+        shift_row(row, width, offset_x, black);
+    }
+
+    unlock_pixels(&pixels);
+    Py_RETURN_NONE;
 }
 
-// Apply a simple wave distortion effect
+// Apply a horizontal wave distortion in place; exposed row ends repeat the edge pixel
 static PyObject* apply_wave_effect(PyObject* self, PyObject* args) {
     PyObject* surface;
     float time;
     float amplitude;
     float frequency;
-    
+
     if (!PyArg_ParseTuple(args, "Offf", &surface, &time, &amplitude, &frequency)) {
         return NULL;
     }
-    
-    // Get surface dimensions
-    PyObject* size_tuple = PyObject_CallMethod(surface, "get_size", NULL);
-    if (!size_tuple) {
+
+    Pixels pixels;
+    if (lock_pixels(surface, &pixels) < 0) {
         return NULL;
     }
-    
-    int width = PyLong_AsLong(PyTuple_GetItem(size_tuple, 0));
-    int height = PyLong_AsLong(PyTuple_GetItem(size_tuple, 1));
-    Py_DECREF(size_tuple);
-    
-    // Create new surface for the result
-    PyObject* pygame_module = PyImport_ImportModule("pygame");
-    if (!pygame_module) {
+
+    int width = pixels.width;
+    for (int y = 0; y < pixels.height && width > 0; y++) {
+        int offset = (int)(sin((double)time + y * (double)frequency) * amplitude);
+        uint32_t* row = pixel_row(&pixels, y);
+        shift_row(row, width, offset, offset > 0 ? row[0] : row[width - 1]);
+    }
+
+    unlock_pixels(&pixels);
+    Py_RETURN_NONE;
+}
+
+// Shift one 8-bit channel of a row sideways in place, repeating the edge value
+static void shift_channel(uint32_t* row, int width, int shift, int offset) {
+    uint32_t mask = (uint32_t)0xff << shift;
+    if (offset > 0) {
+        // Take values from the left: walk right to left so sources are read before being written
+        for (int x = width - 1; x >= 0; x--) {
+            int source = x - offset < 0 ? 0 : x - offset;
+            row[x] = (row[x] & ~mask) | (row[source] & mask);
+        }
+    } else if (offset < 0) {
+        for (int x = 0; x < width; x++) {
+            int source = x - offset >= width ? width - 1 : x - offset;
+            row[x] = (row[x] & ~mask) | (row[source] & mask);
+        }
+    }
+}
+
+// Split the red and blue channels apart in place (red moves left, blue right)
+static PyObject* apply_chromatic_offset(PyObject* self, PyObject* args) {
+    PyObject* surface;
+    int offset;
+
+    if (!PyArg_ParseTuple(args, "Oi", &surface, &offset)) {
         return NULL;
     }
-    
-    PyObject* surfarray_module = PyImport_ImportModule("pygame.surfarray");
-    if (!surfarray_module) {
-        Py_DECREF(pygame_module);
+
+    Pixels pixels;
+    if (lock_pixels(surface, &pixels) < 0) {
         return NULL;
     }
-    
-    PyObject* new_surface = PyObject_CallMethod(pygame_module, "Surface", "(ii)", width, height);
-    Py_DECREF(pygame_module);
-    
-    if (!new_surface) {
-        Py_DECREF(surfarray_module);
+
+    for (int y = 0; y < pixels.height; y++) {
+        uint32_t* row = pixel_row(&pixels, y);
+        shift_channel(row, pixels.width, pixels.shifts[0], -offset);
+        shift_channel(row, pixels.width, pixels.shifts[2], offset);
+    }
+
+    unlock_pixels(&pixels);
+    Py_RETURN_NONE;
+}
+
+// Blend every pixel towards a color in place (a lightning flash, damage tint, ...)
+static PyObject* apply_palette_flash(PyObject* self, PyObject* args) {
+    PyObject* surface;
+    int red, green, blue;
+    float strength;
+
+    if (!PyArg_ParseTuple(args, "O(iii)f", &surface, &red, &green, &blue, &strength)) {
         return NULL;
     }
-    
-    // Get array representation of surfaces
-    PyObject* src_array = PyObject_CallMethod(surfarray_module, "array3d", "O", surface);
-    PyObject* dst_array = PyObject_CallMethod(surfarray_module, "array3d", "O", new_surface);
-    Py_DECREF(surfarray_module);
-    
-    if (!src_array || !dst_array) {
-        Py_XDECREF(src_array);
-        Py_XDECREF(dst_array);
-        Py_DECREF(new_surface);
+
+    // Weight of the flash color out of 256
+    int weight = (int)(strength * 256);
+    weight = weight < 0 ? 0 : (weight > 256 ? 256 : weight);
+    if (weight == 0) {
+        Py_RETURN_NONE;
+    }
+
+    Pixels pixels;
+    if (lock_pixels(surface, &pixels) < 0) {
         return NULL;
     }
-    
-    // This is simplified - in a real implementation we would 
-    // directly manipulate the array data using the C API
-    // but for this example, we'll just return the original surface
-    
-    // Clean up
-    Py_DECREF(src_array);
-    Py_DECREF(dst_array);
-    
-    // For now just return the original surface (placeholder)
-    Py_INCREF(surface);
-    Py_DECREF(new_surface);
-    return surface;
+
+    // Blended value of every channel level, already shifted into place
+    int target[3] = {red & 0xff, green & 0xff, blue & 0xff};
+    uint32_t table[3][256];
+    uint32_t keep = 0xffffffffu;
+    for (int channel = 0; channel < 3; channel++) {
+        int shift = pixels.shifts[channel];
+        for (uint32_t value = 0; value < 256; value++) {
+            table[channel][value] = ((value * (256 - weight) + target[channel] * weight) >> 8) << shift;
+        }
+        keep &= ~((uint32_t)0xff << shift);
+    }
+
+    int red_shift = pixels.shifts[0], green_shift = pixels.shifts[1], blue_shift = pixels.shifts[2];
+    for (int y = 0; y < pixels.height; y++) {
+        uint32_t* row = pixel_row(&pixels, y);
+        for (int x = 0; x < pixels.width; x++) {
+            uint32_t pixel = row[x];
+            row[x] = (pixel & keep)
+                | table[0][(pixel >> red_shift) & 0xff]
+                | table[1][(pixel >> green_shift) & 0xff]
+                | table[2][(pixel >> blue_shift) & 0xff];
+        }
+    }
+
+    unlock_pixels(&pixels);
+    Py_RETURN_NONE;
+}
+
+// Darken the surface towards its corners in place
+static PyObject* apply_vignette(PyObject* self, PyObject* args) {
+    PyObject* surface;
+    float strength;
+    float radius;
+
+    if (!PyArg_ParseTuple(args, "Off", &surface, &strength, &radius)) {
+        return NULL;
+    }
+
+    Pixels pixels;
+    if (lock_pixels(surface, &pixels) < 0) {
+        return NULL;
+    }
+
+    // Squared distance from the center, 0 there and 1 in the corners
+    double center_x = pixels.width / 2.0, center_y = pixels.height / 2.0;
+    double corner = center_x * center_x + center_y * center_y;
+    double inner = (double)radius * radius;
+    double falloff = inner < 1.0 ? 1.0 - inner : 1.0;
+
+    for (int y = 0; y < pixels.height && corner > 0; y++) {
+        uint32_t* row = pixel_row(&pixels, y);
+        double dy = y + 0.5 - center_y;
+        for (int x = 0; x < pixels.width; x++) {
+            double dx = x + 0.5 - center_x;
+            double distance = (dx * dx + dy * dy) / corner;
+            if (distance <= inner) {
+                continue;
+            }
+            double amount = (distance - inner) / falloff;
+            int factor = (int)((1.0 - strength * (amount < 1.0 ? amount : 1.0)) * 256);
+            factor = factor < 0 ? 0 : factor;
+
+            uint32_t pixel = row[x];
+            for (int channel = 0; channel < 3; channel++) {
+                int shift = pixels.shifts[channel];
+                uint32_t value = (((pixel >> shift) & 0xff) * (uint32_t)factor) >> 8;
+                pixel = (pixel & ~((uint32_t)0xff << shift)) | (value << shift);
+            }
+            row[x] = pixel;
+        }
+    }
+
+    unlock_pixels(&pixels);
+    Py_RETURN_NONE;
 }
 
 // Module method table
 static PyMethodDef ShaderMethods[] = {
-    {"screen_shake", apply_screen_shake, METH_VARARGS, "Apply screen shake effect"},
-    {"wave_effect", apply_wave_effect, METH_VARARGS, "Apply wave distortion effect"},
+    {"screen_shake", apply_screen_shake, METH_VARARGS, "Apply screen shake effect in place"},
+    {"wave_effect", apply_wave_effect, METH_VARARGS, "Apply wave distortion effect in place"},
+    {"chromatic_offset", apply_chromatic_offset, METH_VARARGS, "Split the red and blue channels in place"},
+    {"palette_flash", apply_palette_flash, METH_VARARGS, "Blend every pixel towards a color in place"},
+    {"vignette", apply_vignette, METH_VARARGS, "Darken the corners in place"},
     {NULL, NULL, 0, NULL}  // Sentinel
 };
 
@@ -2,6 +2,7 @@ import pygame
 import json
 import os
 import time
+from graphics.text_cache import text_cache
 
 class Achievement:
     """Class representing a single achievement"""
@@ -143,12 +144,9 @@ class AchievementSystem:
             pygame.draw.rect(screen, (255, 215, 0), notification_rect, 2)  # Gold border
             
             # Draw achievement info
-            font_title = pygame.font.Font(None, 24)
-            font_desc = pygame.font.Font(None, 18)
-            
-            title_text = font_title.render(f"Achievement Unlocked!", True, (255, 255, 255))
-            name_text = font_title.render(achievement.name, True, (255, 215, 0))
-            desc_text = font_desc.render(achievement.description, True, (200, 200, 200))
+            title_text = text_cache.render("Achievement Unlocked!", 24, (255, 255, 255))
+            name_text = text_cache.render(achievement.name, 24, (255, 215, 0))
+            desc_text = text_cache.render(achievement.description, 18, (200, 200, 200))
             
             screen.blit(title_text, (x + 10, y + 10))
             screen.blit(name_text, (x + 10, y + 30))
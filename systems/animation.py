@@ -1,39 +1,112 @@
+import weakref
 import pygame
 
-class Animation:
+# Mirrored copies of source frames, shared by every animation and sprite
+# using the same surfaces. Entries go away with their source surface.
+_flipped_frames = weakref.WeakKeyDictionary()
+
+def get_flipped(image):
+    """
+    Get a horizontally mirrored copy of a surface
+    
+    The copy is made on first use and reused afterwards, so source frames
+    must not be drawn on once they have been flipped.
+    """
+    flipped = _flipped_frames.get(image)
+    if flipped is None:
+        flipped = pygame.transform.flip(image, True, False)
+        _flipped_frames[image] = flipped
+    return flipped
+
+class AnimationClip:
+    """
+    Immutable animation data: frames plus timing
+    
+    Clips are registered once per asset in the AssetManager and shared by
+    every entity that plays them; per-entity progress lives in
+    AnimationState.
+    """
+    __slots__ = ("frames", "frame_duration", "loop", "_flipped_frames")
+    
     def __init__(self, frames, frame_duration=5, loop=True):
         """
-        Initialize an animation
+        Initialize an animation clip
         
         Args:
-            frames: List of pygame surfaces for each animation frame
+            frames: Sequence of pygame surfaces for each animation frame
             frame_duration: Number of game ticks each frame should display
             loop: Whether the animation should loop
         """
-        self.frames = frames
+        self.frames = tuple(frames)
         self.frame_duration = frame_duration
         self.loop = loop
+        self._flipped_frames = None  # Built on first left-facing render
+    
+    @property
+    def flipped_frames(self):
+        """Horizontally mirrored frames, created on first use"""
+        if self._flipped_frames is None:
+            self._flipped_frames = tuple(get_flipped(frame) for frame in self.frames)
+        return self._flipped_frames
+
+class AnimationState:
+    """Playback position of one entity in a shared AnimationClip"""
+    __slots__ = ("clip", "current_frame_index", "timer", "finished")
+    
+    def __init__(self, clip):
+        """
+        Initialize playback of a clip
         
+        Args:
+            clip: AnimationClip to play
+        """
+        self.clip = clip
         self.current_frame_index = 0
         self.timer = 0
         self.finished = False
     
-    def update(self):
-        """Update the animation state"""
+    @property
+    def frames(self):
+        return self.clip.frames
+    
+    @property
+    def frame_duration(self):
+        return self.clip.frame_duration
+    
+    @property
+    def loop(self):
+        return self.clip.loop
+    
+    @property
+    def flipped_frames(self):
+        return self.clip.flipped_frames
+    
+    def update(self, ticks=1):
+        """
+        Update the animation state
+        
+        Args:
+            ticks: Number of game ticks to advance (more than one when the
+                owner is updated at a reduced rate)
+        """
         if self.finished:
             return
             
-        self.timer += 1
+        self.timer += ticks
         
-        if self.timer >= self.frame_duration:
-            self.timer = 0
-            self.current_frame_index += 1
+        clip = self.clip
+        duration = max(1, clip.frame_duration)
+        if self.timer >= duration:
+            self.current_frame_index += self.timer // duration
+            self.timer %= duration
             
-            if self.current_frame_index >= len(self.frames):
-                if self.loop:
-                    self.current_frame_index = 0
+            length = len(clip.frames)
+            if self.current_frame_index >= length:
+                if clip.loop:
+                    self.current_frame_index = self.current_frame_index % length if length else 0
                 else:
-                    self.current_frame_index = len(self.frames) - 1
+                    self.current_frame_index = length - 1
+                    self.timer = 0
                     self.finished = True
     
     def reset(self):
@@ -42,17 +115,43 @@ class Animation:
         self.timer = 0
         self.finished = False
     
-    def get_current_frame(self):
-        """Get the current frame of the animation"""
-        if not self.frames:
+    def get_current_frame(self, flipped=False):
+        """
+        Get the current frame of the animation
+        
+        Args:
+            flipped: Get the horizontally mirrored frame
+        """
+        clip = self.clip
+        if not clip.frames:
             return None  # Handle empty frames list
-        return self.frames[self.current_frame_index]
+        if flipped:
+            return clip.flipped_frames[self.current_frame_index]
+        return clip.frames[self.current_frame_index]
     
     def is_finished(self):
         """Check if a non-looping animation has finished"""
         return self.finished
 
+class Animation(AnimationState):
+    """Animation with its own clip, for one-off frame lists"""
+    __slots__ = ()
+    
+    def __init__(self, frames, frame_duration=5, loop=True):
+        """
+        Initialize an animation
+        
+        Args:
+            frames: List of pygame surfaces for each animation frame
+            frame_duration: Number of game ticks each frame should display
+            loop: Whether the animation should loop
+        """
+        super().__init__(AnimationClip(frames, frame_duration, loop))
+
 class AnimatedSprite:
+    # Cleared by the culling stage while the sprite is outside the view
+    on_screen = True
+
     def __init__(self, x, y):
         """Base class for objects with animations"""
         self.animations = {}
@@ -61,8 +160,10 @@ class AnimatedSprite:
         self.facing_right = True
     
     def add_animation(self, name, animation):
-        """Add an animation to this sprite"""
-        if not isinstance(animation, Animation):
+        """Add an animation (AnimationState or shared AnimationClip) to this sprite"""
+        if isinstance(animation, AnimationClip):
+            animation = AnimationState(animation)
+        elif not isinstance(animation, AnimationState):
             raise TypeError("Expected Animation object, got " + str(type(animation)))
             
         self.animations[name] = animation
@@ -79,19 +180,16 @@ class AnimatedSprite:
                 self.current_animation = name
                 self.animations[name].reset()
     
-    def update_animation(self):
-        """Update the current animation"""
+    def update_animation(self, ticks=1):
+        """Advance the current animation by a number of ticks (paused while off-screen)"""
+        if not self.on_screen:
+            return
         if self.current_animation and self.current_animation in self.animations:
-            self.animations[self.current_animation].update()
+            self.animations[self.current_animation].update(ticks)
     
     def get_current_frame(self):
         """Get the current animation frame"""
         if self.current_animation and self.current_animation in self.animations:
-            image = self.animations[self.current_animation].get_current_frame()
-            
-            # Flip the image if facing left
-            if image and not self.facing_right:
-                image = pygame.transform.flip(image, True, False)
-            
-            return image
+            # Mirrored frames are cached, so facing left costs nothing extra
+            return self.animations[self.current_animation].get_current_frame(flipped=not self.facing_right)
         return None
@@ -0,0 +1,150 @@
+"""
+Background loading of level areas with an LRU of resident areas
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AreaStreamer:
+    """
+    Loads areas on a worker thread ahead of time and keeps recent ones resident
+
+    The loader callable builds a complete area (geometry, collision index,
+    assets) without touching shared game state, so it can run on the
+    worker thread. Finished loads are only moved into the resident cache by
+    poll(), on the main thread, so the cache needs no locking.
+
+    Resident areas are kept in least-recently-used order and evicted when
+    there are more than max_resident of them or their estimated size goes
+    over memory_budget bytes. Pinned areas (the current one) are never
+    evicted.
+    """
+    def __init__(self, loader, max_resident=4, memory_budget=16 * 1024 * 1024, workers=1):
+        """
+        Initialize the streamer
+
+        Args:
+            loader: Callable loader(name) returning an area; areas may have an
+                `nbytes` attribute with their estimated memory use
+            max_resident: Maximum number of areas kept loaded
+            memory_budget: Maximum estimated bytes of loaded areas
+            workers: Number of loader threads
+        """
+        self.loader = loader
+        self.max_resident = max(1, max_resident)
+        self.memory_budget = memory_budget
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="area-loader")
+        self.resident = OrderedDict()  # name -> area, least recently used first
+        self.pending = {}  # name -> Future
+        self.pinned = set()
+
+        # Statistics
+        self.hits = 0  # Areas that were resident when needed
+        self.waits = 0  # Areas still loading when needed
+        self.misses = 0  # Areas loaded synchronously
+        self.evictions = 0
+
+    def request(self, name):
+        """Start loading an area in the background unless it's loaded or loading"""
+        if name in self.resident or name in self.pending:
+            return
+        self.pending[name] = self.executor.submit(self.loader, name)
+
+    def poll(self):
+        """Move finished background loads into the resident cache; call once per frame"""
+        if not self.pending:
+            return
+        for name, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[name]
+                try:
+                    self._store(name, future.result())
+                except Exception as e:
+                    logger.error(f"Failed to load area {name}: {e}")
+
+    def get(self, name):
+        """
+        Get an area, loading it now if it hasn't been streamed in
+
+        Returns:
+            The loaded area
+        """
+        area = self.resident.get(name)
+        if area is not None:
+            self.hits += 1
+            self.resident.move_to_end(name)
+            return area
+
+        future = self.pending.pop(name, None)
+        if future is not None:
+            self.waits += 1
+            area = future.result()
+        else:
+            self.misses += 1
+            area = self.loader(name)
+
+        self._store(name, area)
+        return area
+
+    def is_resident(self, name):
+        """Check whether an area is loaded"""
+        return name in self.resident
+
+    def pin(self, name):
+        """Keep an area loaded until it is unpinned"""
+        self.pinned.add(name)
+
+    def unpin(self, name):
+        """Allow an area to be evicted again"""
+        self.pinned.discard(name)
+        self._evict()
+
+    def memory_used(self):
+        """Get the estimated size of the resident areas in bytes"""
+        return sum(getattr(area, "nbytes", 0) for area in self.resident.values())
+
+    def _store(self, name, area):
+        """Add an area to the resident cache as most recently used"""
+        self.resident[name] = area
+        self.resident.move_to_end(name)
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used areas until the cache fits its limits"""
+        used = self.memory_used()
+        for name in list(self.resident):
+            if len(self.resident) <= self.max_resident and used <= self.memory_budget:
+                break
+            if name in self.pinned:
+                continue
+            area = self.resident.pop(name)
+            used -= getattr(area, "nbytes", 0)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every resident area that isn't pinned"""
+        for name in list(self.resident):
+            if name not in self.pinned:
+                del self.resident[name]
+
+    def shutdown(self):
+        """Stop the loader threads"""
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+
+    def get_stats(self):
+        """Get cache statistics"""
+        return {
+            "resident": len(self.resident),
+            "pending": len(self.pending),
+            "memory": self.memory_used(),
+            "hits": self.hits,
+            "waits": self.waits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,104 @@
+"""
+Batched AABB overlap pairs: many boxes against many boxes in one call
+
+Boxes are (x, y, width, height) rows and overlap the way pygame.Rect
+colliderect does: edges that only touch don't count, and empty boxes never
+overlap. When both sides are large (or already arrays) and NumPy is
+installed, the tests run as vectorized interval comparisons. Otherwise the
+query loops over the smaller side with pygame.Rect.collidelistall, which is
+faster than building arrays for a handful of boxes.
+"""
+from itertools import chain
+
+import pygame
+
+# Vectorized queries need NumPy; the fallback loops over pygame rects
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Largest number of (a, b) comparisons done in one vectorized block
+BLOCK_SIZE = 1 << 20
+
+# Queries are vectorized when both sides have at least this many boxes
+VECTOR_MIN_ROWS = 16
+
+def to_array(rects):
+    """
+    Convert rects to an (n, 4) integer array of x, y, width, height
+
+    Args:
+        rects: pygame.Rect objects, 4-tuples, objects with a rect
+            attribute, or an existing array
+
+    Returns:
+        NumPy array
+    """
+    if isinstance(rects, np.ndarray):
+        return rects.reshape(-1, 4)
+    rects = [getattr(rect, "rect", rect) for rect in rects]
+    # Values are truncated to integers like pygame.Rect does
+    return np.fromiter(chain.from_iterable(rects), dtype=np.int64, count=len(rects) * 4).reshape(-1, 4)
+
+def _rect_list(rects):
+    """Get rects in a form collidelistall accepts"""
+    if np is not None and isinstance(rects, np.ndarray):
+        return rects.reshape(-1, 4).tolist()
+    return [getattr(rect, "rect", rect) for rect in rects]
+
+def _use_vectors(a, b):
+    """Whether a query is big enough (or already in array form) to vectorize"""
+    if np is None:
+        return False
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return True
+    return min(len(a), len(b)) >= VECTOR_MIN_ROWS
+
+def _rect_pairs(a, b):
+    """Overlapping (i, j) pairs, sorted, found with pygame over the smaller side"""
+    a = _rect_list(a)
+    b = _rect_list(b)
+    if len(a) <= len(b):
+        return [(i, j) for i, rect in enumerate(a) for j in pygame.Rect(rect).collidelistall(b)]
+    return sorted((i, j) for j, rect in enumerate(b) for i in pygame.Rect(rect).collidelistall(a))
+
+def _blocks(count_a, count_b):
+    """Split the rows of a into slices that keep each block under BLOCK_SIZE comparisons"""
+    rows = max(1, BLOCK_SIZE // max(1, count_b))
+    for start in range(0, count_a, rows):
+        yield slice(start, min(count_a, start + rows))
+
+def _block_mask(a, b):
+    """Overlap mask of every row of a against every row of b"""
+    left = a[:, 0:1]
+    top = a[:, 1:2]
+    mask = ((left < b[:, 0] + b[:, 2]) & (left + a[:, 2:3] > b[:, 0]) &
+            (top < b[:, 1] + b[:, 3]) & (top + a[:, 3:4] > b[:, 1]))
+    mask &= (a[:, 2:3] > 0) & (a[:, 3:4] > 0)
+    mask &= (b[:, 2] > 0) & (b[:, 3] > 0)
+    return mask
+
+def overlap_pairs(a, b):
+    """
+    Get every overlapping (a, b) pair
+
+    Returns:
+        Tuple of (indices into a, indices into b), sorted by a then b;
+        arrays, or lists for small queries
+    """
+    if not _use_vectors(a, b):
+        pairs = _rect_pairs(a, b)
+        return [i for i, _ in pairs], [j for _, j in pairs]
+    a = to_array(a)
+    b = to_array(b)
+    if not len(a) or not len(b):
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    found_a = []
+    found_b = []
+    for block in _blocks(len(a), len(b)):
+        rows, columns = np.nonzero(_block_mask(a[block], b))
+        found_a.append(rows + block.start)
+        found_b.append(columns)
+    return np.concatenate(found_a), np.concatenate(found_b)
@@ -30,6 +30,20 @@ class Camera:
         """
         return (self.offset_x, self.offset_y)
     
+    def get_view_rect(self, margin=0):
+        """
+        Get the area of the world the camera shows, in world coordinates
+        
+        Args:
+            margin: Extra pixels added on every side
+        """
+        return pygame.Rect(
+            self.offset_x - margin,
+            self.offset_y - margin,
+            self.width + margin * 2,
+            self.height + margin * 2
+        )
+    
     def apply(self, entity):
         """
         Apply camera offset to an entity for rendering
@@ -1,12 +1,14 @@
 import pygame
 import random
-from graphics.particles import ParticleEffect, create_blood_splash, create_spark_burst
+from graphics.text_cache import text_cache
+from systems.entity_pool import EntityPool
 
 class CombatManager:
     """Handles combat interactions between player and enemies"""
-    def __init__(self, particle_system=None, sound_manager=None):
+    def __init__(self, particle_system=None, sound_manager=None, broadphase=None):
         self.particle_system = particle_system
         self.sound_manager = sound_manager
+        self.broadphase = broadphase  # Optional SweepAndPrune to find targets in
         
         # Combat stats
         self.combo_counter = 0
@@ -25,6 +27,7 @@ class CombatManager:
         
         # Visual effects
         self.hit_effects = []
+        self.damage_number_pool = EntityPool(DamageNumber)
         self.critical_hit_chance = 0.1  # 10% chance for critical hit
         self.critical_hit_multiplier = 2.0
         self.hit_stop_frames = 3  # Frames to freeze on hit for impact
@@ -43,9 +46,22 @@ class CombatManager:
             self.hit_stop_timer -= 1
     
     def process_attack(self, attacker, targets, attack_type="normal"):
-        """Process an attack from attacker to targets"""
+        """
+        Process an attack from attacker to targets
+        
+        Args:
+            attacker: Entity with an attack_rect and attack_damage
+            targets: List of possible targets, or the name of a broadphase
+                group to take the targets overlapping the attack_rect from
+            attack_type: "normal", "heavy" or "dash"
+        """
         hits = []
         
+        if isinstance(targets, str):
+            if self.broadphase is None or not hasattr(attacker, 'attack_rect'):
+                return hits
+            targets = self.broadphase.query(attacker.attack_rect, targets)
+        
         for target in targets:
             # Check if attack hits
             if self._check_hit(attacker, target, attack_type):
@@ -119,12 +135,12 @@ class CombatManager:
         
         # Create blood particles for organic targets
         if hasattr(target, 'is_organic') and target.is_organic:
-            self.particle_system.add_particles(create_blood_splash(hit_x, hit_y))
+            self.particle_system.emit("blood", hit_x, hit_y, 8)
         else:
-            self.particle_system.add_particles(create_spark_burst(hit_x, hit_y))
+            self.particle_system.emit("spark", hit_x, hit_y, 15)
         
         # Create damage number effect
-        self.hit_effects.append(DamageNumber(hit_x, hit_y, damage))
+        self.hit_effects.append(self.damage_number_pool.acquire(hit_x, hit_y, damage))
         
         # Play sound effect
         if self.sound_manager:
@@ -141,17 +157,14 @@ class CombatManager:
     
     def render(self, screen, camera_offset):
         """Render combat effects (damage numbers, combo counter)"""
-        # Render damage numbers
-        for effect in self.hit_effects[:]:
+        # Render damage numbers, then drop finished ones in one pass
+        for effect in self.hit_effects:
             effect.update()
             effect.render(screen, camera_offset)
-            
-            if effect.is_expired():
-                self.hit_effects.remove(effect)
+        self.hit_effects = self.damage_number_pool.compact(self.hit_effects)
         
         # Render combo counter if active
         if self.combo_counter > 1:
-            font = pygame.font.Font(None, 36)
             combo_text = f"{self.combo_counter} HITS!"
             
             # Calculate size and scale based on recent hits
@@ -165,7 +178,7 @@ class CombatManager:
             if self.combo_counter >= 30:
                 text_color = (255, 0, 0)    # Red for 30+ combos
             
-            combo_surface = font.render(combo_text, True, text_color)
+            combo_surface = text_cache.render(combo_text, 36, text_color)
             scaled_width = int(combo_surface.get_width() * scale)
             scaled_height = int(combo_surface.get_height() * scale)
             scaled_surface = pygame.transform.scale(combo_surface, (scaled_width, scaled_height))
@@ -175,6 +188,11 @@ class CombatManager:
 class DamageNumber:
     """Floating damage number effect"""
     def __init__(self, x, y, damage, color=None):
+        self.text = None
+        self.reset(x, y, damage, color)
+    
+    def reset(self, x, y, damage, color=None):
+        """(Re)initialize the effect; lets pooled damage numbers be reused"""
         self.x = x
         self.y = y
         self.damage = damage
@@ -190,7 +208,11 @@ class DamageNumber:
             self.size = 18
             self.color = color or (255, 255, 255)  # White for normal
         
-        self.font = pygame.font.Font(None, self.size)
+        # Rendered once; copied because the alpha is changed while fading
+        text_key = (damage, self.size, self.color)
+        if self.text is None or self.text_key != text_key:
+            self.text = text_cache.render(str(damage), self.size, self.color).copy()
+            self.text_key = text_key
     
     def update(self):
         """Update position and fade"""
@@ -204,7 +226,7 @@ class DamageNumber:
         if self.alpha <= 0:
             return
         
-        text = self.font.render(str(self.damage), True, self.color)
+        text = self.text
         
         # Apply alpha
         text.set_alpha(self.alpha)
@@ -141,3 +141,46 @@ class Controller:
         """Check if a mouse button was just released this frame"""
         return (not self.mouse_buttons.get(button, False) and 
                 self.previous_mouse_buttons.get(button, False))
+
+class ScriptedController(Controller):
+    """
+    Controller that replays a scripted input sequence instead of reading
+    hardware, for benchmarks and automated runs
+    """
+    def __init__(self, script, loop=True):
+        """
+        Initialize the scripted controller
+        
+        Args:
+            script: List of (ticks, pressed_keys) steps, where pressed_keys
+                is a collection of key names ('left', 'jump', ...) held
+                for that many updates
+            loop: Restart the script when it runs out
+        """
+        self.script = script
+        self.loop = loop
+        self.step_index = 0
+        self.step_ticks = 0
+        super().__init__()
+    
+    def _initialize_joystick(self):
+        """Scripted input never uses a joystick"""
+        self.joystick = None
+    
+    def update(self):
+        """Advance the script by one update"""
+        self.previous_keys = self.keys.copy()
+        self.previous_mouse_buttons = self.mouse_buttons.copy()
+        
+        pressed = ()
+        if self.step_index < len(self.script):
+            ticks, pressed = self.script[self.step_index]
+            self.step_ticks += 1
+            if self.step_ticks >= ticks:
+                self.step_ticks = 0
+                self.step_index += 1
+                if self.loop and self.step_index >= len(self.script):
+                    self.step_index = 0
+        
+        self.keys = {key: key in pressed for key in (
+            'up', 'down', 'left', 'right', 'jump', 'attack', 'special', 'pause', 'confirm', 'cancel')}
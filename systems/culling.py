@@ -0,0 +1,103 @@
+"""
+Camera-driven visibility culling shared by the render code
+"""
+import pygame
+
+class CullingStage:
+    """
+    Works out what the camera can see each frame
+
+    Entity lists are filtered against the camera's view rectangle, and
+    static geometry is queried through a spatial index when one is
+    available. Entities get an `on_screen` flag so that off-screen
+    animation updates can be skipped, and drawn/culled counts are reported
+    to the profiler.
+    """
+    def __init__(self, camera=None, profiler=None, margin=32):
+        """
+        Initialize the culling stage
+
+        Args:
+            camera: Camera whose view is used (the view can also be passed to begin())
+            profiler: FrameProfiler to report counts to
+            margin: Extra pixels around the view that still count as visible
+        """
+        self.camera = camera
+        self.profiler = profiler
+        self.margin = margin
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self.counts = {}  # name -> (drawn, culled)
+
+    def begin(self, camera_offset=None, view_size=None):
+        """
+        Start a frame
+
+        Args:
+            camera_offset: View position (defaults to the camera's offset)
+            view_size: View width and height (defaults to the camera's size)
+        """
+        self.counts = {}
+        if camera_offset is None and view_size is None:
+            self.view = self.camera.get_view_rect(self.margin)
+            return self.view
+
+        if camera_offset is None:
+            camera_offset = self.camera.get_offset()
+        if view_size is None:
+            view_size = (self.camera.width, self.camera.height)
+
+        margin = self.margin
+        self.view = pygame.Rect(camera_offset[0] - margin, camera_offset[1] - margin,
+                                view_size[0] + margin * 2, view_size[1] + margin * 2)
+        return self.view
+
+    def visible(self, name, entities):
+        """
+        Get the entities whose rect overlaps the view and flag them on_screen
+
+        Args:
+            name: Category reported to the profiler
+            entities: Objects with a rect
+        """
+        visible = []
+        colliderect = self.view.colliderect
+        for entity in entities:
+            on_screen = colliderect(entity.rect)
+            entity.on_screen = on_screen
+            if on_screen:
+                visible.append(entity)
+
+        self.record(name, len(visible), len(entities) - len(visible))
+        return visible
+
+    def visible_rects(self, name, rects):
+        """
+        Get the rects that overlap the view
+
+        Args:
+            name: Category reported to the profiler
+            rects: SpatialHash (queried directly) or list of rects
+        """
+        if hasattr(rects, "query"):
+            visible = rects.query(self.view)
+        else:
+            visible = [rects[i] for i in self.view.collidelistall(rects)]
+
+        self.record(name, len(visible), len(rects) - len(visible))
+        return visible
+
+    def record(self, name, drawn, culled):
+        """Add drawn/culled counts for a category"""
+        previous_drawn, previous_culled = self.counts.get(name, (0, 0))
+        self.counts[name] = (previous_drawn + drawn, previous_culled + culled)
+
+    def report(self):
+        """Send this frame's counts to the profiler"""
+        if self.profiler is None:
+            return
+        for name, (drawn, culled) in self.counts.items():
+            self.profiler.set_counter(f"drawn.{name}", f"{drawn}/{drawn + culled}")
+
+    def get_stats(self):
+        """Get this frame's counts as {name: {"drawn", "culled"}}"""
+        return {name: {"drawn": drawn, "culled": culled} for name, (drawn, culled) in self.counts.items()}
@@ -0,0 +1,435 @@
+"""
+Entity-component storage with systems that process whole component arrays
+"""
+import numpy as np
+
+from entities.enemy import Enemy
+from entities.collectible import Collectible
+from projectile import Projectile
+
+# Component bits stored in World.mask
+POSITION = 1
+VELOCITY = 2
+SPRITE = 4
+COLLIDER = 8
+LIFETIME = 16
+
+class Position:
+    """World position of an entity's top-left corner"""
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+class Velocity:
+    """
+    Velocity in pixels per second, with optional gravity and patrol bounds
+
+    Entities with bounds turn around when they leave [min_x, max_x].
+    """
+    __slots__ = ("x", "y", "gravity", "max_fall", "min_x", "max_x")
+
+    def __init__(self, x=0.0, y=0.0, gravity=0.0, max_fall=float("inf"),
+                 min_x=-float("inf"), max_x=float("inf")):
+        self.x = x
+        self.y = y
+        self.gravity = gravity
+        self.max_fall = max_fall
+        self.min_x = min_x
+        self.max_x = max_x
+
+class Sprite:
+    """Shared animation clip plus playback position"""
+    __slots__ = ("clip", "frame", "timer", "finished")
+
+    def __init__(self, clip, frame=0, timer=0, finished=False):
+        self.clip = clip
+        self.frame = frame
+        self.timer = timer
+        self.finished = finished
+
+class Collider:
+    """Axis-aligned box size"""
+    __slots__ = ("width", "height")
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+class Lifetime:
+    """Ticks left before the entity expires"""
+    __slots__ = ("ticks",)
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+# Array fields and their dtypes
+FIELDS = {
+    "mask": np.uint8,
+    "x": np.float64,
+    "y": np.float64,
+    "velocity_x": np.float32,
+    "velocity_y": np.float32,
+    "gravity": np.float32,
+    "max_fall": np.float32,
+    "min_x": np.float64,
+    "max_x": np.float64,
+    "clip": np.int32,
+    "frame": np.int32,
+    "timer": np.int32,
+    "finished": np.bool_,
+    "width": np.int32,
+    "height": np.int32,
+    "lifetime": np.int32,
+    "visible": np.bool_,
+    "attached": np.bool_,  # Has a game object
+}
+
+_NO_ENTITIES = np.zeros(0, dtype=np.intp)
+
+class World:
+    """
+    Structure-of-arrays entity storage
+
+    An entity is a slot index; each component is a set of NumPy arrays
+    indexed by entity and a bit in `mask` says which components an entity
+    has. Freed slots are reused by later entities.
+
+    Game objects (Enemy, Collectible, Projectile) can be attached with
+    attach(); the systems simulate them and sync_objects() writes their
+    state back after each update.
+    """
+    def __init__(self, capacity=256, tick_rate=60):
+        """
+        Initialize the world
+
+        Args:
+            capacity: Number of entities to allocate room for up front
+            tick_rate: Updates per second, for objects that move a fixed
+                distance per tick
+        """
+        self.tick_rate = tick_rate
+        self.capacity = 0
+        self.size = 0  # One past the highest slot in use
+        self.free_slots = []
+        self.objects = []  # slot -> attached object or None
+        self.entity_of = {}  # attached object -> slot
+
+        # Animation clips referenced by Sprite components
+        self.clips = []
+        self.clip_ids = {}
+        self.clip_duration = np.zeros(0, dtype=np.int32)
+        self.clip_length = np.zeros(0, dtype=np.int32)
+        self.clip_loop = np.zeros(0, dtype=np.bool_)
+
+        # Entities changed by the last update, written back by sync_objects()
+        self.turned = _NO_ENTITIES
+        self.advanced = _NO_ENTITIES
+        self.expired = _NO_ENTITIES
+
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        """Grow every array to a new capacity, keeping existing entities"""
+        for name, dtype in FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.size:
+                array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.objects.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def register_clip(self, clip):
+        """Get the id of an animation clip, registering it on first use"""
+        clip_id = self.clip_ids.get(id(clip))
+        if clip_id is None:
+            clip_id = len(self.clips)
+            self.clips.append(clip)
+            self.clip_ids[id(clip)] = clip_id
+            self.clip_duration = np.append(self.clip_duration, max(1, clip.frame_duration)).astype(np.int32)
+            self.clip_length = np.append(self.clip_length, len(clip.frames)).astype(np.int32)
+            self.clip_loop = np.append(self.clip_loop, clip.loop)
+        return clip_id
+
+    def create(self, position=None, velocity=None, sprite=None, collider=None, lifetime=None, obj=None):
+        """
+        Create an entity from components
+
+        Args:
+            position, velocity, sprite, collider, lifetime: Components (or None)
+            obj: Game object to attach to the entity
+
+        Returns:
+            Entity id
+        """
+        if self.free_slots:
+            entity = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            entity = self.size
+            self.size += 1
+
+        mask = 0
+        if position is not None:
+            mask |= POSITION
+            self.x[entity] = position.x
+            self.y[entity] = position.y
+        if velocity is not None:
+            mask |= VELOCITY
+            self.velocity_x[entity] = velocity.x
+            self.velocity_y[entity] = velocity.y
+            self.gravity[entity] = velocity.gravity
+            self.max_fall[entity] = velocity.max_fall
+            self.min_x[entity] = velocity.min_x
+            self.max_x[entity] = velocity.max_x
+        if sprite is not None:
+            mask |= SPRITE
+            self.clip[entity] = self.register_clip(sprite.clip)
+            self.frame[entity] = sprite.frame
+            self.timer[entity] = sprite.timer
+            self.finished[entity] = sprite.finished
+        if collider is not None:
+            mask |= COLLIDER
+            self.width[entity] = collider.width
+            self.height[entity] = collider.height
+        else:
+            self.width[entity] = 0
+            self.height[entity] = 0
+        if lifetime is not None:
+            mask |= LIFETIME
+            self.lifetime[entity] = lifetime.ticks
+
+        self.mask[entity] = mask
+        self.visible[entity] = True  # Until the next culling pass says otherwise
+        self.attached[entity] = obj is not None
+        self.objects[entity] = obj
+        if obj is not None:
+            self.entity_of[obj] = entity
+        return entity
+
+    def destroy(self, entity):
+        """Remove an entity and free its slot"""
+        if not self.mask[entity]:
+            return
+        self.mask[entity] = 0
+        self.attached[entity] = False
+        obj = self.objects[entity]
+        if obj is not None:
+            self.entity_of.pop(obj, None)
+            self.objects[entity] = None
+        self.free_slots.append(entity)
+
+    def clear(self):
+        """Remove every entity"""
+        self.mask[:self.size] = 0
+        self.attached[:self.size] = False
+        self.objects = [None] * self.capacity
+        self.entity_of.clear()
+        self.free_slots.clear()
+        self.size = 0
+
+    def with_components(self, components):
+        """
+        Get the ids of entities that have every component in a bit mask
+
+        Args:
+            components: Bitwise OR of component bits
+        """
+        mask = self.mask[:self.size]
+        return np.flatnonzero((mask & components) == components)
+
+    def update(self, dt):
+        """Run the simulation systems for one tick"""
+        self.turned = self.advanced = self.expired = _NO_ENTITIES
+        gravity_system(self, dt)
+        movement_system(self, dt)
+        animation_system(self)
+        lifetime_system(self)
+
+    # Object adapters
+
+    def attach(self, obj):
+        """
+        Create an entity for a game object using its registered adapter
+
+        Returns:
+            Entity id
+        """
+        entity = self.entity_of.get(obj)
+        if entity is not None:
+            self.destroy(entity)
+
+        for cls in type(obj).__mro__:
+            adapter = ADAPTERS.get(cls)
+            if adapter is not None:
+                return self.create(obj=obj, **adapter(obj, self.tick_rate))
+        raise TypeError(f"No ECS adapter for {type(obj).__name__}")
+
+    def detach(self, obj):
+        """Remove the entity of an attached object"""
+        entity = self.entity_of.get(obj)
+        if entity is not None:
+            self.destroy(entity)
+
+    def sync_objects(self):
+        """
+        Write simulated state back to the attached objects
+
+        Positions of moving entities are written every tick. Direction,
+        animation frame and lifetime are only written for the entities
+        whose value changed in the last update (animation timers and
+        lifetimes that are still counting down stay in the arrays).
+        """
+        objects = self.objects
+        n = self.size
+        attached = self.attached[:n]
+
+        moving = np.flatnonzero(attached & ((self.mask[:n] & (POSITION | VELOCITY)) == (POSITION | VELOCITY)))
+        for entity, x, y in zip(moving.tolist(), self.x[moving].astype(np.int64).tolist(),
+                                self.y[moving].astype(np.int64).tolist()):
+            objects[entity].rect.topleft = (x, y)
+
+        turned = self.turned[attached[self.turned]]
+        for entity, velocity_x in zip(turned.tolist(), self.velocity_x[turned].tolist()):
+            obj = objects[entity]
+            if hasattr(obj, "direction"):
+                obj.direction = 1 if velocity_x > 0 else -1
+
+        advanced = self.advanced[attached[self.advanced]]
+        for entity, frame, finished in zip(advanced.tolist(), self.frame[advanced].tolist(),
+                                           self.finished[advanced].tolist()):
+            obj = objects[entity]
+            state = obj.animations.get(obj.current_animation)
+            if state is not None:
+                state.current_frame_index = frame
+                state.finished = finished
+
+        expired = self.expired[attached[self.expired]]
+        for entity, lifetime in zip(expired.tolist(), self.lifetime[expired].tolist()):
+            objects[entity].lifetime = lifetime
+
+    def __len__(self):
+        return self.size - len(self.free_slots)
+
+# Systems
+
+def gravity_system(world, dt):
+    """Accelerate every entity with a velocity by its gravity"""
+    entities = world.with_components(VELOCITY)
+    if len(entities):
+        velocity_y = world.velocity_y[entities] + world.gravity[entities] * dt
+        world.velocity_y[entities] = np.minimum(velocity_y, world.max_fall[entities])
+
+def movement_system(world, dt):
+    """Move every entity by its velocity and turn at patrol bounds"""
+    entities = world.with_components(POSITION | VELOCITY)
+    if not len(entities):
+        return
+
+    x = world.x[entities] + world.velocity_x[entities] * dt
+    world.x[entities] = x
+    world.y[entities] += world.velocity_y[entities] * dt
+
+    velocity_x = world.velocity_x[entities]
+    turn_right = (x < world.min_x[entities]) & (velocity_x < 0)
+    turn_left = (x + world.width[entities] > world.max_x[entities]) & (velocity_x > 0)
+    turned = turn_right | turn_left
+    if turned.any():
+        turned = entities[turned]
+        world.velocity_x[turned] = -world.velocity_x[turned]
+        world.turned = turned
+
+def animation_system(world):
+    """Advance every running animation that was visible in the last culling pass by one tick"""
+    entities = world.with_components(SPRITE)
+    if not len(entities):
+        return
+    entities = entities[~world.finished[entities] & world.visible[entities]]
+    if not len(entities):
+        return
+
+    clip = world.clip[entities]
+    timer = world.timer[entities] + 1
+    advance = timer >= world.clip_duration[clip]
+    timer[advance] = 0
+    frame = world.frame[entities] + advance
+
+    length = world.clip_length[clip]
+    past_end = frame >= length
+    if past_end.any():
+        looping = world.clip_loop[clip]
+        frame = np.where(past_end & looping, 0, frame)
+        ended = past_end & ~looping
+        frame = np.where(ended, length - 1, frame)
+        world.finished[entities[ended]] = True
+
+    world.timer[entities] = timer
+    world.frame[entities] = frame
+    world.advanced = entities[advance]
+
+def lifetime_system(world):
+    """Count down every entity's lifetime"""
+    entities = world.with_components(LIFETIME)
+    if len(entities):
+        world.lifetime[entities] -= 1
+        world.expired = entities[world.lifetime[entities] <= 0]
+
+def culling_system(world, view_x, view_y, view_width, view_height, margin=0):
+    """
+    Mark the entities that overlap a view rectangle as visible
+
+    Returns:
+        Number of visible entities
+    """
+    n = world.size
+    x = world.x[:n]
+    y = world.y[:n]
+    visible = ((world.mask[:n] & POSITION) != 0) & \
+        (x + world.width[:n] > view_x - margin) & (x < view_x + view_width + margin) & \
+        (y + world.height[:n] > view_y - margin) & (y < view_y + view_height + margin)
+    world.visible[:n] = visible
+    return int(np.count_nonzero(visible))
+
+# Adapters: (game object, world tick rate) -> components
+
+def _sprite_of(obj):
+    """Get a Sprite component for an AnimatedSprite's current animation"""
+    state = obj.animations.get(obj.current_animation)
+    if state is None:
+        return None
+    return Sprite(state.clip, state.current_frame_index, state.timer, state.finished)
+
+def adapt_enemy(obj, tick_rate):
+    """Enemies patrol horizontally between 0 and the level width"""
+    return {
+        "position": Position(obj.rect.x, obj.rect.y),
+        "velocity": Velocity(obj.speed * obj.direction, 0, min_x=0, max_x=2000),
+        "sprite": _sprite_of(obj),
+        "collider": Collider(obj.rect.width, obj.rect.height),
+    }
+
+def adapt_collectible(obj, tick_rate):
+    """Collectibles only animate"""
+    return {
+        "position": Position(obj.rect.x, obj.rect.y),
+        "sprite": _sprite_of(obj),
+        "collider": Collider(obj.rect.width, obj.rect.height),
+    }
+
+def adapt_projectile(obj, tick_rate):
+    """Projectiles fly a fixed distance per tick until their lifetime runs out"""
+    return {
+        "position": Position(obj.rect.x, obj.rect.y),
+        "velocity": Velocity(obj.velocity_x * tick_rate, obj.velocity_y * tick_rate),
+        "collider": Collider(obj.rect.width, obj.rect.height),
+        "lifetime": Lifetime(obj.lifetime),
+    }
+
+# Class -> adapter; subclasses use the adapter of their nearest registered base
+ADAPTERS = {
+    Enemy: adapt_enemy,
+    Collectible: adapt_collectible,
+    Projectile: adapt_projectile,
+}
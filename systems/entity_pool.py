@@ -0,0 +1,118 @@
+"""
+Object pools for short-lived entities (projectiles, pickups, damage numbers)
+"""
+
+class EntityPool:
+    """
+    Reuses instances of one entity class
+
+    Pooled classes implement reset(*args, **kwargs), taking the same
+    arguments as __init__, and is_expired(). Dead entities are not removed
+    from their list one at a time; they are dropped in a single compact()
+    pass per frame and handed back to the pool for the next spawn.
+    """
+    def __init__(self, entity_class, max_free=1024):
+        """
+        Initialize the pool
+
+        Args:
+            entity_class: Class to create entities from
+            max_free: Number of released entities kept for reuse
+        """
+        self.entity_class = entity_class
+        self.max_free = max_free
+        self.free = []
+
+        # Statistics
+        self.spawned = 0
+        self.despawned = 0
+        self.created = 0
+
+    def acquire(self, *args, **kwargs):
+        """Get an entity, reusing a released one when possible"""
+        self.spawned += 1
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args, **kwargs)
+            return entity
+
+        self.created += 1
+        return self.entity_class(*args, **kwargs)
+
+    def release(self, entity):
+        """Hand an entity back to the pool"""
+        self.despawned += 1
+        if len(self.free) < self.max_free and type(entity) is self.entity_class:
+            self.free.append(entity)
+
+    def release_all(self, entities):
+        """Hand a list of entities back to the pool"""
+        for entity in entities:
+            self.release(entity)
+
+    def compact(self, entities, on_despawn=None):
+        """
+        Drop expired entities in one pass
+
+        Args:
+            entities: List of live entities
+            on_despawn: Optional callback for each dropped entity
+
+        Returns:
+            New list with the entities that are still alive
+        """
+        alive = []
+        for entity in entities:
+            if entity.is_expired():
+                if on_despawn is not None:
+                    on_despawn(entity)
+                self.release(entity)
+            else:
+                alive.append(entity)
+        return alive
+
+    def clear(self):
+        """Forget all released entities"""
+        self.free.clear()
+
+    def get_stats(self):
+        """Get pool statistics"""
+        return {
+            "spawned": self.spawned,
+            "despawned": self.despawned,
+            "created": self.created,
+            "reused": self.spawned - self.created,
+            "free": len(self.free),
+        }
+
+class EntityRegistry:
+    """Named entity pools with combined statistics"""
+    def __init__(self):
+        self.pools = {}  # name -> EntityPool
+
+    def register(self, name, entity_class, max_free=1024):
+        """Create a pool for an entity class and return it"""
+        pool = EntityPool(entity_class, max_free)
+        self.pools[name] = pool
+        return pool
+
+    def spawn(self, name, *args, **kwargs):
+        """Get an entity from a named pool"""
+        return self.pools[name].acquire(*args, **kwargs)
+
+    def release_all(self, name, entities):
+        """Hand a list of entities back to a named pool"""
+        self.pools[name].release_all(entities)
+
+    def compact(self, name, entities, on_despawn=None):
+        """Drop expired entities from a list, returning them to a named pool"""
+        return self.pools[name].compact(entities, on_despawn)
+
+    def clear(self):
+        """Forget all released entities in every pool"""
+        for pool in self.pools.values():
+            pool.clear()
+
+    def get_stats(self):
+        """Get statistics for every pool"""
+        return {name: pool.get_stats() for name, pool in self.pools.items()}
@@ -1,6 +1,7 @@
 import pygame
 import json
 import os
+from graphics.text_cache import font_registry
 
 class Item:
     """Base class for all inventory items"""
@@ -199,7 +200,7 @@ class Inventory:
                         (inventory_x, inventory_y, inventory_width, inventory_height), 2)
         
         # Draw title
-        font_title = pygame.font.Font(None, 36)
+        font_title = font_registry.get(36)
         title_text = font_title.render("Inventory", True, (255, 255, 255))
         screen.blit(title_text, (inventory_x + 10, inventory_y - 36))
         
@@ -223,7 +224,7 @@ class Inventory:
                 
                 # Draw stack count if stackable
                 if item.stackable and item.count > 1:
-                    font_count = pygame.font.Font(None, 20)
+                    font_count = font_registry.get(20)
                     count_text = font_count.render(str(item.count), True, (255, 255, 255))
                     screen.blit(count_text, (slot_x + self.slot_size - 10, slot_y + self.slot_size - 15))
                 
@@ -237,7 +238,7 @@ class Inventory:
     
     def _draw_tooltip(self, screen, item, slot_x, slot_y):
         """Draw tooltip for the item"""
-        font = pygame.font.Font(None, 20)
+        font = font_registry.get(20)
         name_text = font.render(item.name, True, (255, 255, 255))
         desc_lines = self._wrap_text(item.description, 200, font)
         
@@ -2,6 +2,7 @@ import pygame
 import json
 import os
 from enum import Enum, auto
+from graphics.text_cache import font_registry
 
 class QuestStatus(Enum):
     NOT_STARTED = auto()
@@ -352,13 +353,13 @@ class QuestManager:
         pygame.draw.rect(screen, (200, 200, 200), (log_x, log_y, log_width, log_height), 2)
         
         # Draw title
-        font_title = pygame.font.Font(None, 36)
+        font_title = font_registry.get(36)
         title_text = font_title.render("Quest Log", True, (255, 255, 255))
         screen.blit(title_text, (log_x + 20, log_y + 20))
         
         # Draw active quests
         if not self.active_quests:
-            no_quests_text = pygame.font.Font(None, 24).render(
+            no_quests_text = font_registry.get(24).render(
                 "No active quests", True, (200, 200, 200))
             screen.blit(no_quests_text, (log_x + 20, log_y + 70))
         else:
@@ -366,8 +367,8 @@ class QuestManager:
             quests = list(self.active_quests.values())
             
             # Draw quest list
-            font_quest = pygame.font.Font(None, 24)
-            font_desc = pygame.font.Font(None, 18)
+            font_quest = font_registry.get(24)
+            font_desc = font_registry.get(18)
             
             list_width = 200
             detail_x = log_x + list_width + 20
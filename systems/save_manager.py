@@ -5,6 +5,7 @@ import time
 import datetime
 from pathlib import Path
 import shutil
+from graphics.text_cache import font_registry
 
 class SaveManager:
     """Handles saving and loading game state"""
@@ -183,7 +184,7 @@ class SaveManager:
         screen.blit(overlay, (0, 0))
         
         # Title
-        font_title = pygame.font.Font(None, 48)
+        font_title = font_registry.get(48)
         title_text = font_title.render("Save / Load Game", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(screen_width // 2, 80))
         screen.blit(title_text, title_rect)
@@ -211,7 +212,7 @@ class SaveManager:
             pygame.draw.rect(screen, (200, 200, 200), slot_rect, 2)
             
             # Slot number
-            font_slot = pygame.font.Font(None, 36)
+            font_slot = font_registry.get(36)
             slot_text = font_slot.render(f"Slot {slot['slot']}", True, (255, 255, 255))
             screen.blit(slot_text, (slot_rect.x + 10, slot_rect.y + 10))
             
@@ -221,7 +222,7 @@ class SaveManager:
                     screen.blit(slot["thumbnail"], (slot_rect.x + 10, slot_rect.y + 40))
                 
                 # Draw save info
-                font_info = pygame.font.Font(None, 24)
+                font_info = font_registry.get(24)
                 
                 timestamp_str = datetime.datetime.fromtimestamp(slot["timestamp"]).strftime("%Y-%m-%d %H:%M") if slot["timestamp"] else "Unknown"
                 info_text = font_info.render(f"{timestamp_str}", True, (255, 255, 255))
@@ -238,7 +239,7 @@ class SaveManager:
                 screen.blit(empty_text, empty_rect)
         
         # Instructions
-        font_inst = pygame.font.Font(None, 24)
+        font_inst = font_registry.get(24)
         inst_text = font_inst.render("↑/↓: Select Slot | Enter: Select | S: Save | L: Load | X: Delete", True, (200, 200, 200))
         inst_rect = inst_text.get_rect(center=(screen_width // 2, screen_height - 50))
         screen.blit(inst_text, inst_rect)
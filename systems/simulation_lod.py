@@ -0,0 +1,148 @@
+"""
+Distance-based simulation level of detail for actors (enemies, NPCs)
+"""
+
+ACTIVE = "active"    # Updated every tick
+DORMANT = "dormant"  # Updated every Nth tick with N ticks' worth of time
+FROZEN = "frozen"    # Not updated at all
+
+class _ActorGroup:
+    """Tier assignment for one list of actors"""
+    __slots__ = ("source", "count", "tick", "active", "buckets", "frozen")
+
+    def __init__(self):
+        self.source = None
+        self.count = -1
+        self.tick = 0
+        self.active = []
+        self.buckets = []
+        self.frozen = []
+
+class SimulationLOD:
+    """
+    Schedules actor updates by distance from a focus point
+
+    Actors near the focus are active, those further away are dormant and
+    the rest are frozen. Dormant actors are spread over dormant_interval
+    buckets so that only one bucket is updated per tick, and each update
+    is told how many ticks have passed since the actor's last one so that
+    movement and timers stay consistent. Frozen actors keep their state
+    and pick up from it when they wake, without catching up on the time
+    they were frozen.
+
+    Tiers are reassigned every reclassify_interval ticks, or as soon as the
+    actor list is replaced or changes length, so the per-tick cost only
+    depends on the number of active and dormant actors.
+    """
+    def __init__(self, active_radius=1000, dormant_radius=2400, dormant_interval=4,
+                 reclassify_interval=15):
+        """
+        Initialize the scheduler
+
+        Args:
+            active_radius: Distance within which actors update every tick
+            dormant_radius: Distance within which actors update every dormant_interval ticks
+            dormant_interval: Ticks between updates of a dormant actor
+            reclassify_interval: Ticks between tier reassignments
+        """
+        self.active_radius = active_radius
+        self.dormant_radius = max(dormant_radius, active_radius)
+        self.dormant_interval = max(1, int(dormant_interval))
+        self.reclassify_interval = max(1, int(reclassify_interval))
+        self.groups = {}  # name -> _ActorGroup
+
+    def get_tier(self, actor, focus):
+        """
+        Get the tier of an actor for a focus point
+
+        Args:
+            actor: Object with a rect
+            focus: (x, y) world position, usually the player's center
+        """
+        center_x, center_y = actor.rect.center
+        dx = center_x - focus[0]
+        dy = center_y - focus[1]
+        distance_sq = dx * dx + dy * dy
+        if distance_sq <= self.active_radius * self.active_radius:
+            return ACTIVE
+        if distance_sq <= self.dormant_radius * self.dormant_radius:
+            return DORMANT
+        return FROZEN
+
+    def update(self, name, actors, focus, step):
+        """
+        Run one tick for a list of actors
+
+        Args:
+            name: Name of the actor group (e.g. "enemies")
+            actors: List of actors with a rect
+            focus: (x, y) world position, usually the player's center
+            step: Callable step(actor, ticks) that simulates an actor for a
+                number of ticks
+        """
+        group = self.groups.get(name)
+        if group is None:
+            group = self.groups[name] = _ActorGroup()
+
+        if (group.source is not actors or group.count != len(actors) or
+                group.tick % self.reclassify_interval == 0):
+            self._classify(group, actors, focus)
+
+        tick = group.tick
+        max_ticks = self.dormant_interval * 2
+        for actor in group.active:
+            actor.lod_tick = tick
+            step(actor, 1)
+        for actor in group.buckets[tick % self.dormant_interval]:
+            ticks = min(tick - actor.lod_tick, max_ticks)
+            actor.lod_tick = tick
+            if ticks > 0:
+                step(actor, ticks)
+
+        group.tick += 1
+
+    def _classify(self, group, actors, focus):
+        """Reassign the tiers of a group's actors"""
+        tick = group.tick
+        interval = self.dormant_interval
+        active = []
+        dormant = []
+        frozen = []
+        for actor in actors:
+            tier = self.get_tier(actor, focus)
+            previous = getattr(actor, "lod_tier", FROZEN)
+            if previous == FROZEN and tier != FROZEN:
+                # Waking up (or new): resume from the current state
+                actor.lod_tick = tick - 1
+            actor.lod_tier = tier
+
+            if tier == ACTIVE:
+                active.append(actor)
+            elif tier == DORMANT:
+                dormant.append(actor)
+            else:
+                frozen.append(actor)
+
+        group.source = actors
+        group.count = len(actors)
+        group.active = active
+        group.buckets = [dormant[phase::interval] for phase in range(interval)]
+        group.frozen = frozen
+
+    def forget(self, name=None):
+        """Drop tier assignments for one group, or all of them"""
+        if name is None:
+            self.groups.clear()
+        else:
+            self.groups.pop(name, None)
+
+    def get_stats(self):
+        """Get the number of actors in each tier by group"""
+        return {
+            name: {
+                ACTIVE: len(group.active),
+                DORMANT: sum(len(bucket) for bucket in group.buckets),
+                FROZEN: len(group.frozen),
+            }
+            for name, group in self.groups.items()
+        }
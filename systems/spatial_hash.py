@@ -0,0 +1,140 @@
+"""
+Uniform-grid spatial hash used as a broadphase for collision queries
+"""
+import pygame
+
+class SpatialHash:
+    """
+    Buckets rectangles into fixed-size grid cells so that a query only
+    has to look at the geometry near the queried area.
+
+    Static level geometry is registered once at load time and then
+    queried every frame by the collision functions.
+    """
+    def __init__(self, cell_size=128):
+        """
+        Initialize the spatial hash
+
+        Args:
+            cell_size: Width and height of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of entry ids
+        self.entries = {}  # entry id -> rect
+        self._next_id = 0
+
+    def _cell_range(self, x, y, width, height):
+        """Get the inclusive range of cells covered by an area"""
+        size = self.cell_size
+        # Rects are half-open, so the last covered pixel is right - 1
+        right = x + max(width, 1) - 1
+        bottom = y + max(height, 1) - 1
+        return (int(x // size), int(y // size),
+                int(right // size), int(bottom // size))
+
+    def insert(self, rect):
+        """
+        Register a rectangle in the hash
+
+        Args:
+            rect: pygame.Rect or (x, y, width, height) tuple
+
+        Returns:
+            Entry id that can be passed to remove()
+        """
+        if not isinstance(rect, pygame.Rect):
+            rect = pygame.Rect(rect)
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self.entries[entry_id] = rect
+
+        min_x, min_y, max_x, max_y = self._cell_range(rect.x, rect.y, rect.width, rect.height)
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(entry_id)
+
+        return entry_id
+
+    def insert_many(self, rects):
+        """Register several rectangles at once"""
+        return [self.insert(rect) for rect in rects]
+
+    def remove(self, entry_id):
+        """Remove a previously inserted rectangle"""
+        rect = self.entries.pop(entry_id, None)
+        if rect is None:
+            return False
+
+        min_x, min_y, max_x, max_y = self._cell_range(rect.x, rect.y, rect.width, rect.height)
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    bucket.remove(entry_id)
+                    if not bucket:
+                        del self.cells[(cell_x, cell_y)]
+        return True
+
+    def clear(self):
+        """Remove all rectangles"""
+        self.cells.clear()
+        self.entries.clear()
+        self._next_id = 0
+
+    def rebuild(self, rects):
+        """Replace the contents of the hash with a new set of rectangles"""
+        self.clear()
+        self.insert_many(rects)
+
+    def query_candidates(self, x, y, width, height):
+        """
+        Broadphase query: get every rect sharing a cell with an area
+
+        The result may contain rects that don't actually overlap the area.
+        Rects are returned in insertion order.
+        """
+        min_x, min_y, max_x, max_y = self._cell_range(x, y, width, height)
+        cells = self.cells
+
+        # Fast path for the common case of a small query inside one cell
+        if min_x == max_x and min_y == max_y:
+            bucket = cells.get((min_x, min_y))
+            if not bucket:
+                return []
+            entries = self.entries
+            return [entries[entry_id] for entry_id in bucket]
+
+        found = set()
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    found.update(bucket)
+
+        entries = self.entries
+        return [entries[entry_id] for entry_id in sorted(found)]
+
+    def query(self, rect):
+        """
+        Get all registered rects that collide with a rectangle
+
+        Args:
+            rect: pygame.Rect or (x, y, width, height) tuple
+
+        Returns:
+            List of colliding pygame.Rect objects in insertion order
+        """
+        if not isinstance(rect, pygame.Rect):
+            rect = pygame.Rect(rect)
+
+        candidates = self.query_candidates(rect.x, rect.y, rect.width, rect.height)
+        if not candidates:
+            return []
+        return [candidates[i] for i in rect.collidelistall(candidates)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
@@ -0,0 +1,194 @@
+"""
+Sweep-and-prune broadphase for moving entities
+
+Entities are kept in named groups ("enemies", "player_projectiles", ...),
+each sorted by the left edge of its rect. Frame to frame, entities only
+move a little, so the order from the last frame is nearly sorted and
+re-sorting it (Python's sort finds the existing runs) costs close to
+linear time. Queries then only look at the entities whose x interval can
+reach the queried one.
+"""
+from bisect import bisect_left
+from operator import attrgetter
+
+import pygame
+
+_rect_of = attrgetter("rect")
+_left_of = attrgetter("rect.x")
+
+class _Group:
+    """Entities of one group in x order, with their rects and left edges"""
+    def __init__(self):
+        self.objects = []
+        self.rects = []
+        self.lefts = []
+        self.max_width = 0
+        self.removed = set()
+        self.stale = True  # Positions changed since the group was last sorted
+
+class SweepAndPrune:
+    """
+    Broadphase over the rects of moving entities, sorted along the x axis
+
+    Entities are added when they spawn and removed when they despawn; call
+    update() once per frame after movement, then ask for overlapping pairs
+    between groups or for the entities overlapping a rect.
+    """
+    def __init__(self):
+        self.groups = {}  # name -> _Group
+        self.membership = {}  # entity -> group name
+
+    def add(self, obj, group):
+        """Start tracking an entity (anything with a rect) in a group"""
+        current = self.membership.get(obj)
+        if current == group:
+            return
+        if current is not None:
+            self.remove(obj)
+        entries = self.groups.get(group)
+        if entries is None:
+            entries = self.groups[group] = _Group()
+        if obj in entries.removed:
+            # Re-added before the removal was applied
+            entries.removed.discard(obj)
+        else:
+            entries.objects.append(obj)
+        entries.stale = True
+        self.membership[obj] = group
+
+    def remove(self, obj):
+        """Stop tracking an entity; it's dropped from its group on the next update()"""
+        group = self.membership.pop(obj, None)
+        if group is None:
+            return False
+        entries = self.groups[group]
+        entries.removed.add(obj)
+        entries.stale = True
+        return True
+
+    def clear(self):
+        """Stop tracking every entity"""
+        self.groups.clear()
+        self.membership.clear()
+
+    def update(self):
+        """
+        Note that entities have moved
+
+        Groups are re-sorted when they are next queried, so groups that
+        nothing asks about in a frame cost nothing.
+        """
+        for entries in self.groups.values():
+            entries.stale = True
+
+    def _prepare(self, entries):
+        """Re-sort a group by its entities' current positions if they changed"""
+        if not entries.stale:
+            return
+        objects = entries.objects
+        if entries.removed:
+            removed = entries.removed
+            objects = entries.objects = [obj for obj in objects if obj not in removed]
+            removed.clear()
+        # Nearly sorted after a frame of movement, so this is close to linear
+        objects.sort(key=_left_of)
+        entries.rects = rects = list(map(_rect_of, objects))
+        entries.lefts = [rect.x for rect in rects]
+        entries.max_width = max([rect.width for rect in rects], default=0)
+        entries.stale = False
+
+    def _candidates(self, entries, rect):
+        """Slice bounds of a group's entities whose x interval can overlap a rect"""
+        start = bisect_left(entries.lefts, rect.x - entries.max_width + 1)
+        end = bisect_left(entries.lefts, rect.x + rect.width, start)
+        return start, end
+
+    def query(self, rect, group):
+        """
+        Get the entities of a group whose rects collide with a rectangle
+
+        Args:
+            rect: pygame.Rect or (x, y, width, height) tuple
+            group: Group name
+
+        Returns:
+            List of entities in x order
+        """
+        entries = self.groups.get(group)
+        if entries is None or not entries.objects:
+            return []
+        if not isinstance(rect, pygame.Rect):
+            rect = pygame.Rect(rect)
+        self._prepare(entries)
+
+        start, end = self._candidates(entries, rect)
+        if start == end:
+            return []
+        objects = entries.objects
+        return [objects[start + i] for i in rect.collidelistall(entries.rects[start:end])]
+
+    def pairs(self, group_a, group_b):
+        """
+        Get the overlapping pairs between two groups
+
+        The smaller group is swept against the sorted intervals of the
+        larger one, so the cost grows with the group sizes and the number
+        of nearby entities rather than with their product.
+
+        Returns:
+            List of (entity from group_a, entity from group_b) tuples
+        """
+        a = self.groups.get(group_a)
+        b = self.groups.get(group_b)
+        if a is None or b is None or not a.objects or not b.objects:
+            return []
+        self._prepare(a)
+        self._prepare(b)
+
+        swapped = len(a.objects) > len(b.objects)
+        if swapped:
+            a, b = b, a
+
+        found = []
+        objects = b.objects
+        rects = b.rects
+        for obj, rect in zip(a.objects, a.rects):
+            start, end = self._candidates(b, rect)
+            if start == end:
+                continue
+            for i in rect.collidelistall(rects[start:end]):
+                other = objects[start + i]
+                found.append((other, obj) if swapped else (obj, other))
+        return found
+
+    def self_pairs(self, group):
+        """
+        Get the overlapping pairs within one group with a sweep along x
+
+        Returns:
+            List of (entity, entity) tuples, each pair once
+        """
+        entries = self.groups.get(group)
+        if entries is None:
+            return []
+        self._prepare(entries)
+
+        found = []
+        active = []  # (right, index) of entities whose interval is still open
+        objects = entries.objects
+        rects = entries.rects
+        for index, rect in enumerate(rects):
+            left = rect.x
+            active = [(right, other) for right, other in active if right > left]
+            for _, other in active:
+                if rect.colliderect(rects[other]):
+                    found.append((objects[other], objects[index]))
+            active.append((rect.x + rect.width, index))
+        return found
+
+    def get_stats(self):
+        """Get the number of tracked entities in each group"""
+        return {name: len(entries.objects) - len(entries.removed) for name, entries in self.groups.items()}
+
+    def __len__(self):
+        return len(self.membership)
@@ -1,10 +1,88 @@
 import os
+import io
+import json
+import logging
 import pygame
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from systems.animation import AnimationClip
+from graphics.atlas import AtlasPacker, TextureAtlas
+
+logger = logging.getLogger(__name__)
+
+def _read_and_decode(full_path):
+    """Read and decode an image file; runs on a preload worker thread"""
+    with open(full_path, "rb") as f:
+        data = f.read()
+    return pygame.image.load(io.BytesIO(data), os.path.basename(full_path))
+
+class PreloadBatch:
+    """
+    A group of images being decoded in the background
+    
+    Decoding happens on the AssetManager's worker threads. poll() finishes
+    decoded images on the calling (main) thread, converting them for the
+    display and adding them to the image cache, so it should be called
+    every frame while a loading screen is shown.
+    """
+    def __init__(self, asset_manager, paths, futures):
+        self.asset_manager = asset_manager
+        self.paths = list(paths)
+        self.futures = futures  # path -> Future still to be finished
+        self.total = len(self.paths)
+        self.loaded = self.total - len(futures)
+        self.failed = []
+    
+    @property
+    def done(self):
+        """Whether every image has been finished"""
+        return not self.futures
+    
+    @property
+    def progress(self):
+        """Fraction of the images that have been finished (0-1)"""
+        return self.loaded / self.total if self.total else 1.0
+    
+    def poll(self):
+        """
+        Finish the images that have been decoded so far
+        
+        Returns:
+            Progress (0-1)
+        """
+        for path, future in list(self.futures.items()):
+            if future.done():
+                self._finish(path, future)
+        return self.progress
+    
+    def wait(self, timeout=None):
+        """
+        Block until every image is finished (or the timeout runs out)
+        
+        Returns:
+            True if the batch is done
+        """
+        while self.futures:
+            finished, _ = wait(list(self.futures.values()), timeout, return_when=FIRST_COMPLETED)
+            if not finished:
+                break
+            self.poll()
+        return self.done
+    
+    def _finish(self, path, future):
+        del self.futures[path]
+        self.loaded += 1
+        if not self.asset_manager._finish_preload(path, future):
+            self.failed.append(path)
 
 class AssetManager:
     def __init__(self):
         self.images = {}
+        self.animation_clips = {}  # Shared, immutable clips by name
+        self.atlases = []  # TextureAtlas objects that images are taken from when they contain them
+        self.pending = {}  # path -> Future of an image being decoded in the background
+        self.executor = None  # Created on the first preload
+        self.max_workers = min(8, os.cpu_count() or 1)
         self.initialized = False
         print("Asset Manager initialized")
         
@@ -44,42 +122,62 @@ class AssetManager:
         if path in self.images:
             return self.images[path]
         
+        # Images packed into an atlas share the atlas page's pixels
+        for atlas in self.atlases:
+            if path in atlas:
+                image = atlas.get_surface(path)
+                self.images[path] = image
+                return image
+        
+        # Wait for a background decode instead of starting another one
+        future = self.pending.get(path)
+        if future is not None:
+            self._finish_preload(path, future)
+            return self.images[path]
+        
+        # Construct full path from project root
+        full_path = os.path.join(self.project_root, path)
+        logger.debug(f"Loading image from: {full_path}")
+        
         try:
-            # Construct full path from project root
-            full_path = os.path.join(self.project_root, path)
-            
-            # Print path for debugging
-            print(f"Loading image from: {full_path}")
-            
-            # Check if file exists
-            if not os.path.exists(full_path):
-                print(f"Warning: Image file does not exist: {full_path}")
-                fallback = self.create_fallback_image()
-                self.images[path] = fallback
-                return fallback
-            
-            # Try to load the image
-            image = pygame.image.load(full_path).convert_alpha()
-            self.images[path] = image
-            return image
-                
+            image = self._convert(pygame.image.load(full_path))
+        except FileNotFoundError:
+            print(f"Warning: Image file does not exist: {full_path}")
+            image = self.create_fallback_image()
         except Exception as e:
             print(f"Error loading image {path}: {e}")
-            fallback = self.create_fallback_image()
-            self.images[path] = fallback
-            return fallback
+            image = self.create_fallback_image()
+        
+        self.images[path] = image
+        return image
+    
+    def _convert(self, image):
+        """Convert a decoded image to the display format, when there is a display"""
+        if pygame.display.get_surface() is not None:
+            return image.convert_alpha()
+        return image
     
     def load_sprite_sheet(self, path, width, height, frames, spacing=0):
-        """Load a sprite sheet and split it into individual frames."""
+        """
+        Load a sprite sheet and split it into individual frames.
+        
+        Frames are subsurfaces sharing the sheet's (or its atlas page's)
+        pixels; frames that reach past the sheet's edge are copied instead.
+        """
         try:
             sheet = self.load_image(path)
+            bounds = sheet.get_rect()
             sprite_frames = []
             
             for i in range(frames):
                 x = i * (width + spacing)
-                frame = pygame.Surface((width, height), pygame.SRCALPHA)
-                frame.blit(sheet, (0, 0), (x, 0, width, height))
-                sprite_frames.append(frame)
+                rect = pygame.Rect(x, 0, width, height)
+                if bounds.contains(rect):
+                    sprite_frames.append(sheet.subsurface(rect))
+                else:
+                    frame = pygame.Surface((width, height), pygame.SRCALPHA)
+                    frame.blit(sheet, (0, 0), rect)
+                    sprite_frames.append(frame)
             
             return sprite_frames
         except Exception as e:
@@ -87,6 +185,51 @@ class AssetManager:
             # Return fallback frames
             return [self.create_fallback_image(width, height) for _ in range(frames)]
     
+    def load_atlas(self, index_path):
+        """
+        Use a prebuilt texture atlas (see graphics.atlas) for the images it contains
+        
+        Returns:
+            TextureAtlas, or None if it couldn't be loaded
+        """
+        if not self.initialized:
+            self.initialize()
+        try:
+            atlas = TextureAtlas.load(os.path.join(self.project_root, index_path))
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"Error loading atlas {index_path}: {e}")
+            return None
+        self.add_atlas(atlas)
+        return atlas
+    
+    def build_atlas(self, paths, max_size=2048, padding=1):
+        """
+        Pack already-loadable images into an atlas at load time
+        
+        Images that were loaded before are replaced in the cache, so objects
+        created afterwards get the atlas-backed surfaces.
+        
+        Args:
+            paths: Image paths relative to the project root
+            max_size: Maximum page width and height
+            padding: Empty pixels around every image
+        
+        Returns:
+            TextureAtlas
+        """
+        packer = AtlasPacker(max_size, padding)
+        for path in paths:
+            packer.add(path, self.load_image(path))
+        atlas = packer.pack()
+        self.add_atlas(atlas)
+        return atlas
+    
+    def add_atlas(self, atlas):
+        """Take images from an atlas from now on"""
+        self.atlases.append(atlas)
+        for path in atlas.regions:
+            self.images[path] = atlas.get_surface(path)
+    
     def create_fallback_image(self, width=32, height=32):
         """Create a fallback image when loading fails."""
         image = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -95,8 +238,117 @@ class AssetManager:
         pygame.draw.line(image, (0, 0, 0), (width, 0), (0, height), 2)
         return image
 
+    def register_animation_clip(self, name, clip):
+        """Register a shared animation clip under a name and return it"""
+        self.animation_clips[name] = clip
+        return clip
+    
+    def get_animation_clip(self, name):
+        """Get a registered animation clip, or None"""
+        return self.animation_clips.get(name)
+    
+    def load_animation_clip(self, name, path, frame_duration=5, loop=True,
+                            frame_width=None, frame_height=None, frame_count=1):
+        """
+        Get a shared animation clip, building it on first request
+        
+        Args:
+            name: Name the clip is registered under
+            path: Image or sprite sheet path
+            frame_duration: Number of game ticks each frame should display
+            loop: Whether the animation should loop
+            frame_width, frame_height: Frame size when path is a sprite sheet
+            frame_count: Number of frames in the sprite sheet (1 for a single image)
+        """
+        clip = self.animation_clips.get(name)
+        if clip is not None:
+            return clip
+        
+        if frame_count > 1:
+            frames = self.load_sprite_sheet(path, frame_width, frame_height, frame_count)
+        else:
+            frames = [self.load_image(path)]
+        return self.register_animation_clip(name, AnimationClip(frames, frame_duration, loop))
+    
     def preload_images(self, paths):
-        """Preload multiple images at once"""
+        """
+        Start decoding images on worker threads
+        
+        Files are read and decoded in parallel; the decoded images are
+        converted and cached by PreloadBatch.poll() or wait() on the main
+        thread, or by load_image() when one is needed before then.
+        
+        Args:
+            paths: Image paths relative to the project root
+        
+        Returns:
+            PreloadBatch to poll for progress or wait on
+        """
+        if not self.initialized:
+            self.initialize()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-loader")
+        
+        paths = list(dict.fromkeys(paths))
+        futures = {}
         for path in paths:
-            self.load_image(path)
-        print(f"Preloaded {len(paths)} images")
+            if path in self.images:
+                continue
+            future = self.pending.get(path)
+            if future is None:
+                future = self.executor.submit(_read_and_decode, os.path.join(self.project_root, path))
+                self.pending[path] = future
+            futures[path] = future
+        return PreloadBatch(self, paths, futures)
+    
+    def preload_manifest(self, manifest_path, group):
+        """
+        Start decoding the images listed for a group in a manifest
+        
+        The manifest is a JSON file of the form {"images": {"group": [paths]}}.
+        
+        Returns:
+            PreloadBatch (empty if the manifest or group doesn't exist)
+        """
+        try:
+            with open(os.path.join(self.project_root, manifest_path), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading asset manifest {manifest_path}: {e}")
+            manifest = {}
+        return self.preload_images(manifest.get("images", {}).get(group, []))
+    
+    def is_ready(self, path):
+        """Check whether an image is loaded and can be used without waiting"""
+        return path in self.images
+    
+    def _finish_preload(self, path, future):
+        """
+        Convert and cache a background-decoded image on the main thread
+        
+        Returns:
+            False if the image couldn't be loaded and a fallback was cached
+        """
+        self.pending.pop(path, None)
+        if path in self.images:
+            return True
+        
+        try:
+            self.images[path] = self._convert(future.result())
+            return True
+        except FileNotFoundError:
+            print(f"Warning: Image file does not exist: {os.path.join(self.project_root, path)}")
+        except Exception as e:
+            print(f"Error loading image {path}: {e}")
+        self.images[path] = self.create_fallback_image()
+        return False
+    
+    def shutdown(self):
+        """Stop the preload worker threads"""
+        if self.executor is not None:
+            # Executor.shutdown(cancel_futures=True) needs Python 3.9
+            for future in self.pending.values():
+                future.cancel()
+            self.pending.clear()
+            self.executor.shutdown(wait=False)
+            self.executor = None
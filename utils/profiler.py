@@ -0,0 +1,229 @@
+"""
+Lightweight frame profiler with per-section timing and an overlay graph
+"""
+import csv
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from graphics.text_cache import font_registry
+
+logger = logging.getLogger(__name__)
+
+# Shared no-op context returned while profiling is disabled
+_NULL_SECTION = nullcontext()
+
+class _Section:
+    """Context manager that adds its elapsed time to a profiler section"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+class FrameProfiler:
+    """
+    Collects per-frame timings for named sections of the game loop
+
+    Usage:
+        profiler.begin_frame()
+        with profiler.section("update"):
+            game.update(dt)
+        profiler.end_frame()
+
+    Each section keeps a rolling history of its per-frame time, from which
+    mean/p95/max are computed for the overlay and the exit dump.
+    """
+    def __init__(self, enabled=True, history_size=300, budget_ms=1000.0 / 60):
+        """
+        Initialize the profiler
+
+        Args:
+            enabled: Whether timings are collected
+            history_size: Number of frames kept per section
+            budget_ms: Frame budget drawn as a line on the overlay graph
+        """
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.history_size = history_size
+        self.budget_ms = budget_ms
+
+        self.history = {}  # section name -> deque of per-frame ms
+        self.frame_history = deque(maxlen=history_size)
+        self.current = {}  # section name -> seconds spent this frame
+        self.counters = {}  # name -> value reported this frame (e.g. culled counts)
+        self.frame_start = None
+        self.frame_count = 0
+
+        # Overlay state
+        self.font = None
+        self.overlay = None
+        self.overlay_refresh = 15  # Frames between overlay rebuilds
+
+    def toggle(self):
+        """Toggle collection and the overlay together"""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.frame_start = None
+
+    def section(self, name):
+        """Get a context manager that times a named section"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add_time(self, name, seconds):
+        """Add time to a section for the current frame"""
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def set_counter(self, name, value):
+        """Report a per-frame counter (shown on the overlay, not timed)"""
+        if self.enabled:
+            self.counters[name] = value
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        if not self.enabled:
+            return
+        self.frame_start = time.perf_counter()
+        self.current = {}
+
+    def end_frame(self):
+        """Finish timing a frame and record its sections"""
+        if not self.enabled or self.frame_start is None:
+            return
+
+        self.frame_history.append((time.perf_counter() - self.frame_start) * 1000)
+        for name, seconds in self.current.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = deque(maxlen=self.history_size)
+            samples.append(seconds * 1000)
+
+        self.frame_count += 1
+        self.frame_start = None
+
+    @staticmethod
+    def _summarize(samples):
+        """Get mean/p95/max of a list of samples in ms"""
+        ordered = sorted(samples)
+        count = len(ordered)
+        return {
+            "mean": sum(ordered) / count,
+            "p95": ordered[min(count - 1, int(count * 0.95))],
+            "max": ordered[-1],
+            "samples": count,
+        }
+
+    def get_stats(self):
+        """
+        Get statistics for the frame and every section
+
+        Returns:
+            Dictionary of section name -> {mean, p95, max, samples} in ms
+        """
+        stats = {}
+        if self.frame_history:
+            stats["frame"] = self._summarize(self.frame_history)
+        for name, samples in self.history.items():
+            if samples:
+                stats[name] = self._summarize(samples)
+        return stats
+
+    def render(self, screen):
+        """
+        Draw the overlay graph and timing table
+
+        Returns:
+            The screen area covered, or None if nothing was drawn
+        """
+        if not self.show_overlay or not self.frame_history:
+            return None
+
+        if self.overlay is None or self.frame_count % self.overlay_refresh == 0:
+            self.overlay = self._build_overlay()
+        return screen.blit(self.overlay, (screen.get_width() - self.overlay.get_width() - 10, 10))
+
+    def _build_overlay(self):
+        """Render the overlay panel"""
+        if self.font is None:
+            self.font = font_registry.get(18)
+
+        stats = self.get_stats()
+        line_height = self.font.get_linesize()
+        graph_height = 60
+        width = 280
+        lines = [f"{'section':<18}{'mean':>7}{'p95':>7}{'max':>7}"]
+        for name in sorted(stats, key=lambda key: (key != "frame", key)):
+            values = stats[name]
+            lines.append(f"{name:<18}{values['mean']:>7.2f}{values['p95']:>7.2f}{values['max']:>7.2f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<18}{value:>7}")
+
+        height = graph_height + 10 + line_height * len(lines) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+
+        # Frame time graph, scaled so the budget sits at half height
+        scale = graph_height / (self.budget_ms * 2)
+        history = list(self.frame_history)[-(width - 10):]
+        for i, frame_ms in enumerate(history):
+            bar = min(graph_height, int(frame_ms * scale))
+            color = (0, 200, 0) if frame_ms <= self.budget_ms else (220, 60, 60)
+            pygame.draw.line(panel, color, (5 + i, 5 + graph_height), (5 + i, 5 + graph_height - bar))
+        budget_y = 5 + graph_height - int(self.budget_ms * scale)
+        pygame.draw.line(panel, (255, 255, 0), (5, budget_y), (width - 5, budget_y))
+
+        y = graph_height + 10
+        for line in lines:
+            panel.blit(self.font.render(line, True, (255, 255, 255)), (5, y))
+            y += line_height
+
+        return panel
+
+    def dump(self, path):
+        """
+        Write the collected statistics to a CSV or JSON file (by extension)
+
+        Returns:
+            True if the file was written
+        """
+        stats = self.get_stats()
+        if not stats:
+            return False
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            if path.endswith(".csv"):
+                with open(path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["section", "mean_ms", "p95_ms", "max_ms", "samples"])
+                    for name, values in stats.items():
+                        writer.writerow([name, f"{values['mean']:.3f}", f"{values['p95']:.3f}",
+                                         f"{values['max']:.3f}", values["samples"]])
+            else:
+                with open(path, "w") as f:
+                    json.dump({"frames": self.frame_count, "sections": stats}, f, indent=4)
+
+            logger.info(f"Frame profile written to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing frame profile: {e}")
+            return False
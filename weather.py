@@ -1,6 +1,7 @@
 import pygame
 import random
-from particles import ParticleSystem, ParticleEmitter
+from graphics.particles import ParticleSystem, ParticleEmitter
+from graphics import post_effects
 
 class WeatherSystem:
     """System for handling weather effects like rain, snow, etc."""
@@ -13,6 +14,9 @@ class WeatherSystem:
         self.transition_speed = 0.01
         self.target_intensity = 0.0
         self.weather_emitters = []
+        self.flash_timer = 0  # Frames left of the current lightning flash
+        self.flash_duration = 12
+        self.flash_color = (235, 240, 255)
     
     def set_weather(self, weather_type, intensity=1.0, transition=True):
         """Set the current weather type and intensity"""
@@ -85,13 +89,15 @@ class WeatherSystem:
         self.particle_system.update()
         
         # Handle special weather effects
+        if self.flash_timer > 0:
+            self.flash_timer -= 1
         if self.current_weather == "thunder" and random.random() < 0.005 * self.intensity:
             self._trigger_thunder_flash()
     
     def _trigger_thunder_flash(self):
         """Create a lightning flash effect"""
-        # Would be implemented to create a flash overlay or screen effect
-        pass
+        # Blended into the frame in render, fading over flash_duration frames
+        self.flash_timer = self.flash_duration
     
     def render(self, screen, camera_offset):
         """Render all weather particles and effects"""
@@ -103,3 +109,8 @@ class WeatherSystem:
         
         # Render all particles
         self.particle_system.render(screen, camera_offset)
+        
+        # Lightning flash, brightest on the frame it strikes
+        if self.flash_timer > 0:
+            strength = 0.8 * self.flash_timer / self.flash_duration
+            post_effects.palette_flash(screen, self.flash_color, strength)